@@ -3,6 +3,11 @@ API Fetcher Module
 Fetches and normalises job listings from free REST APIs (Remotive, Adzuna).
 Each public function returns a List[Dict] in the standard job schema:
   {title, company, description, url, source, skills}
+with skills left as None – extraction runs later (scraper.enrich_jobs) and
+only for postings that survive de-duplication and the max_results cut.
+
+All fetchers are coroutines on top of the shared HTTP pool (http_client),
+so many category x source fetches can be in flight at once.
 
 All functions are wrapped in try/except – a failing source returns []
 so the caller can continue to the next source without crashing.
@@ -15,7 +20,7 @@ from typing import Any, Dict, List, Optional
 import httpx  # async-capable, modern HTTP client
 from dotenv import load_dotenv
 
-from extractor import extract_skills_from_text
+from http_client import get_json
 
 # Load credentials from ai-engine/.env (overrides nothing if already set in the shell)
 load_dotenv()
@@ -48,22 +53,14 @@ def _normalize_job(
         description = (raw.get(desc_key) or "").strip()
         url = (raw.get(url_key) or "").strip() or None
 
-        # Extract skills from combined text
-        full_text = f"{title} {description}"
-        try:
-            from extractor import extract_skills_with_nlp
-            skills = extract_skills_with_nlp(full_text)
-        except Exception as e:
-            logger.warning(f"NLP extraction failed, using fallback: {e}")
-            skills = extract_skills_from_text(full_text, threshold=70)
-
+        # Skills stay None here; scraper.enrich_jobs fills them in after dedup
         return {
             "title":       title,
             "company":     company or "Unknown Company",
             "description": description or title,
             "url":         url,
             "source":      source_name,
-            "skills":      skills,
+            "skills":      None,
         }
     except Exception as exc:
         logger.warning("Failed to normalise job from %s: %s", source_name, exc)
@@ -77,7 +74,7 @@ def _normalize_job(
 REMOTIVE_BASE = "https://remotive.com/api/remote-jobs"
 
 
-def fetch_remotive(query: str, params: Dict = None, max_results: int = 30) -> List[Dict]:
+async def fetch_remotive(query: str, params: Dict = None, max_results: int = 30) -> List[Dict]:
     """
     Fetch remote jobs from the Remotive public API.
 
@@ -98,10 +95,7 @@ def fetch_remotive(query: str, params: Dict = None, max_results: int = 30) -> Li
 
         logger.info("Fetching from Remotive: query=%s", query)
 
-        with httpx.Client(timeout=20) as client:
-            response = client.get(REMOTIVE_BASE, params=query_params)
-            response.raise_for_status()
-            data = response.json()
+        data = await get_json(REMOTIVE_BASE, params=query_params)
 
         raw_jobs = data.get("jobs", [])
         logger.info("Remotive returned %d raw jobs", len(raw_jobs))
@@ -135,7 +129,7 @@ def fetch_remotive(query: str, params: Dict = None, max_results: int = 30) -> Li
 
 ADZUNA_BASE = "https://api.adzuna.com/v1/api/jobs/us/search/1"
 
-def fetch_adzuna(query: str, params: Dict = None, max_results: int = 30) -> List[Dict]:
+async def fetch_adzuna(query: str, params: Dict = None, max_results: int = 30) -> List[Dict]:
     """
     Fetch jobs from the Adzuna API.
     """
@@ -170,10 +164,7 @@ def fetch_adzuna(query: str, params: Dict = None, max_results: int = 30) -> List
         logger.info("Fetching from Adzuna: query=%s", query)
 
         # تمرير الـ custom_headers للكلينت
-        with httpx.Client(timeout=20, headers=custom_headers) as client:
-            response = client.get(ADZUNA_BASE, params=query_params)
-            response.raise_for_status()
-            data = response.json()
+        data = await get_json(ADZUNA_BASE, params=query_params, headers=custom_headers)
 
         raw_jobs = data.get("results", [])
         logger.info("Adzuna returned %d raw jobs", len(raw_jobs))
@@ -208,7 +199,7 @@ def fetch_adzuna(query: str, params: Dict = None, max_results: int = 30) -> List
 # Generic JSON API dispatcher
 # ---------------------------------------------------------------------------
 
-def fetch_generic_api(source: Dict, query: str, max_results: int = 30) -> List[Dict]:
+async def fetch_generic_api(source: Dict, query: str, max_results: int = 30) -> List[Dict]:
     """
     Generic fallback for API-type sources that match no specific handler.
     Sends a GET to the endpoint with `query` injected and tries to find
@@ -225,10 +216,7 @@ def fetch_generic_api(source: Dict, query: str, max_results: int = 30) -> List[D
 
         logger.info("Generic API fetch from '%s': %s", name, endpoint)
 
-        with httpx.Client(timeout=20, headers=headers) as client:
-            response = client.get(endpoint, params=query_params)
-            response.raise_for_status()
-            data = response.json()
+        data = await get_json(endpoint, params=query_params, headers=headers)
 
         # Try common container keys
         raw_jobs = (
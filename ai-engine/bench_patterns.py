@@ -0,0 +1,178 @@
+"""
+bench_patterns.py
+Microbenchmark and equivalence check for the compiled title / experience
+matchers (extractor.TITLE_MATCHER, extractor.EXPERIENCE_MATCHER).
+
+Compares them against the original behaviour - re.search over each
+pattern in priority order - on a generated corpus plus any PDFs given on
+the command line. Exits with status 1 if any first-match result differs.
+
+Usage:
+    python bench_patterns.py
+    python bench_patterns.py --texts 2000 --repeat 5 path/to/cv1.pdf path/to/cv2.pdf
+"""
+
+import argparse
+import logging
+import random
+import re
+import sys
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from extractor import (
+    EXPERIENCE_MATCHER, EXPERIENCE_PATTERNS, JOB_TITLE_PATTERNS, TITLE_MATCHER,
+)
+from priority_regex import fold_case
+
+# Words the corpus generator mixes in: title fragments, experience phrases,
+# separators and characters with special case-folding behaviour
+_VOCAB = (
+    "full stack full-stack fullstack front end front-end back backend back-end web developer "
+    "engineer designer ui ux / & react native angular vue vue.js node node.js laravel django "
+    "php python java se mobile app ios android flutter data scientist analyst machine learning "
+    "ml ai devops site reliability cloud sre software senior junior mid-level mid level "
+    "cyber security cybersecurity qa automation architect tech technical lead engineering "
+    "manager principal associate specialist years year of professional experience hands-on "
+    "over more than to - – + 1 2 3 5 10 12 0 present Senior DEVELOPER Engineer "
+    "ſre Kotlin dİrector ıos experienced developers engineering"
+).split()
+_SEPARATORS = [" ", " ", " ", "  ", "\n", "\t", ", ", ": ", " - "]
+
+
+def _legacy_first_match(patterns: Sequence[str], text: str) -> Optional[re.Match]:
+    """The original loop: first pattern (in order) with any re.search hit."""
+    for pattern in patterns:
+        m = re.search(pattern, text, re.IGNORECASE)
+        if m:
+            return m
+    return None
+
+
+def _legacy_result(patterns: Sequence[str], text: str) -> Optional[Tuple]:
+    m = _legacy_first_match(patterns, text)
+    if m is None:
+        return None
+    return (m.start(), m.end(), m.group(0), m.groups())
+
+
+def _compiled_result(matcher, text: str) -> Optional[Tuple]:
+    m = matcher.search(text)
+    if m is None:
+        return None
+    return (m.start, m.end, m.text, m.groups)
+
+
+def _generate_corpus(count: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        words = [rng.choice(_VOCAB) for _ in range(rng.randint(0, 400))]
+        words = [w.upper() if rng.random() < 0.05 else w for w in words]
+        corpus.append("".join(w + rng.choice(_SEPARATORS) for w in words))
+    return corpus
+
+
+def _load_pdfs(paths: Sequence[str]) -> List[str]:
+    from parser import clean_text, extract_text_from_pdf
+
+    texts = []
+    for path in paths:
+        text = extract_text_from_pdf(path)
+        if text:
+            texts.append(clean_text(text))
+        else:
+            print(f"  ! no text extracted from {path}")
+    return texts
+
+
+def _check_fold_table() -> List[str]:
+    """
+    fold_case must keep every character one character long, fold exactly the
+    characters re.IGNORECASE matches to an ASCII letter onto that letter, and
+    leave \\w / \\s / \\d membership and all other ASCII untouched.
+    """
+    letter = re.compile("[a-z]", re.IGNORECASE)
+    classes = [re.compile(r"\w"), re.compile(r"\s"), re.compile(r"\d")]
+    problems = []
+    for code in range(sys.maxunicode + 1):
+        char = chr(code)
+        folded = fold_case(char)
+        if len(folded) != 1:
+            problems.append(f"U+{code:04X} folds to {len(folded)} characters")
+            continue
+        if letter.fullmatch(char):
+            if not "a" <= folded <= "z" or not re.fullmatch(folded, char, re.IGNORECASE):
+                problems.append(f"U+{code:04X} folds to {folded!r}")
+        elif folded != char and folded.isascii():
+            problems.append(f"U+{code:04X} folds to ASCII {folded!r}")
+        if any(bool(c.fullmatch(char)) != bool(c.fullmatch(folded)) for c in classes):
+            problems.append(f"U+{code:04X} changes character class when folded")
+    return problems
+
+
+def _time(func: Callable[[str], object], texts: Sequence[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _cli() -> None:
+    parser = argparse.ArgumentParser(
+        description="Check and time the compiled title / experience matchers against per-pattern re.search.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("pdfs", nargs="*", help="Extra CV PDFs to include in the corpus")
+    parser.add_argument("--texts", type=int, default=1000, help="Number of generated texts")
+    parser.add_argument("--seed", type=int, default=13)
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs (best is reported)")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    corpus = _generate_corpus(args.texts, args.seed) + _load_pdfs(args.pdfs)
+    total_chars = sum(len(t) for t in corpus)
+    print(f"Corpus: {len(corpus)} texts, {total_chars:,} characters")
+
+    failures = 0
+    fold_problems = _check_fold_table()
+    for problem in fold_problems:
+        print(f"  ! case fold: {problem}")
+    failures += len(fold_problems)
+
+    suites = [
+        ("job title", JOB_TITLE_PATTERNS, TITLE_MATCHER),
+        ("experience", EXPERIENCE_PATTERNS, EXPERIENCE_MATCHER),
+    ]
+    for name, patterns, matcher in suites:
+        mismatches = 0
+        hits = 0
+        for text in corpus:
+            expected = _legacy_result(patterns, text)
+            actual = _compiled_result(matcher, text)
+            hits += expected is not None
+            if expected != actual:
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"  ! {name} mismatch: expected {expected}, got {actual}\n    text: {text[:200]!r}")
+        failures += mismatches
+
+        legacy = _time(lambda t: _legacy_first_match(patterns, t), corpus, args.repeat)
+        compiled = _time(matcher.search, corpus, args.repeat)
+        print(
+            f"{name:>10}: {hits}/{len(corpus)} texts matched, {mismatches} mismatches | "
+            f"per-pattern {legacy * 1000:8.1f} ms   compiled {compiled * 1000:8.1f} ms   "
+            f"speed-up x{legacy / compiled if compiled else float('inf'):.1f}"
+        )
+
+    if failures:
+        print(f"FAILED: {failures} difference(s)")
+        sys.exit(1)
+    print("OK: compiled matchers return identical first matches")
+
+
+if __name__ == "__main__":
+    _cli()
@@ -0,0 +1,186 @@
+"""
+Browser Pool Module
+Keeps a small number of headless Chrome instances alive and leases them to
+HTML scrape calls, instead of cold-starting a browser for every page.
+
+Lifecycle rules:
+  - At most `max_browsers` drivers exist at once; extra callers block
+    until a driver is returned.
+  - A driver is health-checked before every lease; dead drivers are
+    quit and replaced transparently.
+  - A driver is recycled (quit + gc) after `max_pages` page loads, when its
+    process tree crosses `max_memory_mb` (needs psutil), or when the
+    lease raised an exception.
+  - close() quits every idle driver; main.py calls it on shutdown.
+"""
+
+import gc
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Pool configuration (override via environment)
+BROWSER_POOL_SIZE     = int(os.environ.get("BROWSER_POOL_SIZE", 2))
+BROWSER_MAX_PAGES     = int(os.environ.get("BROWSER_MAX_PAGES", 25))
+BROWSER_MAX_MEMORY_MB = int(os.environ.get("BROWSER_MAX_MEMORY_MB", 1024))
+
+
+class _PooledDriver:
+    """A live WebDriver plus its usage counters."""
+
+    __slots__ = ("driver", "pages")
+
+    def __init__(self, driver: Any):
+        self.driver = driver
+        self.pages = 0
+
+
+class BrowserPool:
+    """
+    Thread-safe pool of WebDriver instances built by `factory`.
+
+    Usage:
+        with pool.lease() as driver:
+            driver.get(url)
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        max_browsers: int = BROWSER_POOL_SIZE,
+        max_pages: int = BROWSER_MAX_PAGES,
+        max_memory_mb: int = BROWSER_MAX_MEMORY_MB,
+    ):
+        self._factory = factory
+        self.max_browsers = max(1, max_browsers)
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+
+        self._slots = threading.BoundedSemaphore(self.max_browsers)
+        self._lock = threading.Lock()
+        self._idle: List[_PooledDriver] = []
+        self._closed = False
+        self.stats: Dict[str, int] = {"launched": 0, "recycled": 0, "unhealthy": 0, "leases": 0}
+
+    # ------------------------------------------------------------------
+    # Driver lifecycle helpers
+    # ------------------------------------------------------------------
+
+    def _count(self, key: str) -> int:
+        # Leases run on several scraper threads at once
+        with self._lock:
+            self.stats[key] += 1
+            return self.stats[key]
+
+    def _launch(self) -> _PooledDriver:
+        driver = self._factory()
+        launched = self._count("launched")
+        logger.info("Browser pool: launched Chrome (%d launched in total)", launched)
+        return _PooledDriver(driver)
+
+    @staticmethod
+    def _quit(item: _PooledDriver) -> None:
+        try:
+            item.driver.quit()
+        except Exception as quit_err:
+            logger.warning("Error closing browser: %s", quit_err)
+        # Explicit garbage collection to free Chrome subprocess memory
+        gc.collect()
+
+    @staticmethod
+    def _is_healthy(item: _PooledDriver) -> bool:
+        try:
+            return item.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    @staticmethod
+    def _memory_mb(item: _PooledDriver) -> Optional[float]:
+        """Resident memory of the browser process tree, if measurable."""
+        if not PSUTIL_AVAILABLE:
+            return None
+        pid = getattr(item.driver, "browser_pid", None)
+        if pid is None:
+            service = getattr(item.driver, "service", None)
+            process = getattr(service, "process", None)
+            pid = getattr(process, "pid", None)
+        if pid is None:
+            return None
+        try:
+            root = psutil.Process(pid)
+            procs = [root] + root.children(recursive=True)
+            return sum(p.memory_info().rss for p in procs) / (1024 * 1024)
+        except psutil.Error:
+            return None
+
+    def _should_recycle(self, item: _PooledDriver) -> bool:
+        if item.pages >= self.max_pages:
+            logger.info("Browser pool: recycling driver after %d pages", item.pages)
+            return True
+        memory = self._memory_mb(item)
+        if memory is not None and memory > self.max_memory_mb:
+            logger.info("Browser pool: recycling driver at %.0f MB", memory)
+            return True
+        return False
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def lease(self) -> Iterator[Any]:
+        """Borrow a healthy driver for one page load."""
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+
+        self._slots.acquire()
+        try:
+            with self._lock:
+                item = self._idle.pop() if self._idle else None
+
+            if item is not None and not self._is_healthy(item):
+                self._count("unhealthy")
+                logger.warning("Browser pool: discarding unresponsive driver")
+                self._quit(item)
+                item = None
+
+            if item is None:
+                item = self._launch()
+
+            self._count("leases")
+            try:
+                yield item.driver
+            except BaseException:
+                # A failed page may leave the browser in an unknown state
+                self._quit(item)
+                raise
+
+            item.pages += 1
+            if self._closed or self._should_recycle(item):
+                self._count("recycled")
+                self._quit(item)
+            else:
+                with self._lock:
+                    self._idle.append(item)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Quit every idle driver and refuse new leases."""
+        self._closed = True
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for item in idle:
+            self._quit(item)
+        if idle:
+            logger.info("Browser pool: closed %d idle browser(s)", len(idle))
@@ -0,0 +1,197 @@
+"""
+CV Cache Module
+Content-addressed cache of CV parsing results, so re-uploading the same PDF
+(retries, repeated gap analysis, Laravel CvController retries) skips
+pdfminer and the extractors entirely.
+
+  - Entries are keyed by the SHA-256 of the upload bytes, the extractor /
+    taxonomy version (extractor.extractor_version()) and the result kind
+    ("text:<mode>", "profile", "skills:fuzzy", ...). Loading a new skill
+    taxonomy or bumping EXTRACTOR_VERSION therefore never serves stale
+    results.
+  - Values are JSON stored in a local SQLite file under cache/.
+  - Entries expire after CV_CACHE_TTL seconds; when the stored values
+    exceed CV_CACHE_MAX_BYTES the least recently used ones are evicted.
+
+Set CV_CACHE_MAX_BYTES=0 to disable the cache.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from extractor import extractor_version
+
+logger = logging.getLogger(__name__)
+
+# Cache configuration (override via environment)
+CV_CACHE_PATH = os.environ.get(
+    "CV_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "cv_cache.sqlite3"),
+)
+CV_CACHE_MAX_BYTES = int(os.environ.get("CV_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+CV_CACHE_TTL       = float(os.environ.get("CV_CACHE_TTL", 30 * 24 * 3600))
+
+# Eviction trims down to this fraction of the cap, so it doesn't run on every put
+_EVICT_TARGET_RATIO = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cv_results (
+    key         TEXT PRIMARY KEY,
+    value       TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    created_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cv_results_accessed ON cv_results (accessed_at);
+"""
+
+
+def content_digest(data: bytes) -> str:
+    """SHA-256 hex digest of an upload's bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class CvResultCache:
+    """Thread-safe SQLite-backed LRU + TTL cache of JSON-serialisable results."""
+
+    def __init__(
+        self,
+        path: str = CV_CACHE_PATH,
+        max_bytes: int = CV_CACHE_MAX_BYTES,
+        ttl: float = CV_CACHE_TTL,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._total_bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            self._total_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cv_results").fetchone()[0]
+        return self._conn
+
+    @staticmethod
+    def _key(digest: str, kind: str) -> str:
+        return f"{digest}:{extractor_version()}:{kind}"
+
+    def get(self, digest: str, kind: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss (or when disabled)."""
+        if not self.enabled:
+            return None
+        key = self._key(digest, kind)
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connection()
+                row = conn.execute(
+                    "SELECT value, size, created_at FROM cv_results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                value, size, created_at = row
+                if now - created_at > self.ttl:
+                    conn.execute("DELETE FROM cv_results WHERE key = ?", (key,))
+                    self._total_bytes -= size
+                    self.misses += 1
+                    return None
+                conn.execute("UPDATE cv_results SET accessed_at = ? WHERE key = ?", (now, key))
+                self.hits += 1
+            return json.loads(value)
+        except (sqlite3.Error, ValueError) as exc:
+            logger.warning("CV cache read failed: %s", exc)
+            return None
+
+    def put(self, digest: str, kind: str, value: Any) -> None:
+        """Store a JSON-serialisable value, evicting LRU entries if over the cap."""
+        if not self.enabled:
+            return
+        payload = json.dumps(value, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        key = self._key(digest, kind)
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connection()
+                old = conn.execute("SELECT size FROM cv_results WHERE key = ?", (key,)).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO cv_results (key, value, size, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, payload, size, now, now),
+                )
+                self._total_bytes += size - (old[0] if old else 0)
+                if self._total_bytes > self.max_bytes:
+                    self._evict(conn, now)
+        except sqlite3.Error as exc:
+            logger.warning("CV cache write failed: %s", exc)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired entries, then least recently used ones, down to the target size."""
+        conn.execute("DELETE FROM cv_results WHERE created_at < ?", (now - self.ttl,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cv_results").fetchone()[0]
+        target = int(self.max_bytes * _EVICT_TARGET_RATIO)
+        evicted = 0
+        for key, size in conn.execute(
+            "SELECT key, size FROM cv_results ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total <= target:
+                break
+            conn.execute("DELETE FROM cv_results WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        self._total_bytes = total
+        if evicted:
+            logger.info("CV cache: evicted %d LRU entries (now %d bytes)", evicted, total)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._connection().execute("DELETE FROM cv_results")
+            self._total_bytes = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes": self._total_bytes or 0,
+            "max_bytes": self.max_bytes,
+            "version": extractor_version(),
+        }
+
+
+_cache = CvResultCache()
+
+
+def get_cv_cache() -> CvResultCache:
+    """Return the process-wide CV result cache."""
+    return _cache
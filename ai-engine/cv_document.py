@@ -0,0 +1,67 @@
+"""
+CV Document Module
+Preprocesses CV text once so every extractor (job title, experience,
+skills) reads the same views instead of re-splitting, re-lowercasing and
+re-tokenizing the document.
+
+A CVDocument holds:
+  - text:            the cleaned text itself
+  - lines:           text split on newlines (title header strategy)
+  - head_text:       the first TITLE_HEAD_WORDS words joined by spaces
+  - text_normalized: lowercased, whitespace-collapsed text (phrase matching)
+  - tokens:          cleaned lowercase word tokens, in order (fuzzy matching)
+  - token_set:       the distinct cleaned tokens (exact matching)
+
+Word boundaries are the same as str.split(): runs of non-whitespace.
+"""
+
+from typing import FrozenSet, List, Union
+
+from skill_matcher import clean_token
+
+# Window examined by the first two title strategies
+TITLE_HEADER_LINES = 30
+TITLE_HEAD_WORDS = 120
+
+
+class CVDocument:
+    """Immutable, preprocessed view of one CV's text."""
+
+    __slots__ = (
+        "text",
+        "lines",
+        "head_text",
+        "text_normalized",
+        "tokens",
+        "token_set",
+    )
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lines: List[str] = text.split("\n")
+
+        # Raw words are only needed while building the views below
+        words = text.split()
+        self.tokens: List[str] = [clean_token(word) for word in words]
+        self.token_set: FrozenSet[str] = frozenset(self.tokens)
+        self.head_text = " ".join(words[:TITLE_HEAD_WORDS])
+        self.text_normalized = " ".join(words).lower()
+
+    @classmethod
+    def of(cls, source: Union[str, "CVDocument"]) -> "CVDocument":
+        """Return `source` if it is already a CVDocument, else preprocess it."""
+        return source if isinstance(source, cls) else cls(source)
+
+    def head_complete(self) -> bool:
+        """
+        True once the text covers the whole window used by the header and
+        document-head title strategies, i.e. appending more text can no
+        longer change what those two strategies return.
+        """
+        return len(self.lines) >= TITLE_HEADER_LINES and len(self.tokens) >= TITLE_HEAD_WORDS
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __repr__(self) -> str:
+        return f"CVDocument(chars={len(self.text)}, lines={len(self.lines)}, words={len(self.tokens)})"
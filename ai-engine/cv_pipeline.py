@@ -0,0 +1,150 @@
+"""
+CV Pipeline Module
+Decides how much of an uploaded CV actually has to be laid out by pdfminer.
+
+Each endpoint asks for text in one of these modes:
+
+  - full:    every page (raw text export, /extract-text)
+  - skills:  up to PDF_PAGE_BUDGET_SKILLS pages (/analyze; all by default)
+  - profile: up to PDF_PAGE_BUDGET_PROFILE pages (/parse-cv; all by default)
+  - title:   up to PDF_PAGE_BUDGET_TITLE pages, and parsing stops as soon
+             as the header / document-head title strategies have settled
+
+Pages are parsed lazily (parser.iter_pdf_pages), so pages past the budget
+or past an early stop are never laid out. A budget of 0 means unlimited.
+Skills and experience can sit anywhere in a CV, so the skills/profile
+budgets default to 0; setting one trades recall on long CVs for speed.
+
+Long documents in the budget-only modes can also be split into page
+ranges laid out by several PDF workers at once (plan_page_ranges); the
+range texts are joined in page order, giving the same text as a
+sequential parse.
+"""
+
+import logging
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+from parser import PdfSource, clean_text, count_pdf_pages, extract_text_from_pdf
+
+logger = logging.getLogger(__name__)
+
+MODE_FULL = "full"
+MODE_TITLE = "title"
+MODE_SKILLS = "skills"
+MODE_PROFILE = "profile"
+
+# Page budgets per mode (override via environment; 0 = all pages)
+PAGE_BUDGETS: Dict[str, int] = {
+    MODE_FULL:    0,
+    MODE_TITLE:   int(os.environ.get("PDF_PAGE_BUDGET_TITLE", 3)),
+    MODE_SKILLS:  int(os.environ.get("PDF_PAGE_BUDGET_SKILLS", 0)),
+    MODE_PROFILE: int(os.environ.get("PDF_PAGE_BUDGET_PROFILE", 0)),
+}
+
+# Parallel page-range parsing (override via environment)
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", 8))   # shorter documents use one worker
+PDF_PARALLEL_MIN_CHUNK = int(os.environ.get("PDF_PARALLEL_MIN_CHUNK", 3))   # smallest range given to a worker
+
+
+def _title_settled(text: str) -> bool:
+    """
+    Stop condition for title mode: the head window is complete and the
+    header / head strategies found a title, so later pages can't change it.
+    """
+    # Imported lazily so PDF workers that never run title mode skip spaCy
+    from extractor import CVDocument, extract_job_title_from_head
+
+    doc = CVDocument(clean_text(text))
+    return doc.head_complete() and extract_job_title_from_head(doc) is not None
+
+
+# Early-stop predicates per mode (modes without one use the page budget only)
+_STOP_CONDITIONS: Dict[str, Callable[[str], bool]] = {
+    MODE_TITLE: _title_settled,
+}
+
+
+def text_variant(mode: str) -> str:
+    """
+    Identify the text `mode` yields, for caching: modes without an early
+    stop and with the same page budget get the same text and share one
+    variant (e.g. full, skills and profile at budget 0 are all "0").
+    """
+    budget = PAGE_BUDGETS[mode]
+    return f"{mode}:{budget}" if mode in _STOP_CONDITIONS else str(budget)
+
+
+def extract_cv_text(source: PdfSource, mode: str = MODE_FULL) -> Optional[str]:
+    """
+    Extract the raw text an endpoint needs from a CV PDF.
+
+    Args:
+        source: Path, binary stream, or PDF bytes
+        mode: One of MODE_FULL, MODE_TITLE, MODE_SKILLS, MODE_PROFILE
+
+    Returns:
+        Raw (uncleaned) text, or None if no text could be extracted
+    """
+    if mode not in PAGE_BUDGETS:
+        raise ValueError(f"Unknown CV parsing mode: {mode}")
+
+    return extract_text_from_pdf(
+        source,
+        max_pages=PAGE_BUDGETS[mode],
+        stop_when=_STOP_CONDITIONS.get(mode),
+    )
+
+
+def parse_cv_profile(source: PdfSource) -> Optional[Dict]:
+    """
+    Run the whole /parse-cv pipeline (profile page budget, cleaning,
+    extract_full_profile) in one call, e.g. inside a PDF worker process.
+
+    Returns:
+        {"text": cleaned text, "profile": {...}}, or None if no text
+    """
+    from extractor import extract_full_profile
+
+    raw_text = extract_cv_text(source, MODE_PROFILE)
+    cleaned_text = clean_text(raw_text) if raw_text else ""
+    if not cleaned_text:
+        return None
+    return {"text": cleaned_text, "profile": extract_full_profile(cleaned_text)}
+
+
+def plan_page_ranges(source: PdfSource, mode: str, workers: int) -> List[Tuple[int, int]]:
+    """
+    Split the pages `mode` needs into contiguous [start, stop) ranges, one
+    per worker. Returns [] when the document should be parsed sequentially:
+    too short, a single worker, or a mode with an early-stop condition
+    (which has to see pages in order).
+    """
+    if workers < 2 or mode in _STOP_CONDITIONS:
+        return []
+    try:
+        pages = count_pdf_pages(source)
+    except Exception as exc:
+        # Leave error reporting to the sequential path
+        logger.debug("Could not count PDF pages: %s", exc)
+        return []
+
+    budget = PAGE_BUDGETS[mode]
+    if budget:
+        pages = min(pages, budget)
+    if pages < PDF_PARALLEL_MIN_PAGES:
+        return []
+
+    chunk = max(PDF_PARALLEL_MIN_CHUNK, -(-pages // workers))
+    ranges = [(start, min(start + chunk, pages)) for start in range(0, pages, chunk)]
+    return ranges if len(ranges) > 1 else []
+
+
+def join_page_ranges(parts: List[str]) -> Optional[str]:
+    """Stitch range texts (in page order) the way extract_text_from_pdf finishes its text."""
+    text = "".join(parts)
+    if not text.strip():
+        logger.warning("No text extracted from PDF")
+        return None
+    logger.info(f"Successfully extracted {len(text)} characters from {len(parts)} parallel page range(s)")
+    return text.strip()
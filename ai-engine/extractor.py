@@ -5,21 +5,36 @@ Uses NLP and keyword matching to extract skills from CV text
 
 try:
     import spacy
+    from spacy.matcher import PhraseMatcher
     SPACY_AVAILABLE = True
 except ImportError:
     SPACY_AVAILABLE = False
 
-from typing import List, Dict, Set, Optional
+from functools import lru_cache
+from typing import Any, List, Dict, Set, Optional, Tuple, Union
 import re
-from fuzzywuzzy import fuzz
 import logging
 
+from cv_document import CVDocument, TITLE_HEADER_LINES
+from priority_regex import PriorityRegex
+from skill_matcher import SkillMatcher, get_skill_matcher
+from taxonomy import Taxonomy, TaxonomyRegistry
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Load spaCy model (make sure to run: python -m spacy download en_core_web_sm)
 nlp = None
 
+# Pipeline components skipped during skill extraction
+NLP_DISABLED_PIPES = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner", "senter"]
+
+# Default number of texts per nlp.pipe batch
+NLP_BATCH_SIZE = 64
+
+# Bump whenever extraction logic changes so cached CV results are invalidated
+EXTRACTOR_VERSION = "1"
+
 def load_nlp_model():
     """Load spaCy NLP model (lazy loading)"""
     global nlp
@@ -29,7 +44,8 @@ def load_nlp_model():
     
     if nlp is None:
         try:
-            nlp = spacy.load("en_core_web_sm")
+            # Only the tokenizer is needed for phrase matching
+            nlp = spacy.load("en_core_web_sm", disable=NLP_DISABLED_PIPES)
             logger.info("spaCy model loaded successfully")
         except OSError:
             logger.warning("spaCy model not found. Using fuzzy matching fallback.")
@@ -38,7 +54,23 @@ def load_nlp_model():
     return True
 
 
-# Predefined skill database (can be loaded from database in production)
+def _build_phrase_matcher(skills: Tuple[str, ...]) -> "PhraseMatcher":
+    """Compile a case-insensitive PhraseMatcher for the skill tuple."""
+    matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+    for skill, pattern in zip(skills, nlp.tokenizer.pipe(skills)):
+        if len(pattern):
+            matcher.add(skill, [pattern])
+    return matcher
+
+
+@lru_cache(maxsize=16)
+def _get_phrase_matcher(skills: Tuple[str, ...]) -> "PhraseMatcher":
+    """PhraseMatcher for a custom skill list (compiled once, then cached)."""
+    return _build_phrase_matcher(skills)
+
+
+# Built-in skill taxonomy, used until a Laravel skills export is loaded
+# (see taxonomy.SKILL_TAXONOMY_PATH and POST /taxonomy/reload)
 TECHNICAL_SKILLS = [
     # Programming Languages
     "PHP", "Python", "JavaScript", "Java", "C++", "C#", "Ruby", "Go", "Rust", 
@@ -107,13 +139,34 @@ SOFT_SKILLS = [
 ]
 
 
-def extract_skills_from_text(text: str, skill_list: List[str] = None, threshold: int = 80) -> List[Dict[str, str]]:
+def _compile_matchers(taxonomy: Taxonomy) -> Dict[str, Any]:
+    """Build every matcher for a taxonomy (runs on the registry's background thread)."""
+    matchers: Dict[str, Any] = {"exact": SkillMatcher(taxonomy.terms)}
+    # Only when spaCy is already loaded: a reload never cold-loads the model
+    if nlp is not None:
+        matchers["nlp"] = _build_phrase_matcher(taxonomy.terms)
+    return matchers
+
+
+SKILL_TAXONOMY = TaxonomyRegistry(Taxonomy.from_lists(TECHNICAL_SKILLS, SOFT_SKILLS), _compile_matchers)
+
+
+def get_taxonomy_registry() -> TaxonomyRegistry:
+    """Return the process-wide skill taxonomy registry."""
+    return SKILL_TAXONOMY
+
+
+def extract_skills_from_text(
+    text: Union[str, CVDocument],
+    skill_list: List[str] = None,
+    threshold: int = 80,
+) -> List[Dict[str, str]]:
     """
     Extract skills from text using fuzzy matching.
     
     Args:
-        text: The CV text to analyze
-        skill_list: Custom list of skills to search for (optional)
+        text: The CV text (or an already preprocessed CVDocument) to analyze
+        skill_list: Custom list of skills to search for (default: the taxonomy)
         threshold: Fuzzy matching threshold (0-100), higher = stricter
         
     Returns:
@@ -122,129 +175,161 @@ def extract_skills_from_text(text: str, skill_list: List[str] = None, threshold:
     if not text:
         return []
     
+    # One snapshot for the whole call, even if a reload swaps it meanwhile
+    snapshot = SKILL_TAXONOMY.current
     if skill_list is None:
-        skill_list = TECHNICAL_SKILLS + SOFT_SKILLS
+        matcher = snapshot.matchers["exact"]
+    else:
+        # Compiled once per distinct skill list, then reused for every text
+        matcher = get_skill_matcher(tuple(skill_list))
     
-    # Normalize text: lowercase and strip extra whitespace
-    text_lower = ' '.join(text.lower().split())
-    # Pre-tokenize for faster single-word matching
-    # Keep punctuation for context, but create a clean token set
-    tokens_clean = set(word.strip('.,!?;:()[]{}"\'/\\').lower() for word in text.split())
+    # Lowercased / normalized text and cleaned tokens, computed once
+    doc = CVDocument.of(text)
 
-    found_skills: Set[str] = set()
+    # Strategy 1: Multi-word skills (e.g., "React Native") -> one automaton pass
+    found_skills: Set[str] = matcher.find_phrases(doc.text_normalized)
     
-    # Simple keyword matching with fuzzy logic
-    for skill in skill_list:
-        skill_lower = skill.lower().strip()
-        
-        # Strategy 1: Multi-word skills (e.g., "React Native") -> Use substring match
-        if ' ' in skill_lower:
-            if skill_lower in text_lower:
-                found_skills.add(skill)
-                continue
-        
-        # Strategy 2: Single-word skills (e.g., "Java", "R") -> Use exact token match
-        # This prevents "R" matching inside "Expert" or "C" inside "Back"
-        else:
-            if skill_lower in tokens_clean:
-                found_skills.add(skill)
-                continue
-
-            # Strategy 3: Fuzzy matching for variations (only if not found exactly)
-            matched_fuzzy = False
-            for word in text.split():
-                word_clean = word.strip('.,!?;:()[]{}"\'/\\').lower()
-                
-                # Skip short words for fuzzy matching to reduce noise
-                if len(word_clean) < 3 or len(skill_lower) < 3:
-                     continue
-
-                if word_clean and fuzz.ratio(skill_lower, word_clean) >= threshold:
-                    found_skills.add(skill)
-                    matched_fuzzy = True
-                    break
-            
-            if matched_fuzzy:
-                continue
+    # Strategy 2: Single-word skills (e.g., "Java", "R") -> Use exact token match
+    # This prevents "R" matching inside "Expert" or "C" inside "Back"
+    found_skills |= matcher.find_tokens(doc.token_set)
+    
+    # Strategy 3: Fuzzy matching for variations (only if not found exactly)
+    # The index prunes by length / character overlap before scoring, so only
+    # plausible (skill, word) pairs ever reach fuzz.ratio
+    for skill_lower in matcher.fuzzy.match_tokens(doc.tokens, threshold, exclude=doc.token_set):
+        found_skills.update(matcher.single_word[skill_lower])
     
     # Categorize skills
-    result = []
-    for skill in found_skills:
-        skill_type = "technical" if skill in TECHNICAL_SKILLS else "soft"
-        result.append({
-            "name": skill,
-            "type": skill_type
-        })
+    result = _categorize_skills(found_skills, snapshot.taxonomy)
     
     logger.info(f"Extracted {len(result)} skills from text (threshold={threshold})")
     return result
 
 
-def extract_skills_with_nlp(text: str, skill_list: List[str] = None) -> List[Dict[str, str]]:
+def extract_skills_with_nlp(text: Union[str, CVDocument], skill_list: List[str] = None) -> List[Dict[str, str]]:
     """
     Extract skills using spaCy NLP for better context understanding.
     
     Args:
-        text: The CV text to analyze
-        skill_list: Custom list of skills to search for (optional)
+        text: The CV text (or a CVDocument) to analyze
+        skill_list: Custom list of skills to search for (default: the taxonomy)
         
     Returns:
         List of dictionaries containing found skills with their types
     """
-    load_nlp_model()
-    
     if not text:
         return []
+    if isinstance(text, CVDocument):
+        text = text.text
     
-    if skill_list is None:
-        skill_list = TECHNICAL_SKILLS + SOFT_SKILLS
+    return extract_skills_with_nlp_batch([text], skill_list=skill_list)[0]
+
+
+def extract_skills_with_nlp_batch(
+    texts: List[str],
+    skill_list: List[str] = None,
+    batch_size: int = NLP_BATCH_SIZE,
+    n_process: int = 1,
+) -> List[List[Dict[str, str]]]:
+    """
+    Extract skills from many texts in one streamed spaCy pass.
     
-    # Process text with spaCy
-    doc = nlp(text)
+    Texts are tokenized through nlp.pipe and matched against a PhraseMatcher
+    compiled once from the skill list (case-insensitive, token-aligned).
     
-    found_skills: Set[str] = set()
-    skill_list_lower = [s.lower() for s in skill_list]
+    Args:
+        texts: Job descriptions / CV texts to analyze
+        skill_list: Custom list of skills to search for (default: the taxonomy)
+        batch_size: Number of texts buffered per spaCy batch
+        n_process: Worker processes used by nlp.pipe
+        
+    Returns:
+        One skill list per input text, in input order
+    
+    Raises:
+        RuntimeError: If spaCy or its English model is not available
+    """
+    if not load_nlp_model():
+        raise RuntimeError("spaCy model is not available")
     
-    # Extract noun phrases and tokens
-    for chunk in doc.noun_chunks:
-        chunk_text = chunk.text.lower()
-        for skill in skill_list:
-            if skill.lower() in chunk_text:
-                found_skills.add(skill)
+    snapshot = SKILL_TAXONOMY.current
+    if skill_list is not None:
+        matcher = _get_phrase_matcher(tuple(skill_list))
+    else:
+        # Missing if the taxonomy was compiled before spaCy was first loaded
+        matcher = snapshot.matchers.get("nlp") or _get_phrase_matcher(snapshot.taxonomy.terms)
     
-    # Also check individual tokens
-    for token in doc:
-        token_text = token.text.lower()
-        for skill in skill_list:
-            if skill.lower() == token_text:
-                found_skills.add(skill)
+    results: List[List[Dict[str, str]]] = []
+    docs = nlp.pipe((text or "" for text in texts), batch_size=batch_size, n_process=n_process)
+    for doc in docs:
+        found_skills: Set[str] = {nlp.vocab.strings[match_id] for match_id, _, _ in matcher(doc)}
+        results.append(_categorize_skills(found_skills, snapshot.taxonomy))
     
-    # Categorize skills
+    logger.info(f"Extracted skills from {len(results)} texts using NLP")
+    return results
+
+
+def extract_skills_batch(texts: List[str], fallback_threshold: int = 70) -> List[List[Dict[str, str]]]:
+    """
+    Extract skills from many job texts, preferring one batched NLP pass.
+    
+    Falls back to per-text fuzzy matching when spaCy is unavailable.
+    
+    Args:
+        texts: Job texts (title + description) to analyze
+        fallback_threshold: Fuzzy threshold used by the fallback path
+        
+    Returns:
+        One skill list per input text, in input order
+    """
+    if not texts:
+        return []
+    
+    try:
+        return extract_skills_with_nlp_batch(texts)
+    except Exception as e:
+        logger.warning(f"NLP extraction failed, using fallback: {e}")
+        return [extract_skills_from_text(text, threshold=fallback_threshold) for text in texts]
+
+
+def _categorize_skills(found_skills: Set[str], taxonomy: Taxonomy) -> List[Dict[str, str]]:
+    """
+    Map matched spellings (names or aliases) to skill names and attach the
+    technical / soft type. Skills outside the taxonomy count as soft.
+    """
     result = []
+    seen: Set[str] = set()
     for skill in found_skills:
-        skill_type = "technical" if skill in TECHNICAL_SKILLS else "soft"
+        name = taxonomy.canonical(skill) or skill
+        if name in seen:
+            continue
+        seen.add(name)
         result.append({
-            "name": skill,
-            "type": skill_type
+            "name": name,
+            "type": taxonomy.types.get(name, "soft")
         })
-    
-    logger.info(f"Extracted {len(result)} skills using NLP")
     return result
 
 
 def get_predefined_skills() -> Dict[str, List[str]]:
     """
-    Get the complete list of predefined skills.
+    Get the complete list of skills in the current taxonomy.
     
     Returns:
         Dictionary with 'technical' and 'soft' skill lists
     """
+    taxonomy = SKILL_TAXONOMY.current.taxonomy
     return {
-        "technical": TECHNICAL_SKILLS,
-        "soft": SOFT_SKILLS
+        "technical": taxonomy.technical,
+        "soft": taxonomy.soft
     }
 
 
+def extractor_version() -> str:
+    """Version of the extraction logic + skill taxonomy (used in cache keys)."""
+    return f"{EXTRACTOR_VERSION}-{SKILL_TAXONOMY.version}"
+
+
 def categorize_skill_by_demand(percentage: float) -> str:
     """
     Categorize skill importance based on market demand frequency.
@@ -330,25 +415,40 @@ TITLE_SECTION_HEADERS = [
     r"current\s+(?:position|role|title)",
 ]
 
+EXPERIENCE_PATTERNS = [
+    r"(\d+)\+?\s*(?:to|\-|\u2013)?\s*(\d+)?\s*years?\s+(?:of\s+)?(?:professional\s+)?experience",
+    r"over\s+(\d+)\s*years?\s+(?:of\s+)?experience",
+    r"more\s+than\s+(\d+)\s*years?\s+(?:of\s+)?experience",
+    r"(\d+)\s*years?\s+(?:of\s+)?(?:hands[\s\-]on\s+)?experience",
+    r"experience\s+(?:of\s+)?(?:over\s+)?(\d+)\+?\s*years?",
+]
 
-def extract_job_title(text: str) -> Optional[str]:
+# Compiled once at import. The priority matchers return exactly what trying
+# each pattern in list order with re.search would (see priority_regex and
+# bench_patterns.py). Titles use one merged scan; the five experience
+# patterns are faster as separate prefix-scanned searches.
+TITLE_MATCHER = PriorityRegex(JOB_TITLE_PATTERNS)
+EXPERIENCE_MATCHER = PriorityRegex(EXPERIENCE_PATTERNS, merged=False)
+TITLE_HEADER_RE = re.compile(
+    r"(?:" + "|".join(TITLE_SECTION_HEADERS) + r")\s*[:\-]?\s*(.+)",
+    re.IGNORECASE,
+)
+YEAR_SPAN_RE = re.compile(
+    r"\b(20\d{2}|19\d{2})\s*(?:\u2013|-|to)\s*(20\d{2}|19\d{2}|present|current|now)\b",
+    re.IGNORECASE,
+)
+
+
+def extract_job_title_from_head(text: Union[str, CVDocument]) -> Optional[str]:
     """
-    Infer the candidate's current job title from CV text.
-
-    Strategy:
-    1. Look for a title immediately after known section headers (top 30 lines).
-    2. Scan the first ~600 characters (name + summary block).
-    3. Fall back to a full-document scan.
+    Run only the header and document-head title strategies (1 and 2).
+    Returns None if neither finds a title.
     """
-    lines = text.split("\n")
+    doc = CVDocument.of(text)
 
     # Strategy 1: After section headers
-    header_re = re.compile(
-        r"(?:" + "|".join(TITLE_SECTION_HEADERS) + r")\s*[:\-]?\s*(.+)",
-        re.IGNORECASE,
-    )
-    for line in lines[:30]:
-        m = header_re.search(line)
+    for line in doc.lines[:TITLE_HEADER_LINES]:
+        m = TITLE_HEADER_RE.search(line)
         if m:
             title = _match_title_in_text(m.group(1).strip())
             if title:
@@ -356,14 +456,30 @@ def extract_job_title(text: str) -> Optional[str]:
                 return title
 
     # Strategy 2: First ~600 chars
-    head_text = " ".join(text.split()[:120])
-    title = _match_title_in_text(head_text)
+    title = _match_title_in_text(doc.head_text)
     if title:
         logger.info(f"Job title found in document head: {title}")
         return title
 
+    return None
+
+
+def extract_job_title(text: Union[str, CVDocument]) -> Optional[str]:
+    """
+    Infer the candidate's current job title from CV text.
+
+    Strategy:
+    1. Look for a title immediately after known section headers (top 30 lines).
+    2. Scan the first ~600 characters (name + summary block).
+    3. Fall back to a full-document scan.
+    """
+    doc = CVDocument.of(text)
+    title = extract_job_title_from_head(doc)
+    if title:
+        return title
+
     # Strategy 3: Full document scan
-    title = _match_title_in_text(text)
+    title = _match_title_in_text(doc.text)
     if title:
         logger.info(f"Job title found via full scan: {title}")
         return title
@@ -373,42 +489,32 @@ def extract_job_title(text: str) -> Optional[str]:
 
 
 def _match_title_in_text(text: str) -> Optional[str]:
-    """Return the first pattern match from JOB_TITLE_PATTERNS."""
-    for pattern in JOB_TITLE_PATTERNS:
-        m = re.search(pattern, text, re.IGNORECASE)
-        if m:
-            return m.group(0).strip().title()
+    """Return the first pattern match from JOB_TITLE_PATTERNS (in priority order)."""
+    m = TITLE_MATCHER.search(text)
+    if m:
+        return m.text.strip().title()
     return None
 
 
-def extract_experience_years(text: str) -> Optional[str]:
+def extract_experience_years(text: Union[str, CVDocument]) -> Optional[str]:
     """
     Infer years of experience from CV text.
     Detects explicit mentions and calculates from work-history date spans.
     """
-    explicit_patterns = [
-        r"(\d+)\+?\s*(?:to|\-|\u2013)?\s*(\d+)?\s*years?\s+(?:of\s+)?(?:professional\s+)?experience",
-        r"over\s+(\d+)\s*years?\s+(?:of\s+)?experience",
-        r"more\s+than\s+(\d+)\s*years?\s+(?:of\s+)?experience",
-        r"(\d+)\s*years?\s+(?:of\s+)?(?:hands[\s\-]on\s+)?experience",
-        r"experience\s+(?:of\s+)?(?:over\s+)?(\d+)\+?\s*years?",
-    ]
-    for pattern in explicit_patterns:
-        m = re.search(pattern, text, re.IGNORECASE)
-        if m:
-            groups = [g for g in m.groups() if g is not None]
-            if len(groups) >= 2:
-                return f"{groups[0]}-{groups[1]} years"
-            elif groups:
-                years = int(groups[0])
-                return f"{years}+ years" if years > 0 else None
+    if isinstance(text, CVDocument):
+        text = text.text
+    # Explicit mentions, first matching pattern wins
+    m = EXPERIENCE_MATCHER.search(text)
+    if m:
+        groups = [g for g in m.groups if g is not None]
+        if len(groups) >= 2:
+            return f"{groups[0]}-{groups[1]} years"
+        elif groups:
+            years = int(groups[0])
+            return f"{years}+ years" if years > 0 else None
 
     # Calculate from work history date spans
-    year_spans = re.findall(
-        r"\b(20\d{2}|19\d{2})\s*(?:\u2013|-|to)\s*(20\d{2}|19\d{2}|present|current|now)\b",
-        text,
-        re.IGNORECASE,
-    )
+    year_spans = YEAR_SPAN_RE.findall(text)
     if year_spans:
         import datetime
         current_year = datetime.datetime.now().year
@@ -433,16 +539,18 @@ def extract_experience_years(text: str) -> Optional[str]:
     return None
 
 
-def extract_full_profile(text: str) -> Dict:
+def extract_full_profile(text: Union[str, CVDocument]) -> Dict:
     """
     Extract a complete profile from CV text: job_title, experience_years, and skills.
+    The text is preprocessed once (CVDocument) and shared by all extractors.
 
     Returns:
         {"job_title": str | None, "experience_years": str | None, "skills": [...]}
     """
-    job_title = extract_job_title(text)
-    experience_years = extract_experience_years(text)
-    skills = extract_skills_from_text(text)
+    doc = CVDocument.of(text)
+    job_title = extract_job_title(doc)
+    experience_years = extract_experience_years(doc)
+    skills = extract_skills_from_text(doc)
 
     logger.info(
         f"Full profile: title='{job_title}', experience='{experience_years}', skills={len(skills)}"
@@ -0,0 +1,114 @@
+"""
+Fetch Strategy Module
+Remembers, per domain, which HTML fetch method last produced job cards so
+the scraper can try the cheap path (plain GET) first on boards that serve
+server-rendered HTML, and the browser first everywhere else.
+
+Choices are persisted to a small JSON file so they survive restarts, and
+expire after FETCH_STRATEGY_TTL seconds so a board that changes its
+rendering is re-learned.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+METHOD_REQUESTS = "requests"
+METHOD_BROWSER = "browser"
+
+# Order used for domains with no (or an expired) record
+DEFAULT_METHOD_ORDER = [METHOD_BROWSER, METHOD_REQUESTS]
+
+FETCH_STRATEGY_PATH = os.environ.get(
+    "FETCH_STRATEGY_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "fetch_strategies.json"),
+)
+FETCH_STRATEGY_TTL = float(os.environ.get("FETCH_STRATEGY_TTL", 7 * 24 * 3600))
+
+
+def domain_of(url: str) -> str:
+    """Return the lowercase host of a URL ('' if it has none)."""
+    return urlsplit(url).netloc.lower()
+
+
+class FetchStrategyStore:
+    """Thread-safe, file-backed map of domain -> last successful method."""
+
+    def __init__(self, path: str = FETCH_STRATEGY_PATH, ttl: float = FETCH_STRATEGY_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._records: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            logger.warning("Could not read fetch strategies from %s: %s", self.path, exc)
+            return {}
+
+    def _save(self) -> None:
+        """Write atomically (temp file + rename) so a crash never truncates it."""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump(self._records, fh, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            logger.warning("Could not persist fetch strategies to %s: %s", self.path, exc)
+
+    def preferred(self, domain: str) -> Optional[str]:
+        """Return the learned method for `domain`, or None if unknown/expired."""
+        with self._lock:
+            record = self._records.get(domain)
+            if not record:
+                return None
+            if time.time() - record.get("updated_at", 0) > self.ttl:
+                del self._records[domain]
+                return None
+            return record.get("method")
+
+    def method_order(self, domain: str) -> List[str]:
+        """Methods to try for `domain`, learned choice first."""
+        preferred = self.preferred(domain)
+        if preferred is None:
+            return list(DEFAULT_METHOD_ORDER)
+        return [preferred] + [m for m in DEFAULT_METHOD_ORDER if m != preferred]
+
+    def record_success(self, domain: str, method: str) -> None:
+        """Remember that `method` produced job cards for `domain`."""
+        now = time.time()
+        with self._lock:
+            record = self._records.get(domain, {})
+            previous = record.get("method")
+            # Refresh the timestamp on disk only occasionally for unchanged choices
+            if previous == method and now - record.get("updated_at", 0) < self.ttl / 10:
+                return
+            self._records[domain] = {"method": method, "updated_at": now}
+            self._save()
+        if previous != method:
+            logger.info("Fetch strategy for '%s' is now '%s'", domain, method)
+
+
+_store: Optional[FetchStrategyStore] = None
+_store_lock = threading.Lock()
+
+
+def get_strategy_store() -> FetchStrategyStore:
+    """Return the process-wide strategy store (loaded on first use)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = FetchStrategyStore()
+        return _store
@@ -0,0 +1,105 @@
+"""
+Fuzzy Index Module
+Candidate search for fuzzy single-word skill matching.
+
+Instead of scoring every skill against every word of a document, the index
+prunes candidates before any Levenshtein call:
+
+  1. Length buckets – fuzz.ratio can never exceed 200 * min(a, b) / (a + b),
+     so skills whose length is too far from the word's are skipped.
+  2. Character-bag bound – the number of matching characters is at most the
+     multiset overlap of both strings, which caps the ratio the same way.
+
+Both bounds are exact upper bounds, so pruning never drops a true match.
+Survivors are scored with fuzz.ratio, and the result per (token, threshold)
+is memoised in a bounded LRU because the same words repeat across
+thousands of job descriptions.
+"""
+
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+import logging
+
+from fuzzywuzzy import fuzz
+
+logger = logging.getLogger(__name__)
+
+# Words and skills shorter than this are never fuzzy-matched (too noisy)
+MIN_FUZZY_LENGTH = 3
+
+# Max distinct (token, threshold) pairs remembered per index
+TOKEN_MEMO_SIZE = 50_000
+
+
+def _ratio_upper_bound(common: int, len_a: int, len_b: int) -> float:
+    """Best possible fuzz.ratio given `common` matching characters."""
+    return 200.0 * common / (len_a + len_b)
+
+
+class FuzzyIndex:
+    """
+    Length-bucketed index of lowercase skill keys for fuzzy lookups.
+
+    Build once per skill list; `match_tokens()` then returns every skill key
+    that some token matches with fuzz.ratio >= threshold.
+    """
+
+    def __init__(self, skill_keys: Iterable[str], memo_size: int = TOKEN_MEMO_SIZE):
+        self._buckets: Dict[int, List[Tuple[str, Dict[str, int]]]] = {}
+
+        for key in set(skill_keys):
+            if len(key) < MIN_FUZZY_LENGTH:
+                continue
+            self._buckets.setdefault(len(key), []).append((key, dict(Counter(key))))
+
+        self._lengths = sorted(self._buckets)
+        self._match_token = lru_cache(maxsize=memo_size)(self._match_token_uncached)
+
+    def _candidate_lengths(self, length: int, threshold: int) -> List[int]:
+        """Skill lengths whose ratio bound against `length` can reach threshold."""
+        # One point of slack covers fuzz.ratio rounding to the nearest integer
+        floor = threshold - 1
+        return [
+            skill_len for skill_len in self._lengths
+            if _ratio_upper_bound(min(skill_len, length), skill_len, length) >= floor
+        ]
+
+    def _match_token_uncached(self, token: str, threshold: int) -> FrozenSet[str]:
+        token_len = len(token)
+        token_chars = Counter(token)
+        floor = threshold - 1
+        matched: Set[str] = set()
+
+        for skill_len in self._candidate_lengths(token_len, threshold):
+            for key, key_chars in self._buckets[skill_len]:
+                common = sum(min(n, token_chars[c]) for c, n in key_chars.items())
+                if _ratio_upper_bound(common, skill_len, token_len) < floor:
+                    continue
+                if fuzz.ratio(key, token) >= threshold:
+                    matched.add(key)
+
+        return frozenset(matched)
+
+    def match_tokens(self, tokens: Iterable[str], threshold: int, exclude: Set[str] = frozenset()) -> Set[str]:
+        """
+        Fuzzy-match a batch of cleaned tokens against the index.
+
+        Args:
+            tokens:    Cleaned, lowercased words (duplicates are scored once)
+            threshold: Minimum fuzz.ratio (0-100) for a match
+            exclude:   Skill keys already found exactly; skipped in the result
+
+        Returns:
+            Set of matched lowercase skill keys
+        """
+        matched: Set[str] = set()
+        for token in set(tokens):
+            if len(token) < MIN_FUZZY_LENGTH:
+                continue
+            matched |= self._match_token(token, threshold)
+        return matched - exclude
+
+    def cache_info(self):
+        """Expose the token memo statistics (hits, misses, size)."""
+        return self._match_token.cache_info()
@@ -0,0 +1,353 @@
+"""
+Gap Analysis Module
+Scores a CV's skills against the market demand of every scraped role,
+from dense role x skill vectors kept in memory.
+
+The vectors are built from the merged skill_demand aggregates: one row
+per role, one column per skill seen in any role, holding the percentage
+of the role's postings that list the skill. Everything per request is
+then array arithmetic over that matrix:
+
+  - the CV becomes a boolean skill vector (names compared like the
+    Laravel GapAnalysisController: lowercase, without dots, dashes,
+    underscores and spaces, so "Vue.js" matches "VueJS")
+  - match score = demand-weighted coverage: the sum of demand of the
+    skills the CV has over the role's total demand, for all roles in one
+    matrix-vector product
+  - missing skills = demanded columns the CV lacks, bucketed essential /
+    important / nice-to-have by the skill_stats thresholds
+
+The matrix is built when the index starts (application startup), and a
+background thread rebuilds it whenever new jobs were folded into any role
+(SkillDemandStore.revisions) and swaps it in whole; requests never build
+or wait for a rebuild.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+from skill_demand import SkillDemandStore, get_demand_store, normalize_role
+from skill_stats import DEFAULT_SKILL_TYPE, ESSENTIAL_THRESHOLD, IMPORTANT_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+# Index configuration (override via environment)
+GAP_REFRESH_INTERVAL = float(os.environ.get("GAP_REFRESH_INTERVAL", 30))
+GAP_MISSING_LIMIT    = int(os.environ.get("GAP_MISSING_LIMIT", 10))
+
+# Importance codes stored in RoleVectors.importance
+NOT_REQUIRED, NICE_TO_HAVE, IMPORTANT, ESSENTIAL = 0, 1, 2, 3
+_IMPORTANCE_LABELS = {NICE_TO_HAVE: "nice_to_have", IMPORTANT: "important", ESSENTIAL: "essential"}
+
+_SKILL_NAME_NOISE_RE = re.compile(r"[.\-_\s]")
+
+
+def normalize_skill_name(name: str) -> str:
+    """Fuzzy skill key: "Vue.js" -> "vuejs", "Node.JS" -> "nodejs"."""
+    return _SKILL_NAME_NOISE_RE.sub("", name.strip().lower())
+
+
+class RoleVectors(NamedTuple):
+    """Dense demand vectors of every role (immutable once built)."""
+    roles: List[str]
+    rows: Dict[str, int]                 # role -> row
+    skills: List[str]
+    types: List[str]
+    columns: Dict[str, np.ndarray]       # normalized name -> columns
+    percentages: np.ndarray              # float64, roles x skills
+    importance: np.ndarray               # int8 codes, roles x skills
+    total_weight: np.ndarray             # per-role sum of percentages
+    total_jobs: np.ndarray               # per-role postings
+    built_at: float
+
+    def skill_vector(self, skills: Iterable[str]) -> np.ndarray:
+        """Boolean column mask of the skills a CV lists."""
+        has = np.zeros(len(self.skills), dtype=bool)
+        for name in skills:
+            columns = self.columns.get(normalize_skill_name(name))
+            if columns is not None:
+                has[columns] = True
+        return has
+
+    def match_percentages(self, has: np.ndarray) -> np.ndarray:
+        """Demand-weighted coverage of every role, 0-100 (100 for roles without skills)."""
+        matched = self.percentages @ has.astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(self.total_weight > 0, matched / self.total_weight * 100, 100.0)
+        return np.minimum(scores, 100.0)
+
+
+def _empty_vectors() -> RoleVectors:
+    return RoleVectors(
+        roles=[], rows={}, skills=[], types=[], columns={},
+        percentages=np.zeros((0, 0)), importance=np.zeros((0, 0), dtype=np.int8),
+        total_weight=np.zeros(0), total_jobs=np.zeros(0, dtype=np.int64), built_at=0.0,
+    )
+
+
+def build_role_vectors(store: SkillDemandStore, roles: Optional[List[str]] = None) -> RoleVectors:
+    """Merge each role's stored demand into one role x skill percentage matrix."""
+    if roles is None:
+        roles = [entry["role"] for entry in store.roles()]
+    roles = [normalize_role(role) for role in roles]
+    demands = [store.demand(role) for role in roles]
+
+    # Shared vocabulary: every skill any role lists, first-seen order
+    skills: List[str] = []
+    types: List[str] = []
+    index: Dict[str, int] = {}
+    for demand in demands:
+        for name in demand.counts:
+            if name not in index:
+                index[name] = len(skills)
+                skills.append(name)
+                types.append(demand.types.get(name, DEFAULT_SKILL_TYPE))
+
+    counts = np.zeros((len(roles), len(skills)), dtype=np.float64)
+    for row, demand in enumerate(demands):
+        if demand.counts:
+            counts[row, [index[name] for name in demand.counts]] = list(demand.counts.values())
+    total_jobs = np.array([demand.total_jobs for demand in demands], dtype=np.int64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percentages = np.where(total_jobs[:, None] > 0, counts / total_jobs[:, None] * 100, 0.0)
+
+    importance = np.select(
+        [percentages > ESSENTIAL_THRESHOLD, percentages >= IMPORTANT_THRESHOLD, percentages > 0],
+        [ESSENTIAL, IMPORTANT, NICE_TO_HAVE],
+        default=NOT_REQUIRED,
+    ).astype(np.int8)
+
+    keys: Dict[str, List[int]] = {}
+    for column, name in enumerate(skills):
+        keys.setdefault(normalize_skill_name(name), []).append(column)
+
+    return RoleVectors(
+        roles=roles,
+        rows={role: row for row, role in enumerate(roles)},
+        skills=skills,
+        types=types,
+        columns={key: np.array(columns, dtype=np.intp) for key, columns in keys.items()},
+        percentages=percentages,
+        importance=importance,
+        total_weight=percentages.sum(axis=1),
+        total_jobs=total_jobs,
+        built_at=time.time(),
+    )
+
+
+class GapAnalysisIndex:
+    """In-memory role demand vectors, refreshed in the background."""
+
+    def __init__(
+        self,
+        store: Optional[SkillDemandStore] = None,
+        refresh_interval: float = GAP_REFRESH_INTERVAL,
+        missing_limit: int = GAP_MISSING_LIMIT,
+    ):
+        self._store = store
+        self.refresh_interval = refresh_interval
+        self.missing_limit = missing_limit
+        self._vectors: Optional[RoleVectors] = None
+        self._built_revisions: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def store(self) -> SkillDemandStore:
+        return self._store or get_demand_store()
+
+    @property
+    def vectors(self) -> RoleVectors:
+        """The current vectors (empty until start() or refresh() built them)."""
+        vectors = self._vectors
+        return vectors if vectors is not None else _empty_vectors()
+
+    def refresh(self) -> RoleVectors:
+        """Rebuild the vectors of every stored role now and swap them in."""
+        revisions = self.store.revisions()
+        start = time.perf_counter()
+        vectors = build_role_vectors(self.store)
+        self._vectors = vectors
+        self._built_revisions = revisions
+        logger.info(
+            "Gap analysis vectors: %d roles x %d skills in %.3fs",
+            len(vectors.roles), len(vectors.skills), time.perf_counter() - start,
+        )
+        return vectors
+
+    def refresh_stale(self) -> bool:
+        """Rebuild if any role was folded into since the last build."""
+        if self._vectors is not None and self.store.revisions() == self._built_revisions:
+            return False
+        self.refresh()
+        return True
+
+    # ── Analysis ─────────────────────────────────────────────────────────────
+
+    def _skill_entries(self, vectors: RoleVectors, row: int, columns: np.ndarray) -> List[Dict[str, Any]]:
+        percentages = vectors.percentages[row, columns].tolist()
+        importance = vectors.importance[row, columns].tolist()
+        return [
+            {
+                "name": vectors.skills[column],
+                "type": vectors.types[column],
+                "percentage": round(percentage, 2),
+                "importance": _IMPORTANCE_LABELS[level],
+            }
+            for column, percentage, level in zip(columns.tolist(), percentages, importance)
+        ]
+
+    def _by_demand(self, vectors: RoleVectors, row: int, mask: np.ndarray) -> np.ndarray:
+        # Highest demand first; the stable sort keeps ties in column order
+        columns = np.flatnonzero(mask)
+        return columns[np.argsort(-vectors.percentages[row, columns], kind="stable")]
+
+    def analyze(self, skills: Iterable[str], role: str, limit: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Detailed gap of a CV against one role, or None if the role has no
+        recorded demand. Nice-to-have skills are capped at `limit` (the
+        long tail of skills a single posting listed).
+        """
+        vectors = self.vectors
+        row = vectors.rows.get(normalize_role(role))
+        if row is None:
+            return None
+        limit = self.missing_limit if limit is None else limit
+
+        has = vectors.skill_vector(skills)
+        level = vectors.importance[row]
+        required = level > NOT_REQUIRED
+        matched = self._by_demand(vectors, row, required & has)
+        missing = required & ~has
+        is_technical = np.array([t == "technical" for t in vectors.types], dtype=bool)
+
+        return {
+            "role": vectors.roles[row],
+            "total_jobs": int(vectors.total_jobs[row]),
+            "match_percentage": round(float(vectors.match_percentages(has)[row]), 2),
+            "total_required": int(required.sum()),
+            "matched_count": len(matched),
+            "missing_count": int(missing.sum()),
+            "matched_skills": self._skill_entries(vectors, row, matched),
+            "missing_essential_skills": self._skill_entries(
+                vectors, row, self._by_demand(vectors, row, missing & (level == ESSENTIAL))),
+            "missing_important_skills": self._skill_entries(
+                vectors, row, self._by_demand(vectors, row, missing & (level == IMPORTANT))),
+            "missing_nice_to_have_skills": self._skill_entries(
+                vectors, row, self._by_demand(vectors, row, missing & (level == NICE_TO_HAVE))[:limit]),
+            "technical_required": int((required & is_technical).sum()),
+            "technical_matched": int((required & has & is_technical).sum()),
+            "soft_required": int((required & ~is_technical).sum()),
+            "soft_matched": int((required & has & ~is_technical).sum()),
+        }
+
+    def analyze_all(self, skills: Iterable[str], limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Score a CV against every role at once: per-role match and missing
+        essential / important skills (top `limit` each), best match, and
+        the essential / important skills missing for the most roles.
+        """
+        vectors = self.vectors
+        limit = self.missing_limit if limit is None else limit
+        has = vectors.skill_vector(skills)
+        scores = vectors.match_percentages(has)
+
+        # Missing essential / important cells of all roles in one pass
+        gaps = (vectors.importance >= IMPORTANT) & ~has
+        gap_rows, gap_columns = np.nonzero(gaps)
+        required = vectors.importance > NOT_REQUIRED
+        matched_counts = (required & has).sum(axis=1).tolist()
+        missing_counts = (required & ~has).sum(axis=1).tolist()
+
+        results = []
+        for row in np.argsort(-scores, kind="stable").tolist():
+            level = vectors.importance[row]
+            results.append({
+                "role": vectors.roles[row],
+                "total_jobs": int(vectors.total_jobs[row]),
+                "match_percentage": round(float(scores[row]), 2),
+                "matched_count": matched_counts[row],
+                "missing_count": missing_counts[row],
+                "missing_essential_skills": [
+                    vectors.skills[c] for c in
+                    self._by_demand(vectors, row, gaps[row] & (level == ESSENTIAL))[:limit].tolist()
+                ],
+                "missing_important_skills": [
+                    vectors.skills[c] for c in
+                    self._by_demand(vectors, row, gaps[row] & (level == IMPORTANT))[:limit].tolist()
+                ],
+            })
+
+        # Skills missing for the most roles; ties: higher average demand first
+        frequency = np.bincount(gap_columns, minlength=len(vectors.skills))
+        demand = np.bincount(gap_columns, weights=vectors.percentages[gap_rows, gap_columns],
+                             minlength=len(vectors.skills))
+        common = np.flatnonzero(frequency)
+        common = common[np.lexsort((-demand[common] / frequency[common], -frequency[common]))][:limit]
+
+        return {
+            "analyzed_roles": len(results),
+            "roles": results,
+            "common_missing_skills": [
+                {"name": vectors.skills[c], "type": vectors.types[c], "frequency": int(frequency[c])}
+                for c in common.tolist()
+            ],
+            "average_match_percentage": round(float(scores.mean()), 2) if len(scores) else 0.0,
+            "best_match": (
+                {"role": results[0]["role"], "match_percentage": results[0]["match_percentage"]}
+                if results else None
+            ),
+        }
+
+    # ── Background refresh ───────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh_stale()
+            except Exception as exc:
+                logger.error("Gap analysis: refresh failed: %s", exc)
+
+    def start(self) -> None:
+        """Build the vectors of every stored role now, then keep them fresh in a background thread."""
+        if self._thread is not None:
+            return
+        try:
+            self.refresh()
+        except Exception as exc:
+            # The background thread retries (refresh_stale rebuilds while none exist)
+            logger.error("Gap analysis: initial build failed: %s", exc)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="gap-analysis", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        vectors = self._vectors
+        return {
+            "roles": len(vectors.roles) if vectors else 0,
+            "skills": len(vectors.skills) if vectors else 0,
+            "built_at": vectors.built_at if vectors else None,
+            "refresh_interval": self.refresh_interval,
+            "missing_limit": self.missing_limit,
+        }
+
+
+_index = GapAnalysisIndex()
+
+
+def get_gap_analysis_index() -> GapAnalysisIndex:
+    """Return the process-wide gap analysis index."""
+    return _index
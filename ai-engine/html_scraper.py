@@ -1,28 +1,37 @@
 """
 HTML Scraper Module
 Scrapes job listings from HTML-based job boards using undetected-chromedriver
-(bypasses anti-bot detection) with fallback to plain requests+BeautifulSoup.
+(bypasses anti-bot detection) and plain requests+BeautifulSoup. The order of
+the two is learned per domain (see fetch_strategy).
 
 Key Memory-Management Rules:
-  - driver.quit() is ALWAYS called in a finally block.
-  - gc.collect() is called after the driver is closed.
-  - Random delays between pages reduce server load and detection risk.
-  - One WebDriver instance per source call; never shared across threads.
+  - Chrome instances live in a BrowserPool and are leased per page; a
+    driver is only used by one thread at a time.
+  - The pool recycles (quit + gc) a driver after BROWSER_MAX_PAGES pages,
+    above BROWSER_MAX_MEMORY_MB, or after any error during a lease.
+  - Page requests go through the per-host rate limiter (token bucket with
+    jitter), which reduces server load and detection risk.
 """
 
-import gc
 import logging
 import random
+import threading
 import time
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import requests
 from bs4 import BeautifulSoup
 
-from extractor import extract_skills_from_text
+from browser_pool import BrowserPool
+from fetch_strategy import METHOD_BROWSER, domain_of, get_strategy_store
+from rate_limiter import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
+# Generic job cards get fuzzy-only skill matching at this threshold (no
+# NLP); scraper.enrich_jobs reads it from the card's "_skill_threshold"
+CARD_SKILL_THRESHOLD = 80
+
 # ---------------------------------------------------------------------------
 # User-Agent pool for rotation
 # ---------------------------------------------------------------------------
@@ -39,13 +48,55 @@ USER_AGENTS: List[str] = [
     "(KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36 Edg/121.0.0.0",
 ]
 
-# Page delay range (seconds) – randomised to avoid patterns
-PAGE_DELAY_MIN = 3.0
-PAGE_DELAY_MAX = 8.0
-
 # Max HTML pages to scrape per source to avoid excessive run time
 MAX_PAGES = 3
 
+# ---------------------------------------------------------------------------
+# Page-load profile (override per source via params["page_load"])
+# ---------------------------------------------------------------------------
+
+# URL patterns blocked over CDP for each non-essential resource type
+RESOURCE_BLOCK_PATTERNS: Dict[str, List[str]] = {
+    "image":      ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico"],
+    "font":       ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "stylesheet": ["*.css"],
+    "media":      ["*.mp4", "*.webm", "*.mp3", "*.ogg"],
+    "tracker":    [
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*facebook.net*", "*hotjar.com*", "*clarity.ms*",
+    ],
+}
+
+DEFAULT_PAGE_LOAD_PROFILE: Dict = {
+    # Any one of these means job cards are on the page (waited on as one selector)
+    "ready_selectors": [
+        'div[data-test="job-card"]',
+        'article',
+        '.job-card',
+        'div[class*="job"]',
+        'li[class*="job"]',
+        'a[href*="/jobs/p/"]',       # Wuzzuf job links (anchor for structural parsing)
+    ],
+    "ready_timeout":   10,           # seconds to wait for the first match
+    "block_resources": ["image", "font", "stylesheet", "media", "tracker"],
+    "blocked_urls":    [],           # extra URL patterns to block
+    "settle_delay":    [0.0, 0.0],   # optional random pause once cards are present
+}
+
+
+def _page_load_profile(source: Dict) -> Dict:
+    """Merge a source's params["page_load"] overrides onto the default profile."""
+    overrides = (source.get("params") or {}).get("page_load") or {}
+    return {**DEFAULT_PAGE_LOAD_PROFILE, **overrides}
+
+
+def _blocked_url_patterns(profile: Dict) -> List[str]:
+    patterns: List[str] = []
+    for resource in profile.get("block_resources") or []:
+        patterns.extend(RESOURCE_BLOCK_PATTERNS.get(resource, []))
+    patterns.extend(profile.get("blocked_urls") or [])
+    return patterns
+
 
 def _random_user_agent() -> str:
     return random.choice(USER_AGENTS)
@@ -68,85 +119,128 @@ def _try_import_uc():
         return None
 
 
-def _scrape_with_uc(url: str, source_name: str) -> Optional[str]:
+_browser_pool: Optional[BrowserPool] = None
+_browser_pool_lock = threading.Lock()
+
+
+def _create_driver():
+    """Launch one headless undetected-chromedriver instance for the pool."""
+    uc = _try_import_uc()
+    options = uc.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument(f"--user-agent={_random_user_agent()}")
+    # driver.get() returns at DOMContentLoaded instead of the full `load`
+    # event; the ready-selector wait in _load_page decides when a page is done
+    options.page_load_strategy = "eager"
+
+    driver = uc.Chrome(options=options, use_subprocess=True)
+    driver.set_page_load_timeout(30)
+    return driver
+
+
+def _cancelled(cancel: Optional[threading.Event]) -> bool:
+    return cancel is not None and cancel.is_set()
+
+
+def _get_browser_pool() -> BrowserPool:
+    """Return the process-wide browser pool (created on first use)."""
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            _browser_pool = BrowserPool(_create_driver)
+        return _browser_pool
+
+
+def close_browser_pool() -> None:
+    """Quit all pooled browsers (called on application shutdown)."""
+    global _browser_pool
+    with _browser_pool_lock:
+        pool, _browser_pool = _browser_pool, None
+    if pool is not None:
+        pool.close()
+
+
+def _scrape_with_uc(
+    url: str,
+    source_name: str,
+    profile: Optional[Dict] = None,
+    cancel: Optional[threading.Event] = None,
+) -> Optional[str]:
     """
-    Fetch page HTML using undetected-chromedriver.
-    Returns raw HTML string or None on failure.
-    Always calls driver.quit() + gc.collect() in finally.
+    Fetch page HTML using a pooled undetected-chromedriver instance.
+    Returns raw HTML string or None on failure or once `cancel` is set.
     """
+    profile = profile or DEFAULT_PAGE_LOAD_PROFILE
     uc = _try_import_uc()
     if uc is None:
         return None
 
-    driver = None
     try:
-        options = uc.ChromeOptions()
-        options.add_argument("--headless=new")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--window-size=1920,1080")
-        options.add_argument(f"--user-agent={_random_user_agent()}")
-
-        driver = uc.Chrome(options=options, use_subprocess=True)
-        driver.set_page_load_timeout(30)
-
-        logger.info("undetected-chromedriver: loading %s", url)
-        driver.get(url)
-
-        # ─── IMPLICIT WAIT / DEBUGGING ───────────────────────────────────────
-        # Wait up to 15s for any common job card container to appear
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-
-        # Common CSS selectors for job cards (broad match + Wuzzuf structural)
-        common_selectors = [
-            'div[data-test="job-card"]',
-            'article',
-            '.job-card',
-            'div[class*="job"]',
-            'li[class*="job"]',
-            'a[href*="/jobs/p/"]'        # Wuzzuf job links (anchor for structural parsing)
-        ]
-        
-        found = False
-        for selector in common_selectors:
-            try:
-                WebDriverWait(driver, 3).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                )
-                found = True
-                break
-            except Exception:
-                continue
+        with _get_browser_pool().lease() as driver:
+            # The lease may have waited for a free browser
+            if _cancelled(cancel):
+                return None
+            return _load_page(driver, url, profile, cancel)
 
-        if not found:
-            logger.warning("No common job cards found on page '%s' – site may be blocking.", url)
+    except Exception as exc:
+        logger.error("undetected-chromedriver error for '%s': %s", source_name, exc)
+        return None
 
-        # ────────────────────────────────────────────────────────────────────
 
-        # Random sleep still useful for behavior simulation
-        time.sleep(random.uniform(2.0, 4.0))
+def _load_page(driver, url: str, profile: Dict, cancel: Optional[threading.Event] = None) -> Optional[str]:
+    """
+    Load `url` in a leased driver and return the rendered HTML (None if
+    `cancel` was set while waiting for the rate limiter).
 
-        return driver.page_source
+    Non-essential resources are blocked over CDP. Drivers use the "eager"
+    page-load strategy, so driver.get() returns once the DOM is parsed and
+    a single wait on the combined ready selector returns as soon as any
+    job card is present.
+    """
+    # Rotate the User-Agent per page even though the browser is reused
+    try:
+        driver.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": _random_user_agent()})
+    except Exception as ua_err:
+        logger.debug("Could not rotate User-Agent: %s", ua_err)
 
-    except Exception as exc:
-        logger.error("undetected-chromedriver error for '%s': %s", source_name, exc)
+    # Set per page: pooled drivers may have served a source with another profile
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _blocked_url_patterns(profile)})
+    except Exception as block_err:
+        logger.debug("Could not configure resource blocking: %s", block_err)
+
+    if not get_rate_limiter().acquire(url, cancel):
         return None
+    logger.info("undetected-chromedriver: loading %s", url)
+    driver.get(url)
 
-    finally:
-        if driver is not None:
-            try:
-                driver.quit()
-                logger.debug("Browser closed for source '%s'", source_name)
-            except Exception as quit_err:
-                logger.warning("Error closing browser: %s", quit_err)
-        # Explicit garbage collection to free Chrome subprocess memory
-        gc.collect()
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    # One wait on the union of all selectors instead of one wait per selector
+    ready_selector = ", ".join(profile["ready_selectors"])
+    try:
+        WebDriverWait(driver, profile["ready_timeout"]).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, ready_selector))
+        )
+    except Exception:
+        logger.warning("No common job cards found on page '%s' – site may be blocking.", url)
+    else:
+        # Off by default; sources that render cards progressively can opt in
+        settle_min, settle_max = profile.get("settle_delay") or (0.0, 0.0)
+        if settle_max > 0:
+            time.sleep(random.uniform(settle_min, settle_max))
 
+    return driver.page_source
 
-def _scrape_with_requests(url: str, source_name: str) -> Optional[str]:
+
+def _scrape_with_requests(url: str, source_name: str, cancel: Optional[threading.Event] = None) -> Optional[str]:
     """
     Fallback: fetch page HTML using the requests library.
     """
@@ -156,6 +250,8 @@ def _scrape_with_requests(url: str, source_name: str) -> Optional[str]:
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.5",
         }
+        if not get_rate_limiter().acquire(url, cancel):
+            return None
         response = requests.get(url, headers=headers, timeout=15)
         response.raise_for_status()
         return response.text
@@ -296,16 +392,16 @@ def _parse_job_cards(html: str, source_name: str, base_url: str) -> List[Dict]:
                     elif href.startswith("/"):
                         url = base_url.rstrip("/") + href
                 
-                # Extract skills
-                skills = extract_skills_from_text(f"{title} {description}", threshold=80)
-
+                # Skills are extracted later (scraper.enrich_jobs), after dedup,
+                # with the strict fuzzy matcher these cards have always used
                 jobs.append({
                     "title":       title,
                     "company":     company,
                     "description": description or title,
                     "url":         url,
                     "source":      source_name,
-                    "skills":      skills,
+                    "skills":      None,
+                    "_skill_threshold": CARD_SKILL_THRESHOLD,
                 })
 
             except Exception as card_err:
@@ -318,18 +414,74 @@ def _parse_job_cards(html: str, source_name: str, base_url: str) -> List[Dict]:
     return jobs
 
 
+# ---------------------------------------------------------------------------
+# Adaptive fetch: cheap GET first where it has produced job cards before
+# ---------------------------------------------------------------------------
+
+def _fetch_page_jobs(
+    page_url: str,
+    source_name: str,
+    base_url: str,
+    profile: Dict,
+    cancel: Optional[threading.Event] = None,
+) -> Tuple[bool, List[Dict]]:
+    """
+    Fetch and parse one page, trying fetch methods in the order learned for
+    its domain and remembering whichever one produced job cards.
+
+    Returns:
+        (whether any method returned HTML, parsed jobs)
+    """
+    store  = get_strategy_store()
+    domain = domain_of(page_url)
+    got_html = False
+
+    for method in store.method_order(domain):
+        if _cancelled(cancel):
+            break
+        if method == METHOD_BROWSER:
+            html = _scrape_with_uc(page_url, source_name, profile, cancel)
+        else:
+            html = _scrape_with_requests(page_url, source_name, cancel)
+
+        if not html:
+            continue
+        got_html = True
+
+        page_jobs = _parse_job_cards(html, source_name, base_url)
+        if page_jobs:
+            store.record_success(domain, method)
+            return got_html, page_jobs
+
+        logger.info("'%s' via %s returned no job cards; trying next method.", domain, method)
+
+    return got_html, []
+
+
 # ---------------------------------------------------------------------------
 # Public entry point
 # ---------------------------------------------------------------------------
 
-def scrape_html_source(source: Dict, query: str, max_results: int = 30) -> List[Dict]:
+def scrape_html_source(
+    source: Dict,
+    query: str,
+    max_results: int = 30,
+    cancel: Optional[threading.Event] = None,
+) -> List[Dict]:
     """
     Scrape jobs from an HTML-based job board using the source config dict.
 
+    Setting `cancel` (e.g. when the caller's deadline passes) stops the
+    scrape at the next check: between pages, before each fetch method,
+    while waiting for the rate limiter and after a browser lease. A page
+    load already in progress runs to its own timeout first. The jobs
+    collected so far are returned.
+
     Args:
         source:      Dict with keys: name, endpoint, headers, params.
         query:       Job search term.
         max_results: Maximum jobs to collect.
+        cancel:      Optional event that stops the scrape when set.
 
     Returns:
         Normalised job list (may be empty on failure).
@@ -337,6 +489,7 @@ def scrape_html_source(source: Dict, query: str, max_results: int = 30) -> List[
     all_jobs: List[Dict] = []
     source_name = source.get("name", "unknown_html")
     base_url    = source.get("endpoint", "")
+    profile     = _page_load_profile(source)
 
     if not base_url:
         logger.error("HTML source '%s' has no endpoint configured.", source_name)
@@ -346,22 +499,21 @@ def scrape_html_source(source: Dict, query: str, max_results: int = 30) -> List[
     for page in range(MAX_PAGES):
         if len(all_jobs) >= max_results:
             break
+        if _cancelled(cancel):
+            logger.warning("HTML scrape of '%s' cancelled after %d page(s).", source_name, page)
+            break
 
         # Naïve pagination – works for many boards; extend per-source as needed
         page_url = f"{base_url}?q={query}&page={page + 1}"
 
         logger.info("Scraping HTML page %d/%d: %s", page + 1, MAX_PAGES, page_url)
 
-        html = _scrape_with_uc(page_url, source_name)
-        if html is None:
-            html = _scrape_with_requests(page_url, source_name)
+        got_html, page_jobs = _fetch_page_jobs(page_url, source_name, base_url, profile, cancel)
 
-        if not html:
+        if not got_html:
             logger.warning("No HTML returned for page %d of '%s'. Stopping.", page + 1, source_name)
             break
 
-        page_jobs = _parse_job_cards(html, source_name, base_url)
-
         if not page_jobs:
             logger.info("No jobs on page %d of '%s'. Stopping pagination.", page + 1, source_name)
             break
@@ -369,15 +521,8 @@ def scrape_html_source(source: Dict, query: str, max_results: int = 30) -> List[
         all_jobs.extend(page_jobs)
         logger.info("Collected %d jobs so far from '%s'", len(all_jobs), source_name)
 
-        # Rate limiting: random delay between pages
-        if page < MAX_PAGES - 1 and len(all_jobs) < max_results:
-            sleep_time = random.uniform(PAGE_DELAY_MIN, PAGE_DELAY_MAX)
-            logger.debug("Sleeping %.1fs before next page", sleep_time)
-            time.sleep(sleep_time)
-
-    # Trim to max_results and run final gc
+    # Trim to max_results (browser memory is reclaimed by the pool)
     result = all_jobs[:max_results]
-    gc.collect()
 
     logger.info(
         "HTML scraper finished for '%s': %d jobs collected.", source_name, len(result)
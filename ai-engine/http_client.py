@@ -0,0 +1,120 @@
+"""
+HTTP Client Module
+Application-wide httpx.AsyncClient pool shared by every API fetcher.
+
+  - One client per process: TCP/TLS connections are kept alive and reused
+    across pages, categories and requests.
+  - HTTP/2 is negotiated automatically when the `h2` package is installed
+    and the server supports it.
+  - A per-host semaphore (owned by the client, so it never outlives the
+    client's event loop) caps how many requests hit the same host at once,
+    and the shared rate limiter paces them, so dozens of category x source
+    fetches can be in flight without hammering any single board.
+
+main.py opens the pool on FastAPI startup and closes it on shutdown.
+Stand-alone callers (CLI tools) get a lazily created client and should
+call close_http_client() when done.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from rate_limiter import get_rate_limiter
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Pool configuration (override via environment)
+HTTP_TIMEOUT         = float(os.environ.get("HTTP_TIMEOUT", 20))
+HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", 100))
+HTTP_MAX_KEEPALIVE   = int(os.environ.get("HTTP_MAX_KEEPALIVE", 20))
+HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("HTTP_KEEPALIVE_EXPIRY", 30))
+HTTP_MAX_PER_HOST    = int(os.environ.get("HTTP_MAX_PER_HOST", 6))
+
+class _ClientPool:
+    """
+    The shared AsyncClient and its per-host semaphores. Both are bound to
+    the event loop that created them, so they are created and dropped
+    together.
+    """
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    def host_slot(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        slot = self.host_slots.get(host)
+        if slot is None:
+            slot = self.host_slots[host] = asyncio.Semaphore(HTTP_MAX_PER_HOST)
+        return slot
+
+
+_pool: Optional[_ClientPool] = None
+
+
+async def _get_pool() -> _ClientPool:
+    if _pool is None or _pool.client.is_closed:
+        await start_http_client()
+    return _pool
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    """Create the shared client (idempotent)."""
+    global _pool
+    if _pool is None or _pool.client.is_closed:
+        _pool = _ClientPool(httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT,
+            http2=HTTP2_AVAILABLE,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+        ))
+        logger.info(
+            "HTTP client pool started (http2=%s, max_connections=%d, per_host=%d)",
+            HTTP2_AVAILABLE, HTTP_MAX_CONNECTIONS, HTTP_MAX_PER_HOST,
+        )
+    return _pool.client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and drop all pooled connections."""
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        await pool.client.aclose()
+        logger.info("HTTP client pool closed")
+
+
+async def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it on first use outside FastAPI."""
+    return (await _get_pool()).client
+
+
+async def get_json(url: str, params: Dict = None, headers: Dict = None) -> Any:
+    """
+    GET `url` through the shared pool and decode the JSON body.
+
+    Raises:
+        httpx.HTTPStatusError: On a non-2xx response
+        httpx.RequestError:    On network / timeout errors
+    """
+    pool = await _get_pool()
+    await get_rate_limiter().acquire_async(url)
+    async with pool.host_slot(url):
+        response = await pool.client.get(url, params=params, headers=headers)
+    response.raise_for_status()
+    return response.json()
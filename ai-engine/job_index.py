@@ -0,0 +1,644 @@
+"""
+Job Index Module
+Ranks stored job postings against a candidate's skills with an in-memory
+inverted index: skill -> ids of the postings listing it.
+
+Postings are added incrementally as scrapes come in (/scrape-jobs, after
+enrich_jobs). A posting already indexed (same URL, or title / company /
+source, see skill_demand.job_key) is not added twice: it is marked as
+seen again and filed under the new scrape's role as well, so one posting
+can belong to several roles. Each skill's posting list, and each
+role's, is a NumPy array grown by doubling, so appending is amortised
+O(1) and a query reads it as a slice.
+
+Terms are skills of the active taxonomy (see taxonomy.py): a scraped
+name or alias ("JS", "Javascript") resolves to its skill's id, or to the
+canonical name when the export has no ids; names the taxonomy doesn't
+know are keyed like gap_analysis ("Vue.js" == "VueJS"). When the
+taxonomy changes, the terms are rebuilt from the stored skill names.
+
+Postings not seen by any scrape for JOB_INDEX_TTL seconds are evicted,
+and past JOB_INDEX_MAX_POSTINGS the least recently seen ones go first.
+Eviction compacts the posting ids, so the arrays stay dense.
+
+A query walks only the posting lists of the candidate's skills:
+
+  - bm25:    sum over matched skills of idf * (k1 + 1) / (1 + k1 * (1 - b + b * len / avg_len))
+             - the BM25 weight of a term present once, so postings
+             listing fewer skills (more focused on the matched ones)
+             rank higher
+  - overlap: sum of idf of the matched skills
+
+where idf = ln(1 + (N - df + 0.5) / (df + 0.5)) favours rare skills over
+ones nearly every posting lists. Scores accumulate into one array over
+all postings and the top N are taken with argpartition.
+
+The index is saved to JOB_INDEX_PATH (a NumPy .npz, written to a temp
+file and renamed) once it has gone JOB_INDEX_SAVE_INTERVAL seconds
+without changes, at least every JOB_INDEX_MAX_SAVE_DELAY seconds while
+scrapes keep coming, and on shutdown. It is loaded on startup, so
+restarts don't re-scrape.
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+import zipfile
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from gap_analysis import normalize_skill_name
+from skill_demand import job_key, normalize_role
+from taxonomy import Taxonomy
+
+logger = logging.getLogger(__name__)
+
+# Index configuration (override via environment)
+JOB_INDEX_PATH = os.environ.get(
+    "JOB_INDEX_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "job_index.npz"),
+)
+JOB_INDEX_SAVE_INTERVAL = float(os.environ.get("JOB_INDEX_SAVE_INTERVAL", 60))     # quiet period before a save
+JOB_INDEX_MAX_SAVE_DELAY = float(os.environ.get("JOB_INDEX_MAX_SAVE_DELAY", 600))  # longest a change stays unsaved
+JOB_INDEX_TTL           = float(os.environ.get("JOB_INDEX_TTL", 30 * 24 * 3600))   # 0 = never expire
+JOB_INDEX_MAX_POSTINGS  = int(os.environ.get("JOB_INDEX_MAX_POSTINGS", 200_000))   # 0 = unbounded
+JOB_INDEX_BM25_K1       = float(os.environ.get("JOB_INDEX_BM25_K1", 1.2))
+JOB_INDEX_BM25_B        = float(os.environ.get("JOB_INDEX_BM25_B", 0.75))
+JOB_MATCH_TOP_N         = int(os.environ.get("JOB_MATCH_TOP_N", 20))
+
+SCORING_METHODS = ("bm25", "overlap")
+
+_SNAPSHOT_FORMAT = 2
+
+# Posting fields kept for results (descriptions are left out)
+_POSTING_FIELDS = ("title", "company", "location", "url", "source")
+
+
+def _grow(array: np.ndarray, needed: int) -> np.ndarray:
+    """`array` if it can hold `needed` items, else a copy with doubled capacity."""
+    if needed <= len(array):
+        return array
+    grown = np.empty(max(needed, 2 * len(array), 8), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+def _pack(lists: List[np.ndarray], sizes: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Capacity-padded posting lists -> CSR (indptr, ids) arrays."""
+    indptr = np.zeros(len(sizes) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=indptr[1:])
+    ids = np.concatenate([p[:size] for p, size in zip(lists, sizes)]) if lists else np.empty(0, dtype=np.int32)
+    return indptr, ids
+
+
+def _unpack(indptr: np.ndarray, ids: np.ndarray) -> Tuple[List[np.ndarray], List[int]]:
+    """CSR (indptr, ids) arrays -> posting lists and their sizes."""
+    if len(indptr) == 0 or indptr[0] != 0 or indptr[-1] != len(ids) or np.any(np.diff(indptr) < 0):
+        raise ValueError("inconsistent posting list offsets")
+    lists = [ids[start:end].copy() for start, end in zip(indptr[:-1], indptr[1:])]
+    return lists, np.diff(indptr).tolist()
+
+
+def _encode_json(value: Any) -> np.ndarray:
+    return np.frombuffer(json.dumps(value, separators=(",", ":")).encode("utf-8"), dtype=np.uint8)
+
+
+def _decode_json(array: np.ndarray) -> Any:
+    return json.loads(array.tobytes().decode("utf-8"))
+
+
+def _check_snapshot(header: Dict, jobs: Any, arrays: Dict[str, Any]) -> None:
+    """Raise ValueError unless a loaded snapshot is internally consistent."""
+    if not isinstance(jobs, list) or not all(
+        isinstance(job, dict) and isinstance(job.get("skills"), list) for job in jobs
+    ):
+        raise ValueError("postings must be a list of jobs with skills")
+    n = len(jobs)
+    keys = header["keys"]
+    if not (len(arrays["lengths"]) == len(arrays["seen_at"]) == len(keys) == len(set(keys)) == n):
+        raise ValueError("per-posting arrays disagree on the number of postings")
+    if len(header["terms"]) != len(arrays["df"]) or len(header["roles"]) != len(arrays["role_sizes"]):
+        raise ValueError("term / role tables disagree with their posting lists")
+    for name in ("postings", "role_postings"):
+        ids = arrays[name]
+        if len(ids) and (ids.min() < 0 or ids.max() >= n):
+            raise ValueError(f"{name} reference postings outside 0..{n - 1}")
+
+
+def _current_taxonomy() -> Taxonomy:
+    # Imported lazily: extractor loads the whole skill extraction stack
+    from extractor import get_taxonomy_registry
+    return get_taxonomy_registry().current.taxonomy
+
+
+def _taxonomy_keys(taxonomy: Taxonomy) -> Dict[str, str]:
+    """Normalized spelling (skill name or alias) -> term key: "id:<skill id>", else the canonical name."""
+    keys: Dict[str, str] = {}
+    for term in taxonomy.terms:
+        name = taxonomy.canonical(term)
+        skill_id = taxonomy.ids.get(name)
+        keys.setdefault(
+            normalize_skill_name(term),
+            f"id:{skill_id}" if skill_id is not None else normalize_skill_name(name),
+        )
+    return keys
+
+
+def _term_key(taxonomy_keys: Dict[str, str], name: str) -> str:
+    spelling = normalize_skill_name(name)
+    return taxonomy_keys.get(spelling, spelling)
+
+
+def _skill_names(job: Dict) -> List[str]:
+    return [skill["name"] if isinstance(skill, dict) else skill for skill in job["skills"]]
+
+
+class JobIndex:
+    """Thread-safe inverted index of job postings by skill, persisted as snapshots."""
+
+    def __init__(
+        self,
+        path: Optional[str] = JOB_INDEX_PATH,
+        save_interval: float = JOB_INDEX_SAVE_INTERVAL,
+        k1: float = JOB_INDEX_BM25_K1,
+        b: float = JOB_INDEX_BM25_B,
+        ttl: float = JOB_INDEX_TTL,
+        max_postings: int = JOB_INDEX_MAX_POSTINGS,
+        max_save_delay: float = JOB_INDEX_MAX_SAVE_DELAY,
+        taxonomy: Callable[[], Taxonomy] = _current_taxonomy,
+    ):
+        self.path = path
+        self._taxonomy = taxonomy
+        self.save_interval = save_interval
+        self.max_save_delay = max_save_delay
+        self.ttl = ttl
+        self.max_postings = max_postings
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._clear()
+
+    def _clear(self) -> None:
+        # Skills (terms)
+        self._taxonomy_version: Optional[str] = None   # taxonomy the terms are keyed by
+        self._taxonomy_keys: Dict[str, str] = {}
+        self._keys_version: Optional[str] = None       # taxonomy _taxonomy_keys came from
+        self._terms: Dict[str, int] = {}          # term key (skill id / name) -> term
+        self._name_terms: Dict[str, int] = {}     # skill name as scraped -> term
+        self._postings: List[np.ndarray] = []     # term -> posting ids (capacity-padded)
+        self._df: List[int] = []                  # term -> postings listing it
+        # Postings
+        self._keys: Dict[str, int] = {}
+        self._jobs: List[Dict[str, Any]] = []
+        self._lengths = np.empty(0, dtype=np.int32)     # distinct skills per posting
+        self._seen_at = np.empty(0, dtype=np.float64)   # last scrape listing each posting
+        self._job_roles: List[Set[int]] = []            # posting -> roles it was scraped for
+        self._total_length = 0
+        # Roles (search queries)
+        self._roles: Dict[str, int] = {}                # normalized role -> role id
+        self._role_postings: List[np.ndarray] = []      # role -> posting ids (capacity-padded)
+        self._role_sizes: List[int] = []
+        # Unsaved changes (monotonic clock)
+        self._dirty = False
+        self._dirty_since = 0.0
+        self._changed_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    # ── Updates ──────────────────────────────────────────────────────────────
+
+    def add_jobs(self, jobs: Iterable[Dict], role: Optional[str] = None, when: Optional[float] = None) -> int:
+        """
+        Index postings with extracted skills (jobs whose 'skills' is still
+        None are ignored); returns how many were new. Postings already
+        indexed are marked as seen at `when` (default now) and added to
+        `role`. At max_postings, room is made before the new postings go
+        in, so a scrape never evicts its own postings; if one scrape alone
+        brings more than max_postings, only its first max_postings are kept.
+        """
+        role_key = normalize_role(role) if role else ""
+        now = time.time() if when is None else when
+        with self._lock:
+            self._sync_taxonomy()
+            role_id = self._role(role_key) if role_key else None
+            fresh: Dict[str, Dict] = {}
+            seen_again: List[int] = []
+            role_added: List[int] = []
+
+            for job in jobs:
+                if not isinstance(job.get("skills"), list):
+                    continue
+                key = job_key(job)
+                posting = self._keys.get(key)
+                if posting is None:
+                    fresh.setdefault(key, job)
+                    continue
+                seen_again.append(posting)
+                if role_id is not None and role_id not in self._job_roles[posting]:
+                    self._job_roles[posting].add(role_id)
+                    role_added.append(posting)
+
+            if seen_again:
+                self._seen_at[seen_again] = now
+            self._add_to_role(role_id, role_added)
+
+            new_jobs = list(fresh.items())
+            if self.max_postings:
+                new_jobs = new_jobs[:self.max_postings]
+                if len(self._jobs) + len(new_jobs) > self.max_postings:
+                    self._prune(now, room=len(new_jobs))
+            if new_jobs:
+                self._append_postings(new_jobs, role_id, now)
+            if new_jobs or seen_again or role_added:
+                self._touch()
+            return len(new_jobs)
+
+    def _append_postings(self, new_jobs: List[Tuple[str, Dict]], role_id: Optional[int], now: float) -> None:
+        # Caller holds self._lock
+        first = len(self._jobs)
+        term_ids: List[int] = []
+        lengths: List[int] = []
+        for key, job in new_jobs:
+            names = _skill_names(job)
+            terms = {self._term(name) for name in names}
+            self._keys[key] = len(self._jobs)
+            self._jobs.append({
+                **{field: job.get(field) for field in _POSTING_FIELDS},
+                "skills": list(dict.fromkeys(names)),
+            })
+            self._job_roles.append(set() if role_id is None else {role_id})
+            term_ids.extend(terms)
+            lengths.append(len(terms))
+        added = len(lengths)
+
+        # Per-posting arrays
+        self._lengths = _grow(self._lengths, first + added)
+        self._lengths[first:first + added] = lengths
+        self._seen_at = _grow(self._seen_at, first + added)
+        self._seen_at[first:first + added] = now
+        self._total_length += sum(lengths)
+
+        self._extend_posting_lists(first, term_ids, lengths)
+        self._add_to_role(role_id, list(range(first, first + added)))
+
+    def _extend_posting_lists(self, first: int, term_ids: List[int], lengths: List[int]) -> None:
+        # Caller holds self._lock; postings first.. list lengths[i] terms each, flattened in term_ids
+        added = len(lengths)
+
+        # Append the new posting ids to each skill's list, one copy per skill
+        terms = np.array(term_ids, dtype=np.int64)
+        postings = np.repeat(np.arange(first, first + added, dtype=np.int32), lengths)
+        order = np.argsort(terms, kind="stable")
+        terms, postings = terms[order], postings[order]
+        starts = np.flatnonzero(np.r_[True, terms[1:] != terms[:-1]])
+        ends = np.r_[starts[1:], len(terms)]
+        for term, start, end in zip(terms[starts].tolist(), starts.tolist(), ends.tolist()):
+            df = self._df[term]
+            self._postings[term] = _grow(self._postings[term], df + end - start)
+            self._postings[term][df:df + end - start] = postings[start:end]
+            self._df[term] = df + end - start
+
+    def _add_to_role(self, role_id: Optional[int], postings: List[int]) -> None:
+        # Caller holds self._lock; `postings` are not in the role's list yet
+        if role_id is None or not postings:
+            return
+        size = self._role_sizes[role_id]
+        self._role_postings[role_id] = _grow(self._role_postings[role_id], size + len(postings))
+        self._role_postings[role_id][size:size + len(postings)] = postings
+        self._role_sizes[role_id] = size + len(postings)
+
+    def _role(self, role_key: str) -> int:
+        role_id = self._roles.get(role_key)
+        if role_id is None:
+            role_id = self._roles[role_key] = len(self._role_postings)
+            self._role_postings.append(np.empty(0, dtype=np.int32))
+            self._role_sizes.append(0)
+        return role_id
+
+    def _touch(self) -> None:
+        now = time.monotonic()
+        if not self._dirty:
+            self._dirty = True
+            self._dirty_since = now
+        self._changed_at = now
+
+    def _term(self, name: str) -> int:
+        term = self._name_terms.get(name)
+        if term is None:
+            key = _term_key(self._taxonomy_keys, name)
+            term = self._terms.get(key)
+            if term is None:
+                term = self._terms[key] = len(self._postings)
+                self._postings.append(np.empty(0, dtype=np.int32))
+                self._df.append(0)
+            self._name_terms[name] = term
+        return term
+
+    def _sync_taxonomy(self) -> None:
+        # Caller holds self._lock
+        taxonomy = self._taxonomy()
+        if taxonomy.version == self._taxonomy_version and self._keys_version == taxonomy.version:
+            return
+        if self._keys_version != taxonomy.version:
+            self._taxonomy_keys = _taxonomy_keys(taxonomy)
+            self._keys_version = taxonomy.version
+        if self._taxonomy_version != taxonomy.version:
+            if self._jobs:
+                self._rekey()
+                logger.info("Job index: re-keyed %d postings for skill taxonomy %s", len(self._jobs), taxonomy.version)
+            self._taxonomy_version = taxonomy.version
+
+    def _rekey(self) -> None:
+        # Caller holds self._lock; rebuild every skill posting list under the current taxonomy keys
+        self._terms, self._name_terms, self._postings, self._df = {}, {}, [], []
+        term_ids: List[int] = []
+        lengths: List[int] = []
+        for job in self._jobs:
+            terms = {self._term(name) for name in job["skills"]}
+            term_ids.extend(terms)
+            lengths.append(len(terms))
+        self._lengths = np.array(lengths, dtype=np.int32)
+        self._total_length = sum(lengths)
+        self._extend_posting_lists(0, term_ids, lengths)
+        self._touch()
+
+    def refresh_taxonomy(self) -> None:
+        """Re-key the terms now if the skill taxonomy changed (otherwise done on the next add / search)."""
+        with self._lock:
+            self._sync_taxonomy()
+
+    # ── Eviction ─────────────────────────────────────────────────────────────
+
+    def prune(self, when: Optional[float] = None) -> int:
+        """Evict expired postings and, past max_postings, the least recently seen; returns how many."""
+        with self._lock:
+            return self._prune(time.time() if when is None else when)
+
+    def _prune(self, now: float, room: int = 0) -> int:
+        # Caller holds self._lock; `room` postings are about to be added
+        n = len(self._jobs)
+        seen_at = self._seen_at[:n]
+        keep = seen_at >= now - self.ttl if self.ttl > 0 else np.ones(n, dtype=bool)
+        capacity = max(self.max_postings - room, 0)
+        if self.max_postings and np.count_nonzero(keep) > capacity:
+            candidates = np.flatnonzero(keep)
+            newest = candidates[np.argsort(-seen_at[candidates], kind="stable")[:capacity]]
+            keep = np.zeros(n, dtype=bool)
+            keep[newest] = True
+        kept = np.flatnonzero(keep)
+        evicted = n - len(kept)
+        if not evicted:
+            return 0
+
+        # Renumber the kept postings 0..len(kept)-1, preserving their order
+        new_ids = np.full(n, -1, dtype=np.int32)
+        new_ids[kept] = np.arange(len(kept), dtype=np.int32)
+        for lists, sizes in ((self._postings, self._df), (self._role_postings, self._role_sizes)):
+            for i, (ids, size) in enumerate(zip(lists, sizes)):
+                ids = new_ids[ids[:size]]
+                lists[i] = ids[ids >= 0]
+                sizes[i] = len(lists[i])
+
+        kept_list = kept.tolist()
+        self._jobs = [self._jobs[posting] for posting in kept_list]
+        self._job_roles = [self._job_roles[posting] for posting in kept_list]
+        self._keys = {key: int(new_ids[posting]) for key, posting in self._keys.items() if keep[posting]}
+        self._lengths = self._lengths[kept]
+        self._seen_at = self._seen_at[kept]
+        self._total_length = int(self._lengths.sum())
+        self._touch()
+        logger.info("Job index: evicted %d postings, %d left", evicted, len(kept))
+        return evicted
+
+    # ── Queries ──────────────────────────────────────────────────────────────
+
+    def search(
+        self,
+        skills: Iterable[str],
+        top_n: int = JOB_MATCH_TOP_N,
+        scoring: str = "bm25",
+        role: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        The `top_n` postings best matching `skills`, best first, each with
+        its score and the matched / missing skills. `role` restricts
+        results to postings scraped for that search query.
+        """
+        if scoring not in SCORING_METHODS:
+            raise ValueError(f"Unknown scoring method: {scoring}")
+        with self._lock:
+            self._sync_taxonomy()
+            taxonomy_keys = self._taxonomy_keys
+            keys = {_term_key(taxonomy_keys, name) for name in skills}
+            n = len(self._jobs)
+            terms = [self._terms[key] for key in keys if key in self._terms]
+            if not n or not terms or top_n <= 0:
+                return []
+            if role is not None:
+                role_id = self._roles.get(normalize_role(role))
+                if role_id is None:
+                    return []
+
+            lengths = self._lengths[:n]
+            average_length = self._total_length / n
+            scores = np.zeros(n, dtype=np.float64)
+            for term in terms:
+                df = self._df[term]
+                postings = self._postings[term][:df]
+                idf = math.log1p((n - df + 0.5) / (df + 0.5))
+                if scoring == "bm25":
+                    norm = 1 - self.b + self.b * lengths[postings] / average_length
+                    scores[postings] += idf * (self.k1 + 1) / (1 + self.k1 * norm)
+                else:
+                    scores[postings] += idf
+            if role is not None:
+                in_role = np.zeros(n, dtype=bool)
+                in_role[self._role_postings[role_id][:self._role_sizes[role_id]]] = True
+                scores[~in_role] = 0
+
+            candidates = np.flatnonzero(scores)
+            if len(candidates) > top_n:
+                candidates = candidates[np.argpartition(-scores[candidates], top_n - 1)[:top_n]]
+            # Best first; ties keep the older posting first
+            top = candidates[np.lexsort((candidates, -scores[candidates]))]
+            jobs = [self._jobs[posting] for posting in top.tolist()]
+            top_scores = scores[top].tolist()
+
+        results = []
+        for job, score in zip(jobs, top_scores):
+            matched = [name for name in job["skills"] if _term_key(taxonomy_keys, name) in keys]
+            results.append({
+                **job,
+                "score": round(score, 4),
+                "matched_skills": matched,
+                "missing_skills": [name for name in job["skills"] if _term_key(taxonomy_keys, name) not in keys],
+                "coverage": round(len(matched) / len(job["skills"]) * 100, 2) if job["skills"] else 0.0,
+            })
+        return results
+
+    # ── Snapshots ────────────────────────────────────────────────────────────
+
+    def save(self) -> bool:
+        """Write a snapshot if anything changed since the last one; returns whether it did."""
+        if not self.path:
+            return False
+        with self._lock:
+            if not self._dirty:
+                return False
+            n = len(self._jobs)
+            indptr, postings = _pack(self._postings, self._df)
+            role_indptr, role_postings = _pack(self._role_postings, self._role_sizes)
+            arrays = {
+                "indptr": indptr,
+                "postings": postings,
+                "role_indptr": role_indptr,
+                "role_postings": role_postings,
+                "lengths": self._lengths[:n].copy(),
+                "seen_at": self._seen_at[:n].copy(),
+            }
+            header = {
+                "format": _SNAPSHOT_FORMAT,
+                "taxonomy": self._taxonomy_version,
+                "terms": list(self._terms),
+                "roles": list(self._roles),
+                "keys": list(self._keys),
+                "saved_at": time.time(),
+            }
+            jobs = list(self._jobs)
+            self._dirty = False
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "wb") as fh:
+                np.savez(
+                    fh,
+                    header=_encode_json(header),
+                    jobs=_encode_json(jobs),
+                    **arrays,
+                )
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            self._dirty = True
+            logger.error("Job index: could not save snapshot to %s: %s", self.path, exc)
+            return False
+        logger.info("Job index: saved %d postings to %s", n, self.path)
+        return True
+
+    def load(self) -> int:
+        """Replace the index with the saved snapshot, if any; returns the postings loaded."""
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        # A bad snapshot is treated like no snapshot; the index is only replaced once it checks out
+        try:
+            with np.load(self.path, allow_pickle=False) as snapshot:
+                header = _decode_json(snapshot["header"])
+                if header.get("format") != _SNAPSHOT_FORMAT:
+                    logger.warning("Job index: ignoring snapshot format %s", header.get("format"))
+                    return 0
+                jobs = _decode_json(snapshot["jobs"])
+                flat_postings = snapshot["postings"].astype(np.int32)
+                flat_role_postings = snapshot["role_postings"].astype(np.int32)
+                postings, df = _unpack(snapshot["indptr"], flat_postings)
+                role_postings, role_sizes = _unpack(snapshot["role_indptr"], flat_role_postings)
+                lengths = snapshot["lengths"].astype(np.int32)
+                seen_at = snapshot["seen_at"].astype(np.float64)
+            _check_snapshot(header, jobs, {
+                "lengths": lengths, "seen_at": seen_at, "df": df, "role_sizes": role_sizes,
+                "postings": flat_postings, "role_postings": flat_role_postings,
+            })
+            job_roles: List[Set[int]] = [set() for _ in jobs]
+            for role_id, (ids, size) in enumerate(zip(role_postings, role_sizes)):
+                for posting in ids[:size].tolist():
+                    job_roles[posting].add(role_id)
+        except (OSError, EOFError, zipfile.BadZipFile, ValueError, KeyError, TypeError, AttributeError) as exc:
+            logger.warning("Job index: ignoring unreadable snapshot %s: %s", self.path, exc)
+            return 0
+
+        with self._lock:
+            self._clear()
+            # Terms are re-keyed on the next sync if the taxonomy changed meanwhile
+            self._taxonomy_version = header.get("taxonomy")
+            self._terms = {key: term for term, key in enumerate(header["terms"])}
+            self._postings, self._df = postings, df
+            self._keys = {key: posting for posting, key in enumerate(header["keys"])}
+            self._jobs = jobs
+            self._lengths = lengths
+            self._seen_at = seen_at
+            self._total_length = int(lengths.sum())
+            self._roles = {role: role_id for role_id, role in enumerate(header["roles"])}
+            self._role_postings, self._role_sizes = role_postings, role_sizes
+            self._job_roles = job_roles
+        logger.info("Job index: loaded %d postings, %d skills from %s", len(jobs), len(self._terms), self.path)
+        return len(jobs)
+
+    # ── Background saving ────────────────────────────────────────────────────
+
+    def _save_due(self) -> bool:
+        """True once changes have been quiet for save_interval, or pending for max_save_delay."""
+        now = time.monotonic()
+        with self._lock:
+            return self._dirty and (
+                now - self._changed_at >= self.save_interval
+                or now - self._dirty_since >= self.max_save_delay
+            )
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.save_interval):
+            try:
+                self.refresh_taxonomy()
+                self.prune()
+                if self._save_due():
+                    self.save()
+            except Exception as exc:
+                logger.error("Job index: maintenance failed: %s", exc)
+
+    def start(self) -> None:
+        """Load the last snapshot, then evict and save in a background thread."""
+        if self._thread is not None:
+            return
+        self.load()
+        self.prune()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="job-index", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the saver and write a final snapshot."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.save()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "postings": len(self._jobs),
+                "skills": len(self._terms),
+                "roles": len(self._roles),
+                "taxonomy": self._taxonomy_version,
+                "average_skills_per_posting": round(self._total_length / len(self._jobs), 2) if self._jobs else 0.0,
+                "unsaved_changes": self._dirty,
+                "path": self.path,
+                "save_interval": self.save_interval,
+                "max_save_delay": self.max_save_delay,
+                "ttl": self.ttl,
+                "max_postings": self.max_postings,
+            }
+
+
+_index = JobIndex()
+
+
+def get_job_index() -> JobIndex:
+    """Return the process-wide job index."""
+    return _index
@@ -3,18 +3,41 @@ FastAPI Main Application
 Provides REST API endpoints for CV analysis
 """
 
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, File, UploadFile, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Dict, Optional
-import os
-import tempfile
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Any, List, Dict, Literal, Optional, Tuple
+import asyncio
+import hashlib
+import io
+import json
 import logging
-
-from parser import extract_text_from_pdf, clean_text
-from extractor import extract_skills_from_text, extract_skills_with_nlp, get_predefined_skills, extract_full_profile
-from scraper import scrape_wuzzuf, scrape_sample_jobs, calculate_skill_frequencies, dispatch_sources
+import os
+import sqlite3
+import zipfile
+
+from parser import clean_text
+from pdf_executor import get_pdf_executor, PdfParseTimeout, PDF_POOL_WORKERS
+from pdf_sandbox import PdfResourceLimitExceeded, LIMIT_WALL_CLOCK, LIMIT_WORKER_CRASH
+from cv_pipeline import MODE_FULL, MODE_PROFILE, MODE_SKILLS, MODE_TITLE, text_variant
+from cv_cache import get_cv_cache, content_digest
+from upload_limit import UploadSizeLimitMiddleware, MAX_UPLOAD_BYTES, MAX_BATCH_UPLOAD_BYTES
+from extractor import extract_skills_from_text, extract_skills_with_nlp, get_predefined_skills, extract_full_profile, extract_job_title, get_taxonomy_registry
+from taxonomy import TaxonomyError
+from scraper import scrape_wuzzuf, scrape_sample_jobs, calculate_skill_frequencies, dispatch_sources, enrich_jobs
+from skill_demand import get_demand_store
+from skill_cooccurrence import get_related_skills_index
+from gap_analysis import get_gap_analysis_index
+from job_index import get_job_index, JOB_MATCH_TOP_N
 from test_scraper import router as test_source_router
+from http_client import start_http_client, close_http_client
+
+try:
+    from html_scraper import close_browser_pool
+except ImportError:
+    close_browser_pool = None
 
 # Configure logging
 logging.basicConfig(
@@ -23,11 +46,36 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared resources on startup and release them on shutdown."""
+    await start_http_client()
+    get_pdf_executor().start()
+    get_taxonomy_registry().start_watching()
+    get_related_skills_index().start()
+    await asyncio.to_thread(get_gap_analysis_index().start)
+    await asyncio.to_thread(get_job_index().start)
+    try:
+        yield
+    finally:
+        get_taxonomy_registry().stop_watching()
+        get_related_skills_index().stop()
+        get_gap_analysis_index().stop()
+        await asyncio.to_thread(get_job_index().stop)
+        await close_http_client()
+        if close_browser_pool is not None:
+            await asyncio.to_thread(close_browser_pool)
+        await asyncio.to_thread(get_pdf_executor().shutdown)
+        await asyncio.to_thread(get_cv_cache().close)
+        await asyncio.to_thread(get_demand_store().close)
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="CareerCompass AI Engine",
     description="Microservice for CV parsing and skill extraction",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS to allow Laravel backend to connect
@@ -39,6 +87,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Reject oversized CV uploads while they stream in
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    path_limits={"/parse-cv/batch": MAX_BATCH_UPLOAD_BYTES},
+)
+
 # Register routers
 app.include_router(test_source_router)
 
@@ -63,6 +117,134 @@ def get_skills():
     return get_predefined_skills()
 
 
+class SkillRow(BaseModel):
+    """One row of the Laravel `skills` table export."""
+    id: Optional[int] = None
+    name: str
+    type: str = "technical"
+    aliases: List[str] = []
+
+
+class TaxonomyReloadRequest(BaseModel):
+    revision: Optional[str] = None          # e.g. latest skills.updated_at
+    skills: Optional[List[SkillRow]] = None # omit to re-read SKILL_TAXONOMY_PATH
+
+
+@app.get("/taxonomy")
+def taxonomy_status():
+    """Active skill taxonomy version (used in CV cache keys) and its source."""
+    return get_taxonomy_registry().stats
+
+
+@app.post("/taxonomy/reload")
+async def reload_taxonomy(request: Optional[TaxonomyReloadRequest] = None):
+    """
+    Load a new skill taxonomy without restarting the service.
+
+    The Laravel backend can push its `skills` table here; without a body
+    the taxonomy file is re-read. Matchers are compiled in the background
+    and swapped in atomically; requests in flight finish on the old ones.
+    """
+    rows = None
+    revision = None
+    if request is not None:
+        revision = request.revision
+        if request.skills is not None:
+            rows = [row.model_dump() for row in request.skills]
+
+    try:
+        await asyncio.wrap_future(get_taxonomy_registry().reload(rows, revision))
+    except TaxonomyError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except OSError as e:
+        logger.error(f"Error reloading skill taxonomy: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to reload skill taxonomy: {str(e)}")
+
+    return get_taxonomy_registry().stats
+
+
+# Chunk size used when hashing an upload
+UPLOAD_HASH_CHUNK = 1024 * 1024
+
+
+async def _upload_digest(file: UploadFile) -> str:
+    """
+    SHA-256 of the upload bytes (the CV cache key), read in chunks.
+    Oversized uploads are rejected with 413.
+    """
+    if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Uploaded PDF is too large")
+
+    await file.seek(0)
+    digest = hashlib.sha256()
+    while chunk := await file.read(UPLOAD_HASH_CHUNK):
+        digest.update(chunk)
+    await file.seek(0)
+    return digest.hexdigest()
+
+
+def _pdf_limit_detail(limit: str) -> Dict[str, str]:
+    """Structured error body for a PDF that hit a sandbox limit."""
+    if limit == LIMIT_WALL_CLOCK:
+        message = "Timed out while extracting text from the PDF."
+    elif limit == LIMIT_WORKER_CRASH:
+        message = "The PDF parser crashed on this file. The file may be malformed."
+    else:
+        message = f"The PDF exceeded the {limit} limit for parsing. The file may be malformed."
+    return {"error": "pdf_limit_exceeded", "limit": limit, "message": message}
+
+
+async def _cache_get(digest: str, kind: str) -> Optional[Any]:
+    return await asyncio.to_thread(get_cv_cache().get, digest, kind)
+
+
+async def _cache_put(digest: str, kind: str, value: Any) -> None:
+    await asyncio.to_thread(get_cv_cache().put, digest, kind, value)
+
+
+def _budget_kind(kind: str, mode: str) -> str:
+    """
+    Cache kind for a result computed from `mode`'s text. Modes that yield
+    the same text (same page budget, no early stop) share one entry.
+    """
+    return f"{kind}:{text_variant(mode)}"
+
+
+async def _extract_upload_text(
+    file: UploadFile,
+    mode: str = MODE_FULL,
+    digest: Optional[str] = None,
+) -> Tuple[str, Optional[str]]:
+    """
+    Return (digest, cleaned text) for an uploaded PDF, without a temp file.
+
+    The cleaned text comes from the CV cache when this exact file was seen
+    before. Otherwise pdfminer runs in the parsing pool (fed the upload
+    bytes), or, with the pool disabled, in a thread reading the upload's
+    spooled file directly. `mode` selects the page budget (see cv_pipeline);
+    pass `digest` if the caller already hashed the upload.
+    """
+    if digest is None:
+        digest = await _upload_digest(file)
+    text_kind = _budget_kind("text", mode)
+    cleaned_text = await _cache_get(digest, text_kind)
+    if cleaned_text is not None:
+        logger.info(f"CV cache hit for {file.filename} ({text_kind})")
+        return digest, cleaned_text
+
+    executor = get_pdf_executor()
+    if executor.in_process:
+        raw_text = await executor.extract_text(file.file, mode=mode)
+    else:
+        content = await file.read()
+        raw_text = await executor.extract_text(content, mode=mode)
+
+    cleaned_text = clean_text(raw_text) if raw_text else None
+    if cleaned_text:
+        await _cache_put(digest, text_kind, cleaned_text)
+    return digest, cleaned_text
+
+
 @app.post("/analyze")
 async def analyze_cv(file: UploadFile = File(...), use_nlp: bool = False):
     """
@@ -82,34 +264,27 @@ async def analyze_cv(file: UploadFile = File(...), use_nlp: bool = False):
             detail="Only PDF files are supported"
         )
     
-    # Create temporary file to save upload
-    temp_file = None
     try:
-        # Save uploaded file to temp location
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp:
-            content = await file.read()
-            temp.write(content)
-            temp_file = temp.name
-        
         logger.info(f"Processing file: {file.filename}")
         
-        # Extract text from PDF
-        raw_text = extract_text_from_pdf(temp_file)
+        # Extract and clean text from PDF (cached, else in the parsing process pool)
+        digest, cleaned_text = await _extract_upload_text(file, MODE_SKILLS)
         
-        if not raw_text:
+        if not cleaned_text:
             raise HTTPException(
                 status_code=422,
                 detail="Could not extract text from PDF. The file may be corrupted or image-based."
             )
         
-        # Clean extracted text
-        cleaned_text = clean_text(raw_text)
-        
         # Extract skills
-        if use_nlp:
-            skills = extract_skills_with_nlp(cleaned_text)
-        else:
-            skills = extract_skills_from_text(cleaned_text)
+        skills_kind = _budget_kind("skills:nlp" if use_nlp else "skills:fuzzy", MODE_SKILLS)
+        skills = await _cache_get(digest, skills_kind)
+        if skills is None:
+            if use_nlp:
+                skills = extract_skills_with_nlp(cleaned_text)
+            else:
+                skills = extract_skills_from_text(cleaned_text)
+            await _cache_put(digest, skills_kind, skills)
         
         # Prepare response
         response = {
@@ -127,19 +302,18 @@ async def analyze_cv(file: UploadFile = File(...), use_nlp: bool = False):
         
     except HTTPException:
         raise
+    except PdfParseTimeout as e:
+        logger.error(f"PDF parsing timed out for {file.filename}: {str(e)}")
+        raise HTTPException(status_code=504, detail=_pdf_limit_detail(LIMIT_WALL_CLOCK))
+    except PdfResourceLimitExceeded as e:
+        logger.error(f"PDF parsing hit the {e.limit} limit for {file.filename}")
+        raise HTTPException(status_code=422, detail=_pdf_limit_detail(e.limit))
     except Exception as e:
         logger.error(f"Error analyzing CV: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
         )
-    finally:
-        # Clean up temporary file
-        if temp_file and os.path.exists(temp_file):
-            try:
-                os.unlink(temp_file)
-            except Exception as e:
-                logger.warning(f"Could not delete temp file: {str(e)}")
 
 
 @app.post("/extract-text")
@@ -159,25 +333,16 @@ async def extract_text(file: UploadFile = File(...)):
             detail="Only PDF files are supported"
         )
     
-    temp_file = None
     try:
-        # Save uploaded file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp:
-            content = await file.read()
-            temp.write(content)
-            temp_file = temp.name
-        
         # Extract and clean text
-        raw_text = extract_text_from_pdf(temp_file)
+        _, cleaned_text = await _extract_upload_text(file)
         
-        if not raw_text:
+        if not cleaned_text:
             raise HTTPException(
                 status_code=422,
                 detail="Could not extract text from PDF"
             )
         
-        cleaned_text = clean_text(raw_text)
-        
         return {
             "filename": file.filename,
             "text": cleaned_text,
@@ -187,18 +352,18 @@ async def extract_text(file: UploadFile = File(...)):
         
     except HTTPException:
         raise
+    except PdfParseTimeout as e:
+        logger.error(f"PDF parsing timed out for {file.filename}: {str(e)}")
+        raise HTTPException(status_code=504, detail=_pdf_limit_detail(LIMIT_WALL_CLOCK))
+    except PdfResourceLimitExceeded as e:
+        logger.error(f"PDF parsing hit the {e.limit} limit for {file.filename}")
+        raise HTTPException(status_code=422, detail=_pdf_limit_detail(e.limit))
     except Exception as e:
         logger.error(f"Error extracting text: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
         )
-    finally:
-        if temp_file and os.path.exists(temp_file):
-            try:
-                os.unlink(temp_file)
-            except Exception as e:
-                logger.warning(f"Could not delete temp file: {str(e)}")
 
 
 # ---------------------------------------------------------------------------
@@ -206,11 +371,15 @@ async def extract_text(file: UploadFile = File(...)):
 # ---------------------------------------------------------------------------
 
 @app.post("/parse-cv")
-async def parse_cv(file: UploadFile = File(...)):
+async def parse_cv(file: UploadFile = File(...), title_only: bool = False):
     """
     Advanced CV parsing endpoint.
     Extracts job title, years of experience, and all skills from the uploaded PDF.
 
+    With title_only=true only the job title is extracted (experience_years
+    is null and skills is empty); parsing stops at the first pages that
+    settle the title.
+
     Returns:
         {
             "job_title": "Backend Developer",
@@ -224,26 +393,28 @@ async def parse_cv(file: UploadFile = File(...)):
             detail="Only PDF files are supported"
         )
 
-    temp_file = None
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp:
-            content = await file.read()
-            temp.write(content)
-            temp_file = temp.name
-
         logger.info(f"[parse-cv] Processing file: {file.filename}")
 
-        raw_text = extract_text_from_pdf(temp_file)
+        digest = await _upload_digest(file)
+        profile = None if title_only else await _cache_get(digest, _budget_kind("profile", MODE_PROFILE))
 
-        if not raw_text:
-            raise HTTPException(
-                status_code=422,
-                detail="Could not extract text from PDF. The file may be image-based or corrupted."
+        if profile is None:
+            _, cleaned_text = await _extract_upload_text(
+                file, MODE_TITLE if title_only else MODE_PROFILE, digest
             )
 
-        cleaned_text = clean_text(raw_text)
+            if not cleaned_text:
+                raise HTTPException(
+                    status_code=422,
+                    detail="Could not extract text from PDF. The file may be image-based or corrupted."
+                )
 
-        profile = extract_full_profile(cleaned_text)
+            if title_only:
+                profile = {"job_title": extract_job_title(cleaned_text), "experience_years": None, "skills": []}
+            else:
+                profile = extract_full_profile(cleaned_text)
+                await _cache_put(digest, _budget_kind("profile", MODE_PROFILE), profile)
 
         logger.info(
             f"[parse-cv] Extracted: title='{profile['job_title']}', "
@@ -260,18 +431,141 @@ async def parse_cv(file: UploadFile = File(...)):
 
     except HTTPException:
         raise
+    except PdfParseTimeout as e:
+        logger.error(f"PDF parsing timed out for {file.filename}: {str(e)}")
+        raise HTTPException(status_code=504, detail=_pdf_limit_detail(LIMIT_WALL_CLOCK))
+    except PdfResourceLimitExceeded as e:
+        logger.error(f"PDF parsing hit the {e.limit} limit for {file.filename}")
+        raise HTTPException(status_code=422, detail=_pdf_limit_detail(e.limit))
     except Exception as e:
         logger.error(f"[parse-cv] Error: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
         )
-    finally:
-        if temp_file and os.path.exists(temp_file):
-            try:
-                os.unlink(temp_file)
-            except Exception as e:
-                logger.warning(f"Could not delete temp file: {str(e)}")
+
+
+# ---------------------------------------------------------------------------
+# Batch CV parsing endpoint: many PDFs (or a zip) -> streamed NDJSON
+# ---------------------------------------------------------------------------
+
+# Batch limits (override via environment)
+BATCH_MAX_FILES   = int(os.environ.get("BATCH_MAX_FILES", 200))
+BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", max(2, PDF_POOL_WORKERS * 2)))
+
+# (filename, PDF bytes or None, (status_code, detail) error or None)
+BatchItem = Tuple[str, Optional[bytes], Optional[Tuple[int, str]]]
+
+
+def _unpack_zip(name: str, data: bytes) -> List[BatchItem]:
+    """Expand a zip upload into its PDF members (directories, other files and macOS metadata are skipped)."""
+    items: List[BatchItem] = []
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            for info in archive.infolist():
+                member = info.filename
+                if info.is_dir() or not member.lower().endswith(".pdf") or member.startswith("__MACOSX/"):
+                    continue
+                label = f"{name}/{member}"
+                if len(items) >= BATCH_MAX_FILES:
+                    items.append((label, None, (413, f"Batch exceeds {BATCH_MAX_FILES} files")))
+                    break
+                if info.file_size > MAX_UPLOAD_BYTES:
+                    items.append((label, None, (413, "Uploaded PDF is too large")))
+                    continue
+                items.append((label, archive.read(info), None))
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, RuntimeError) as e:
+        items.append((name, None, (400, f"Invalid zip archive: {str(e)}")))
+    return items
+
+
+async def _parse_batch_item(index: int, item: BatchItem, semaphore: asyncio.Semaphore) -> Dict:
+    """Parse one CV of a batch; failures become an error record, never an exception."""
+    filename, data, error = item
+    base = {"index": index, "filename": filename}
+    if error is not None:
+        return {**base, "status": "error", "status_code": error[0], "detail": error[1]}
+
+    try:
+        digest = content_digest(data)
+        profile = await _cache_get(digest, _budget_kind("profile", MODE_PROFILE))
+        if profile is None:
+            async with semaphore:
+                result = await get_pdf_executor().parse_profile(data)
+            if result is None:
+                return {**base, "status": "error", "status_code": 422,
+                        "detail": "Could not extract text from PDF. The file may be image-based or corrupted."}
+            profile = result["profile"]
+            await _cache_put(digest, _budget_kind("text", MODE_PROFILE), result["text"])
+            await _cache_put(digest, _budget_kind("profile", MODE_PROFILE), profile)
+
+        return {
+            **base,
+            "status": "success",
+            "job_title": profile["job_title"],
+            "experience_years": profile["experience_years"],
+            "skills": profile["skills"],
+            "total_skills": len(profile["skills"]),
+        }
+
+    except PdfParseTimeout:
+        logger.error(f"[parse-cv/batch] PDF parsing timed out for {filename}")
+        return {**base, "status": "error", "status_code": 504, "detail": _pdf_limit_detail(LIMIT_WALL_CLOCK)}
+    except PdfResourceLimitExceeded as e:
+        logger.error(f"[parse-cv/batch] PDF parsing hit the {e.limit} limit for {filename}")
+        return {**base, "status": "error", "status_code": 422, "detail": _pdf_limit_detail(e.limit)}
+    except Exception as e:
+        logger.error(f"[parse-cv/batch] Error for {filename}: {str(e)}")
+        return {**base, "status": "error", "status_code": 500,
+                "detail": f"Internal server error: {str(e)}"}
+
+
+@app.post("/parse-cv/batch")
+async def parse_cv_batch(files: List[UploadFile] = File(...)):
+    """
+    Parse many CVs in one request.
+
+    Accepts several PDF files and/or zip archives of PDFs. The CVs are
+    parsed concurrently across the PDF worker pool and the response is
+    streamed as NDJSON, one line per CV as soon as it is done (so lines
+    arrive out of order; each carries the input `index` and `filename`):
+
+        {"index": 0, "filename": "a.pdf", "status": "success", "job_title": ..., "skills": [...]}
+        {"index": 1, "filename": "b.pdf", "status": "error", "status_code": 422, "detail": "..."}
+
+    A failing file only produces an error line; the rest of the batch continues.
+    """
+    items: List[BatchItem] = []
+    for upload in files:
+        name = upload.filename or ""
+        data = await upload.read()
+        if name.lower().endswith(".zip"):
+            items.extend(await asyncio.to_thread(_unpack_zip, name, data))
+        elif name.lower().endswith(".pdf"):
+            error = (413, "Uploaded PDF is too large") if len(data) > MAX_UPLOAD_BYTES else None
+            items.append((name, None if error else data, error))
+        else:
+            items.append((name, None, (400, "Only PDF and ZIP files are supported")))
+
+    if not items:
+        raise HTTPException(status_code=400, detail="No PDF files found in the upload")
+    if len(items) > BATCH_MAX_FILES:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {BATCH_MAX_FILES} files")
+
+    logger.info(f"[parse-cv/batch] Processing {len(items)} file(s)")
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def stream_results():
+        tasks = [asyncio.create_task(_parse_batch_item(i, item, semaphore)) for i, item in enumerate(items)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield json.dumps(await next_done) + "\n"
+        finally:
+            # Client went away: stop parsing the rest
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
 
 
 # ---------------------------------------------------------------------------
@@ -289,13 +583,13 @@ class ScrapeJobsRequest(BaseModel):
 
 
 @app.post("/scrape-jobs")
-def scrape_jobs(request: ScrapeJobsRequest):
+async def scrape_jobs(request: ScrapeJobsRequest):
     """
     Fetch job listings using the hybrid scraping strategy.
 
     If `sources` is provided (from the Laravel backend) the dispatcher
-    routes each source to the correct fetcher (API or HTML) with per-source
-    error isolation.  Falls back to the legacy Wuzzuf scraper when no
+    routes each source to the correct fetcher (API or HTML) concurrently,
+    with per-source deadlines and error isolation.  Falls back to the legacy Wuzzuf scraper when no
     sources are configured, and to sample data when use_samples=True.
     """
     try:
@@ -313,22 +607,36 @@ def scrape_jobs(request: ScrapeJobsRequest):
 
         elif request.sources:
             # Hybrid mode: DB-driven sources list
-            jobs = dispatch_sources(
+            jobs = await dispatch_sources(
                 sources=request.sources,
                 query=request.query,
                 max_results=request.max_results,
             )
             jobs = jobs[:request.max_results]  # respect global limit
+            # Skill extraction runs only on the jobs that survived dedup + the cut
+            jobs = await asyncio.to_thread(enrich_jobs, jobs)
             source_label = "hybrid"
 
         else:
             # Legacy fallback: direct Wuzzuf scrape
             max_pages = max(1, request.max_results // 15)
-            jobs = scrape_wuzzuf(request.query, max_pages=max_pages)
+            jobs = await asyncio.to_thread(scrape_wuzzuf, request.query, max_pages=max_pages)
             jobs = jobs[:request.max_results]
             source_label = "wuzzuf"
 
-        # ── 2. Calculate skill statistics ─────────────────────────────────────
+        # ── 2. Fold real postings into the demand aggregates and job index ───
+        if jobs and source_label != "samples":
+            try:
+                await asyncio.to_thread(get_demand_store().record_jobs, request.query, jobs)
+            except sqlite3.Error as exc:
+                logger.warning("Could not record skill demand for '%s': %s", request.query, exc)
+            # Make the postings searchable by /match-jobs
+            try:
+                await asyncio.to_thread(get_job_index().add_jobs, jobs, request.query)
+            except Exception as exc:
+                logger.warning("Could not index jobs for '%s': %s", request.query, exc)
+
+        # ── 3. Calculate skill statistics ─────────────────────────────────────
         statistics = {}
         if request.calculate_statistics and jobs:
             skill_stats = calculate_skill_frequencies(jobs)
@@ -339,6 +647,9 @@ def scrape_jobs(request: ScrapeJobsRequest):
                     sum(len(job.get("skills", [])) for job in jobs) / len(jobs)
                 ),
             }
+            if source_label != "samples":
+                # All postings recorded for this role so far, not just this run
+                statistics["cumulative"] = await asyncio.to_thread(_role_demand, request.query)
             logger.info(
                 "Calculated statistics for %d jobs: %d unique skills",
                 len(jobs), len(skill_stats),
@@ -361,6 +672,130 @@ def scrape_jobs(request: ScrapeJobsRequest):
         )
 
 
+def _role_demand(role: str, sources: Optional[List[str]] = None,
+                 since: Optional[str] = None, until: Optional[str] = None) -> Dict[str, Any]:
+    demand = get_demand_store().demand(role, sources=sources, since=since, until=until)
+    return {"total_jobs": demand.total_jobs, "skills": demand.statistics().to_dict()}
+
+
+@app.get("/skill-demand")
+async def skill_demand(
+    role: str,
+    sources: Optional[List[str]] = Query(None),
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+):
+    """
+    Skill demand for a role, merged from the aggregates of every scrape
+    so far. Optionally restricted to some sources and a bucket range
+    (inclusive keys such as "2026-W40", see SKILL_DEMAND_BUCKET).
+
+    Returns:
+        {"role", "total_jobs", "skills": {name: {count, percentage, importance, type}}}
+    """
+    try:
+        result = await asyncio.to_thread(_role_demand, role, sources, since, until)
+    except sqlite3.Error as exc:
+        logger.error("Error reading skill demand: %s", exc)
+        raise HTTPException(status_code=500, detail=f"Failed to read skill demand: {exc}")
+    return {"role": role, **result}
+
+
+@app.get("/skill-demand/roles")
+async def skill_demand_roles():
+    """Roles with recorded skill demand, their job totals and bucket ranges."""
+    return await asyncio.to_thread(get_demand_store().roles)
+
+
+@app.get("/related-skills")
+def related_skills(role: str, skill: str, k: int = 10):
+    """
+    Skills most often required alongside `skill` in `role` postings,
+    ranked by lift, from the precomputed co-occurrence index.
+
+    Returns:
+        {"role", "skill", "related": [{"name", "jobs", "confidence", "lift", "pmi"}, ...]}
+    """
+    related = get_related_skills_index().related(role, skill, k)
+    if related is None:
+        raise HTTPException(status_code=404, detail=f"No skill demand recorded for role '{role}' yet")
+    return {"role": role, "skill": skill, "related": [entry._asdict() for entry in related]}
+
+
+class GapAnalysisRequest(BaseModel):
+    skills: List[str]
+    role: Optional[str] = None         # omit to score against every role
+    limit: Optional[int] = Field(None, ge=0)   # missing skills listed per bucket
+
+
+@app.post("/gap-analysis")
+async def gap_analysis(request: GapAnalysisRequest):
+    """
+    Skill gap of a CV against the market demand of scraped roles, from
+    the in-memory role demand vectors (see gap_analysis.py).
+
+    With `role`: matched skills, missing essential / important /
+    nice-to-have skills and the demand-weighted match percentage for
+    that role. Without: every role scored at once, best match first,
+    plus the skills missing for the most roles.
+    """
+    index = get_gap_analysis_index()
+    if request.role is None:
+        return await asyncio.to_thread(index.analyze_all, request.skills, request.limit)
+    result = await asyncio.to_thread(index.analyze, request.skills, request.role, request.limit)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No skill demand recorded for role '{request.role}' yet")
+    return result
+
+
+class MatchJobsRequest(BaseModel):
+    skills: List[str]
+    top_n: int = JOB_MATCH_TOP_N
+    scoring: Literal["bm25", "overlap"] = "bm25"
+    role: Optional[str] = None         # only postings scraped for this query
+
+
+@app.post("/match-jobs")
+async def match_jobs(request: MatchJobsRequest):
+    """
+    Rank the indexed job postings against a candidate's skills (e.g. the
+    /parse-cv result) with the inverted job index (see job_index.py).
+
+    Returns:
+        {"total_postings", "scoring", "jobs": [{title, company, location, url, source,
+         skills, score, matched_skills, missing_skills, coverage}, ...]}
+    """
+    index = get_job_index()
+    jobs = await asyncio.to_thread(index.search, request.skills, request.top_n, request.scoring, request.role)
+    return {"total_postings": len(index), "scoring": request.scoring, "jobs": jobs}
+
+
+@app.get("/match-jobs/status")
+def match_jobs_status():
+    """Job index size and snapshot settings."""
+    return get_job_index().stats
+
+
+@app.get("/pdf-executor/status")
+def pdf_executor_status():
+    """PDF worker pool configuration and how often each sandbox limit was hit."""
+    return get_pdf_executor().stats
+
+
+@app.get("/cv-cache/status")
+def cv_cache_status():
+    """CV result cache size, hit / miss counts and the extractor version it is keyed by."""
+    return get_cv_cache().stats
+
+
+@app.delete("/cv-cache")
+async def clear_cv_cache():
+    """Drop every cached CV result (text, skills and profiles)."""
+    cache = get_cv_cache()
+    await asyncio.to_thread(cache.clear)
+    return {"status": "cleared", **cache.stats}
+
+
 @app.get("/scrape-jobs/status")
 def scraper_status():
     """Check if the scraper service is operational."""
@@ -368,7 +803,7 @@ def scraper_status():
         "service": "Job Scraper",
         "status": "operational",
         "supported_sources": ["wuzzuf", "samples"],
-        "rate_limit": "2 seconds between requests",
+        "rate_limit": "per-host token bucket with jitter",
         "max_pages": 10
     }
 
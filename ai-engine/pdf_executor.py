@@ -0,0 +1,329 @@
+"""
+PDF Executor Module
+Runs CPU-bound PDF text extraction in a pool of worker processes so the
+FastAPI event loop never blocks on pdfminer layout analysis.
+
+  - Workers receive the raw PDF bytes and return the extracted text,
+    limited to the pages the requested cv_pipeline mode needs.
+  - With PDF_POOL_WORKERS=0 parsing runs in a thread instead, reading the
+    upload's spooled file directly (no copy, but no hard timeout either).
+  - Long PDFs are split into page ranges parsed by several workers at
+    once and stitched back in page order (see cv_pipeline.plan_page_ranges).
+    The page count behind that split runs in a sandboxed worker too, which
+    parses short documents directly instead of returning a plan.
+  - Each task has a timeout; a worker stuck past it is terminated and the
+    pool is rebuilt, so one pathological file cannot pin a core forever.
+    Other tasks running in the pool at that moment are retried once on
+    the new pool; a worker that dies surfaces as the "worker_crash" limit.
+  - Workers also run under hard memory / CPU limits (see pdf_sandbox);
+    every limit hit is counted in `limit_hits` for capacity planning.
+  - Workers are recycled after PDF_MAX_TASKS_PER_CHILD tasks to keep
+    pdfminer's memory growth in check.
+
+main.py starts the executor on startup and shuts it down on exit. A
+timeout restarts the whole pool, so tasks sharing it are parsed twice; the
+timeout should therefore still sit well above normal parse times.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from cv_pipeline import MODE_FULL, extract_cv_text, join_page_ranges, parse_cv_profile, plan_page_ranges
+from parser import PdfSource, extract_page_range_text
+from pdf_sandbox import (
+    LIMIT_WALL_CLOCK, LIMIT_WORKER_CRASH, PDF_CPU_LIMIT, PDF_MEMORY_LIMIT_MB,
+    PdfResourceLimitExceeded, init_worker, run_limited,
+)
+
+logger = logging.getLogger(__name__)
+
+# Executor configuration (override via environment)
+PDF_POOL_WORKERS        = int(os.environ.get("PDF_POOL_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+PDF_TASK_TIMEOUT        = float(os.environ.get("PDF_TASK_TIMEOUT", 30))
+PDF_MAX_TASKS_PER_CHILD = int(os.environ.get("PDF_MAX_TASKS_PER_CHILD", 50))
+
+
+class PdfParseTimeout(Exception):
+    """Raised when a PDF takes longer than the per-task timeout to parse."""
+
+
+def _parse_pdf_bytes(data: bytes, mode: str = MODE_FULL) -> Optional[str]:
+    """Worker entry point: extract text from an in-memory PDF."""
+    return extract_cv_text(data, mode)
+
+
+def _plan_or_parse_pdf_bytes(
+    data: bytes, mode: str, workers: int
+) -> Tuple[List[Tuple[int, int]], Optional[str]]:
+    """
+    Worker entry point: count the pages (this already parses the xref and
+    page tree, so it has to run sandboxed) and return the page ranges to
+    lay out in parallel, or, when splitting doesn't pay off, ([], text)
+    from parsing the document right here.
+    """
+    ranges = plan_page_ranges(data, mode, workers)
+    if ranges:
+        return ranges, None
+    return [], extract_cv_text(data, mode)
+
+
+def _parse_pdf_profile(data: bytes, taxonomy_version: Optional[str] = None) -> Optional[Dict]:
+    """
+    Worker entry point: text + full profile from an in-memory PDF, using
+    the same skill taxonomy version as the API process.
+    """
+    if taxonomy_version is not None:
+        from extractor import get_taxonomy_registry
+        get_taxonomy_registry().ensure_version(taxonomy_version)
+    return parse_cv_profile(data)
+
+
+class PdfParsingExecutor:
+    """Process pool dedicated to PDF text extraction."""
+
+    def __init__(
+        self,
+        workers: int = PDF_POOL_WORKERS,
+        timeout: float = PDF_TASK_TIMEOUT,
+        max_tasks_per_child: int = PDF_MAX_TASKS_PER_CHILD,
+    ):
+        self.workers = max(0, workers)
+        self.timeout = timeout
+        self.max_tasks_per_child = max_tasks_per_child
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # How often each limit (memory, cpu, wall_clock, worker_crash) was hit
+        self.limit_hits: Counter = Counter()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    # Worker recycling needs the spawn start method
+                    mp_context=multiprocessing.get_context("spawn"),
+                    max_tasks_per_child=self.max_tasks_per_child,
+                    initializer=init_worker,
+                )
+                logger.info(
+                    "PDF executor started (workers=%d, timeout=%.0fs, max_tasks_per_child=%d)",
+                    self.workers, self.timeout, self.max_tasks_per_child,
+                )
+            return self._pool
+
+    @property
+    def in_process(self) -> bool:
+        """True when parsing runs in a thread of this process (no pool)."""
+        return self.workers == 0
+
+    def start(self) -> None:
+        """Spawn the worker pool up front so the first upload doesn't pay for it."""
+        if not self.in_process:
+            self._get_pool()
+
+    def _reset_pool(self, pool: ProcessPoolExecutor) -> bool:
+        """
+        Kill every worker of `pool` (including a stuck one) and start fresh
+        next time. Only the current pool is reset: if another call already
+        replaced it, this is a no-op and returns False.
+        """
+        with self._lock:
+            if self._pool is not pool:
+                return False
+            self._pool = None
+        # ProcessPoolExecutor has no public API to stop a running task
+        for process in list(getattr(pool, "_processes", {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+        logger.warning("PDF executor: workers terminated; pool will restart on next use")
+        return True
+
+    @staticmethod
+    def _submit(loop: asyncio.AbstractEventLoop, pool: ProcessPoolExecutor, call: Tuple) -> asyncio.Future:
+        """
+        Submit one `(func, *args)` call to `pool` under the sandbox limits.
+
+        Unlike loop.run_in_executor, a task cancelled by another call's pool
+        reset fails with BrokenProcessPool instead of cancelling the awaiting
+        coroutine, so only a real cancellation raises CancelledError.
+        """
+        try:
+            submitted = pool.submit(run_limited, *call)
+        except RuntimeError as e:
+            # The pool was shut down between _get_pool and submit
+            raise BrokenProcessPool(str(e)) from e
+        future = loop.create_future()
+
+        def settle() -> None:
+            if future.done():
+                return
+            if submitted.cancelled():
+                future.set_exception(BrokenProcessPool("Task cancelled by a PDF pool reset"))
+            elif submitted.exception() is not None:
+                future.set_exception(submitted.exception())
+            else:
+                future.set_result(submitted.result())
+
+        def on_done(_) -> None:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(settle)
+
+        submitted.add_done_callback(on_done)
+        future.add_done_callback(lambda f: f.cancelled() and submitted.cancel())
+        return future
+
+    async def _run_in_pool(self, calls: List[Tuple], timeout: float) -> List[Any]:
+        """
+        Run each `(func, *args)` call in the pool; one timeout covers them all.
+
+        Only the call whose own failure (timeout, dead worker) resets the
+        pool counts a limit hit. Calls that merely shared the pool at that
+        moment are retried once on the new pool within what is left of
+        their timeout.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        for attempt in range(2):
+            pool = self._get_pool()
+            try:
+                futures = [self._submit(loop, pool, call) for call in calls]
+                return await asyncio.wait_for(asyncio.gather(*futures), timeout=deadline - loop.time())
+            except asyncio.TimeoutError:
+                self.limit_hits[LIMIT_WALL_CLOCK] += 1
+                self._reset_pool(pool)
+                raise PdfParseTimeout(f"PDF parsing exceeded {timeout:.0f}s")
+            except PdfResourceLimitExceeded as e:
+                self.limit_hits[e.limit] += 1
+                logger.warning(f"PDF worker hit its {e.limit} limit")
+                raise
+            except BrokenProcessPool:
+                if self._reset_pool(pool):
+                    # First to see the pool broken: a worker of this call died
+                    # (e.g. OOM-killed); replace the pool for later calls
+                    self.limit_hits[LIMIT_WORKER_CRASH] += 1
+                    logger.warning("PDF worker crashed")
+                    raise PdfResourceLimitExceeded(LIMIT_WORKER_CRASH)
+                # Collateral of another call's reset
+                if attempt or deadline - loop.time() <= 0:
+                    raise PdfResourceLimitExceeded(LIMIT_WORKER_CRASH)
+                logger.info("PDF executor: pool was reset by another task; retrying once")
+
+    async def _run(self, func: Callable, in_process_func: Callable, data: PdfSource, *args,
+                   timeout: Optional[float] = None, pool_args: Tuple = ()) -> Any:
+        """
+        Run `func(data, *args, *pool_args)` in the pool (or
+        `in_process_func(data, *args)` in a thread).
+        """
+        timeout = timeout or self.timeout
+        if self.in_process:
+            try:
+                return await asyncio.wait_for(asyncio.to_thread(in_process_func, data, *args), timeout=timeout)
+            except asyncio.TimeoutError:
+                self.limit_hits[LIMIT_WALL_CLOCK] += 1
+                raise PdfParseTimeout(f"PDF parsing exceeded {timeout:.0f}s")
+
+        results = await self._run_in_pool([(func, data, *args, *pool_args)], timeout)
+        return results[0]
+
+    async def _extract_text_parallel(
+        self, data: bytes, ranges: List[Tuple[int, int]], timeout: Optional[float]
+    ) -> Optional[str]:
+        """Lay out each page range in its own worker and join the texts in order."""
+        calls = [(extract_page_range_text, data, start, stop) for start, stop in ranges]
+        try:
+            parts = await self._run_in_pool(calls, timeout or self.timeout)
+        except (PdfParseTimeout, PdfResourceLimitExceeded):
+            raise
+        except Exception as e:
+            logger.error(f"Error extracting text from PDF: {str(e)}")
+            return None
+        return join_page_ranges(parts)
+
+    async def extract_text(
+        self,
+        data: PdfSource,
+        timeout: Optional[float] = None,
+        mode: str = MODE_FULL,
+    ) -> Optional[str]:
+        """
+        Extract text from a PDF in a worker process.
+
+        Args:
+            data: PDF bytes; in in-process mode also a binary stream
+            timeout: Per-task timeout in seconds (defaults to PDF_TASK_TIMEOUT)
+            mode: cv_pipeline mode deciding how many pages are parsed
+
+        Returns:
+            Extracted text, or None if the PDF has no extractable text
+
+        Raises:
+            PdfParseTimeout: If parsing exceeds the timeout
+            PdfResourceLimitExceeded: If a worker hits its memory / CPU limit or dies
+        """
+        if self.in_process or not isinstance(data, (bytes, bytearray, memoryview)):
+            return await self._run(_parse_pdf_bytes, extract_cv_text, data, mode, timeout=timeout)
+
+        results = await self._run_in_pool(
+            [(_plan_or_parse_pdf_bytes, data, mode, self.workers)], timeout or self.timeout
+        )
+        ranges, text = results[0]
+        if not ranges:
+            return text
+        logger.info(f"Parsing {ranges[-1][1]} PDF pages in {len(ranges)} parallel ranges")
+        return await self._extract_text_parallel(data, ranges, timeout)
+
+    async def parse_profile(self, data: PdfSource, timeout: Optional[float] = None) -> Optional[Dict]:
+        """
+        Extract text and the full CV profile in a worker process, so the
+        extractors scale across cores too (used by batch parsing).
+
+        Returns:
+            {"text": cleaned text, "profile": {...}}, or None if the PDF
+            has no extractable text
+
+        Raises:
+            PdfParseTimeout: If parsing exceeds the timeout
+            PdfResourceLimitExceeded: If a worker hits its memory / CPU limit or dies
+        """
+        # Imported lazily, like in the workers, which would otherwise load spaCy
+        from extractor import get_taxonomy_registry
+
+        taxonomy_version = get_taxonomy_registry().version
+        return await self._run(_parse_pdf_profile, parse_cv_profile, data, timeout=timeout,
+                               pool_args=(taxonomy_version,))
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "in_process": self.in_process,
+            "limits": {
+                "timeout_seconds": self.timeout,
+                "memory_mb": PDF_MEMORY_LIMIT_MB,
+                "cpu_seconds": PDF_CPU_LIMIT,
+            },
+            "limit_hits": dict(self.limit_hits),
+        }
+
+    def shutdown(self) -> None:
+        """Stop the pool, waiting for in-flight tasks."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+            logger.info("PDF executor shut down")
+
+
+_executor = PdfParsingExecutor()
+
+
+def get_pdf_executor() -> PdfParsingExecutor:
+    """Return the process-wide PDF executor."""
+    return _executor
@@ -0,0 +1,109 @@
+"""
+PDF Sandbox Module
+Hard resource limits for the PDF worker processes, so a malformed or
+adversarial PDF (huge object streams, deep nesting) fails fast with a
+clear error instead of eating the machine.
+
+  - RLIMIT_AS caps each worker's address space (PDF_MEMORY_LIMIT_MB);
+    allocations past it raise MemoryError inside the worker.
+  - RLIMIT_CPU is re-armed before every task to PDF_CPU_LIMIT seconds of
+    CPU on top of what the worker has already used; SIGXCPU interrupts
+    the parse.
+  - The wall-clock timeout and the kill of a stuck worker stay in
+    pdf_executor.
+
+Both limits surface as PdfResourceLimitExceeded(limit). They are only
+applied in pool workers (never to the API process itself) and only on
+platforms with the `resource` module; elsewhere they are no-ops.
+"""
+
+import logging
+import os
+import signal
+
+try:
+    import resource
+    RESOURCE_LIMITS_AVAILABLE = True
+except ImportError:
+    RESOURCE_LIMITS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Per-worker limits (override via environment; 0 disables)
+PDF_MEMORY_LIMIT_MB = int(os.environ.get("PDF_MEMORY_LIMIT_MB", 2048))
+PDF_CPU_LIMIT       = int(os.environ.get("PDF_CPU_LIMIT", 20))
+
+# Names used in errors and metrics
+LIMIT_MEMORY = "memory"
+LIMIT_CPU = "cpu"
+LIMIT_WALL_CLOCK = "wall_clock"
+LIMIT_WORKER_CRASH = "worker_crash"
+
+
+class PdfResourceLimitExceeded(Exception):
+    """A PDF worker hit one of its hard limits while parsing."""
+
+    def __init__(self, limit: str):
+        super().__init__(limit)
+        self.limit = limit
+
+    def __str__(self) -> str:
+        return f"PDF parsing exceeded the {self.limit} limit"
+
+
+class _CpuTimeExceeded(BaseException):
+    # BaseException so the broad `except Exception` blocks in the parsing
+    # code can't swallow it
+    pass
+
+
+def _on_cpu_limit(signum, frame):
+    # SIGXCPU repeats every second past the soft limit; lift it so only
+    # one exception is raised, run_limited re-arms it for the next task
+    _set_cpu_soft_limit(resource.RLIM_INFINITY)
+    raise _CpuTimeExceeded()
+
+
+def _set_cpu_soft_limit(soft: int) -> None:
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY and (soft == resource.RLIM_INFINITY or soft > hard):
+        soft = hard
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _cpu_seconds_used() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def init_worker() -> None:
+    """Pool initializer: apply the address-space cap and the SIGXCPU handler."""
+    if not RESOURCE_LIMITS_AVAILABLE:
+        return
+    if PDF_MEMORY_LIMIT_MB > 0:
+        limit = PDF_MEMORY_LIMIT_MB * 1024 * 1024
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    if PDF_CPU_LIMIT > 0:
+        signal.signal(signal.SIGXCPU, _on_cpu_limit)
+
+
+def run_limited(func, *args):
+    """
+    Worker-side wrapper: run `func(*args)` under a fresh CPU budget and
+    translate limit hits into PdfResourceLimitExceeded.
+    """
+    cpu_armed = RESOURCE_LIMITS_AVAILABLE and PDF_CPU_LIMIT > 0
+    if cpu_armed:
+        _set_cpu_soft_limit(int(_cpu_seconds_used()) + 1 + PDF_CPU_LIMIT)
+    try:
+        return func(*args)
+    except MemoryError:
+        raise PdfResourceLimitExceeded(LIMIT_MEMORY)
+    except _CpuTimeExceeded:
+        raise PdfResourceLimitExceeded(LIMIT_CPU)
+    finally:
+        if cpu_armed:
+            _set_cpu_soft_limit(resource.RLIM_INFINITY)
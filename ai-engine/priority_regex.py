@@ -0,0 +1,164 @@
+"""
+Priority Regex Module
+Compiles an ordered list of regex patterns into one scanner that returns
+exactly what this loop would, in a single pass over the text:
+
+    for pattern in patterns:
+        m = re.search(pattern, text, re.IGNORECASE)
+        if m:
+            return m
+
+How it works:
+  - The patterns become one alternation inside a zero-width lookahead, so
+    every start position is tested once and no text is consumed: a
+    high-priority match overlapping a lower-priority one ("backend
+    developer" inside "senior backend developer") is still seen. At each
+    position the alternation reports the highest-priority pattern that
+    matches there, so the leftmost hit of the best pattern overall is
+    always among the candidates. Scanning stops early on pattern 0.
+  - Each alternative ends with an empty named group marking its index,
+    and a shared leading \\b is factored out, so alternatives start with a
+    plain literal and the regex engine can reject most of them on their
+    first character.
+  - Case-insensitivity is done by folding the text (ASCII lowercase plus
+    the few non-ASCII characters IGNORECASE treats as ASCII letters)
+    instead of the IGNORECASE flag, which would defeat that first-character
+    check. Folding is length preserving, so spans map back onto the
+    original text.
+
+Capture groups inside the patterns are renamed so each pattern's own
+groups can still be read back in their original order.
+
+Merging pays off for long lists whose patterns start with distinct
+literals (the ~45 job-title patterns). For a handful of patterns that the
+engine can already locate with a fast prefix scan, `merged=False` keeps
+one precompiled search per pattern on the folded text instead - same
+results, and faster there. bench_patterns.py times both against the
+original re.search loop.
+"""
+
+import re
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+_ESCAPE_RE = re.compile(r"\\(?:u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|.)")
+
+
+def fold_case(text: str) -> str:
+    """
+    Length-preserving fold under which lowercase ASCII patterns match like
+    re.IGNORECASE. Besides A-Z, IGNORECASE treats U+0130 / U+0131 (dotted /
+    dotless I), U+017F (long s) and U+212A (Kelvin, already lowered to "k")
+    as ASCII letters; U+0130 is the one character lower() would expand.
+    """
+    if text.isascii():
+        return text.lower()
+    return text.replace("\u0130", "i").lower().replace("\u0131", "i").replace("\u017f", "s")
+
+
+class PriorityMatch(NamedTuple):
+    """Equivalent of the first-matching pattern's re.Match."""
+    index: int                          # position of the pattern in the list
+    start: int
+    end: int
+    text: str                           # match.group(0)
+    groups: Tuple[Optional[str], ...]   # match.groups()
+
+
+def _name_capture_groups(pattern: str, prefix: str) -> Tuple[str, List[str]]:
+    """
+    Rewrite every plain capturing group "(" of `pattern` to "(?P<prefix_N>".
+    Escapes and character classes are skipped; non-capturing / named /
+    lookaround groups ("(?...") are left alone.
+    """
+    out: List[str] = []
+    names: List[str] = []
+    i, in_class = 0, False
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            out.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(" and not pattern.startswith("(?", i):
+            name = f"{prefix}{len(names)}"
+            names.append(name)
+            out.append(f"(?P<{name}>")
+            i += 1
+            continue
+        out.append(char)
+        i += 1
+    return "".join(out), names
+
+
+class PriorityRegex:
+    """Ordered, case-insensitive regex patterns compiled into one overlapping scan."""
+
+    def __init__(self, patterns: Sequence[str], merged: bool = True):
+        self.patterns = list(patterns)
+        self.merged = merged
+        self._group_names: List[List[str]] = []
+        self._compiled: List[re.Pattern] = []
+        self._scanner: Optional[re.Pattern] = None
+
+        for pattern in self.patterns:
+            literal_chars = _ESCAPE_RE.sub("", pattern)
+            if literal_chars != literal_chars.lower() or not literal_chars.isascii():
+                raise ValueError(f"Pattern must be lowercase ASCII to be case-folded: {pattern!r}")
+
+        if not merged:
+            self._compiled = [re.compile(pattern) for pattern in self.patterns]
+            return
+
+        # Factor out a \b every pattern starts with
+        shared_boundary = all(p.startswith(r"\b") for p in self.patterns)
+        alternatives = []
+        for index, pattern in enumerate(self.patterns):
+            if shared_boundary:
+                pattern = pattern[2:]
+            inner, names = _name_capture_groups(pattern, f"g{index}_")
+            alternatives.append(f"(?:{inner})(?P<p{index}>)")
+            self._group_names.append(names)
+
+        lead = r"\b" if shared_boundary else ""
+        self._scanner = re.compile(lead + "(?=" + "|".join(alternatives) + ")")
+
+    def search(self, text: str) -> Optional[PriorityMatch]:
+        """Return the match of the first pattern (in list order) that matches, or None."""
+        if not self.merged:
+            return self._search_each(text)
+
+        best: Optional[re.Match] = None
+        best_index = len(self.patterns)
+        for m in self._scanner.finditer(fold_case(text)):
+            # The index marker closes last, so lastgroup names the pattern
+            index = int(m.lastgroup[1:])
+            if index < best_index:
+                best, best_index = m, index
+                if index == 0:
+                    break
+        if best is None:
+            return None
+
+        start, end = best.start(), best.end(f"p{best_index}")
+        spans = [best.span(name) for name in self._group_names[best_index]]
+        return self._to_match(text, best_index, start, end, spans)
+
+    def _search_each(self, text: str) -> Optional[PriorityMatch]:
+        folded = fold_case(text)
+        for index, compiled in enumerate(self._compiled):
+            m = compiled.search(folded)
+            if m:
+                spans = [m.span(group) for group in range(1, compiled.groups + 1)]
+                return self._to_match(text, index, m.start(), m.end(), spans)
+        return None
+
+    @staticmethod
+    def _to_match(text: str, index: int, start: int, end: int,
+                  group_spans: List[Tuple[int, int]]) -> PriorityMatch:
+        # Folding preserves length, so spans index the original text
+        groups = tuple(None if s < 0 else text[s:e] for s, e in group_spans)
+        return PriorityMatch(index=index, start=start, end=end, text=text[start:end], groups=groups)
@@ -0,0 +1,128 @@
+"""
+Rate Limiter Module
+Central per-host politeness scheduler shared by every fetcher.
+
+Each host gets a token bucket (rate = sustained requests per second,
+burst = requests allowed back-to-back). A caller reserves a token right
+before it sends a network request and waits only as long as that host's
+bucket requires, plus a little random jitter so request timing doesn't
+form a pattern. Different hosts never wait on each other, and nothing
+waits while parsing data that has already been downloaded.
+
+Works from worker threads (acquire) and from the event loop
+(acquire_async); both share the same buckets.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Default bucket for hosts without an override: (requests/second, burst)
+DEFAULT_RATE  = float(os.environ.get("RATE_LIMIT_RPS", 0.5))
+DEFAULT_BURST = int(os.environ.get("RATE_LIMIT_BURST", 2))
+
+# Max random jitter (seconds) added to every throttled wait
+RATE_LIMIT_JITTER = float(os.environ.get("RATE_LIMIT_JITTER", 1.0))
+
+# Per-host overrides: HTML boards get a gentler pace than JSON APIs
+HOST_RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    "wuzzuf.net":         (0.2, 1),
+    "remotive.com":       (1.0, 3),
+    "api.adzuna.com":     (1.0, 3),
+}
+
+
+class _Bucket:
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+
+class HostRateLimiter:
+    """Token bucket per host with jittered waits."""
+
+    def __init__(self, jitter: float = RATE_LIMIT_JITTER):
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, _Bucket] = {}
+
+    def _bucket_for(self, host: str) -> _Bucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            # "www.wuzzuf.net" shares the "wuzzuf.net" limit
+            rate, burst = next(
+                (limits for domain, limits in HOST_RATE_LIMITS.items()
+                 if host == domain or host.endswith("." + domain)),
+                (DEFAULT_RATE, DEFAULT_BURST),
+            )
+            bucket = self._buckets[host] = _Bucket(rate, burst)
+        return bucket
+
+    def reserve(self, url: str) -> float:
+        """
+        Take one token for the URL's host and return how long the caller must
+        wait before sending the request (0 when a token was available).
+        """
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            bucket = self._bucket_for(host)
+            now = time.monotonic()
+            bucket.tokens = min(bucket.burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+            bucket.updated = now
+            # Going negative reserves a future slot for this caller
+            bucket.tokens -= 1
+            if bucket.tokens >= 0:
+                return 0.0
+            wait = -bucket.tokens / bucket.rate
+
+        wait += random.uniform(0, self.jitter)
+        logger.debug("Rate limiter: waiting %.2fs for %s", wait, host)
+        return wait
+
+    def refund(self, url: str) -> None:
+        """Give back a token reserved for a request that was never sent."""
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            bucket = self._bucket_for(host)
+            bucket.tokens = min(bucket.burst, bucket.tokens + 1)
+
+    def acquire(self, url: str, cancel: Optional[threading.Event] = None) -> bool:
+        """
+        Block the current thread until a request to `url` is allowed.
+        Returns False (and reserves nothing) if `cancel` is set before then.
+        """
+        if cancel is not None and cancel.is_set():
+            return False
+        wait = self.reserve(url)
+        if wait > 0:
+            if cancel is None:
+                time.sleep(wait)
+            elif cancel.wait(wait):
+                self.refund(url)
+                return False
+        return True
+
+    async def acquire_async(self, url: str) -> None:
+        """Suspend the current task until a request to `url` is allowed."""
+        wait = self.reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+_limiter = HostRateLimiter()
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Return the process-wide rate limiter."""
+    return _limiter
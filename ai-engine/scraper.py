@@ -7,17 +7,22 @@ Entrypoint for all job-fetching strategies:
 
 All strategies return the same normalised job dict:
   {title, company, description, url, source, skills}
+
+dispatch_sources returns raw postings (skills=None unless the board lists
+them itself); enrich_jobs extracts skills afterwards, so only jobs that
+survive de-duplication and the global max_results cut pay for NLP.
 """
 
-import gc
+import asyncio
+import threading
 import requests
 from bs4 import BeautifulSoup
-import time
-import random
 import logging
 from typing import List, Dict, Optional
 from fastapi import HTTPException
-from extractor import extract_skills_from_text
+from extractor import extract_skills_batch, extract_skills_from_text
+from rate_limiter import get_rate_limiter
+from skill_stats import ESSENTIAL_THRESHOLD, IMPORTANT_THRESHOLD, encode_jobs, skill_statistics
 
 # Lazy imports so the server keeps running even if these are absent
 try:
@@ -37,11 +42,13 @@ logger = logging.getLogger(__name__)
 
 # Configuration
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-REQUEST_DELAY = 2  # seconds between requests (pages)
-CARD_DELAY_MIN = 0.5  # minimum delay between processing cards
-CARD_DELAY_MAX = 2.0  # maximum delay between processing cards
 TIMEOUT = 10  # request timeout in seconds
 
+# Source fan-out (dispatch_sources)
+MAX_CONCURRENT_SOURCES = 8  # sources fetched in parallel
+SOURCE_TIMEOUT = 90         # default per-source deadline in seconds
+DISPATCH_TIMEOUT = 110      # global deadline; stays under Laravel's 120s HTTP timeout
+
 
 def scrape_wuzzuf(query: str, max_pages: int = 3) -> List[Dict]:
     """
@@ -75,6 +82,8 @@ def scrape_wuzzuf(query: str, max_pages: int = 3) -> List[Dict]:
             
             logger.info(f"Fetching page {page + 1}/{max_pages}...")
             
+            # Respectful scraping: per-host token bucket instead of fixed sleeps
+            get_rate_limiter().acquire(base_url)
             response = requests.get(base_url, params=params, headers=headers, timeout=TIMEOUT)
             response.raise_for_status()
             
@@ -94,24 +103,22 @@ def scrape_wuzzuf(query: str, max_pages: int = 3) -> List[Dict]:
             
             logger.info(f"Found {len(job_cards)} job listings on page {page + 1}")
             
-            for idx, card in enumerate(job_cards):
+            page_jobs = []
+            for card in job_cards:
                 try:
-                    job_data = parse_job_card(card)
+                    job_data = parse_job_card(card, extract_skills=False)
                     if job_data:
-                        jobs.append(job_data)
-                    
-                    # Random delay between processing each card (except the last one)
-                    if idx < len(job_cards) - 1:
-                        delay = random.uniform(CARD_DELAY_MIN, CARD_DELAY_MAX)
-                        time.sleep(delay)
+                        page_jobs.append(job_data)
                         
                 except Exception as e:
                     logger.error(f"Error parsing job card: {str(e)}")
                     continue
             
-            # Respectful scraping: delay between pages
-            if page < max_pages - 1:
-                time.sleep(REQUEST_DELAY)
+            # One NLP batch for the whole page instead of one pipeline call per card
+            texts = [f"{job['title']} {job['description']}" for job in page_jobs]
+            for job, skills in zip(page_jobs, extract_skills_batch(texts)):
+                job['skills'] = skills
+            jobs.extend(page_jobs)
                 
         except requests.HTTPError as e:
             if e.response.status_code == 403:
@@ -133,12 +140,14 @@ def scrape_wuzzuf(query: str, max_pages: int = 3) -> List[Dict]:
     return jobs
 
 
-def parse_job_card(card) -> Optional[Dict]:
+def parse_job_card(card, extract_skills: bool = True) -> Optional[Dict]:
     """
     Parse a single job card element.
     
     Args:
         card: BeautifulSoup element representing a job card
+        extract_skills: Run skill extraction for this card (callers parsing a
+            whole page pass False and extract the page in one batch)
         
     Returns:
         Dictionary with job data or None if parsing fails
@@ -173,13 +182,9 @@ def parse_job_card(card) -> Optional[Dict]:
                 url = href
         
         # Combine title and description for skill extraction
-        full_text = f"{title} {description}"
-        try:
-            from extractor import extract_skills_with_nlp
-            skills = extract_skills_with_nlp(full_text)
-        except Exception as e:
-            logger.warning(f"NLP extraction failed, using fallback: {e}")
-            skills = extract_skills_from_text(full_text, threshold=70)
+        skills = []
+        if extract_skills:
+            skills = extract_skills_batch([f"{title} {description}"])[0]
         
         job_data = {
             'title': title,
@@ -259,151 +264,229 @@ def scrape_sample_jobs(count: int = 10) -> List[Dict]:
     return sample_jobs[:count]
 
 
-def dispatch_sources(sources: List[Dict], query: str, max_results: int = 30) -> List[Dict]:
+async def _fetch_source(source: Dict, query: str, max_results: int) -> List[Dict]:
+    """
+    Route one source to the matching fetcher.
+
+    Sources with type='api' are dispatched to the appropriate API fetcher.
+    Sources with type='html' are dispatched to the HTML scraper, which is
+    blocking and therefore runs in a worker thread. When the source's
+    deadline cancels this coroutine, the thread is told to stop paginating
+    too (no further page loads, browser leases or rate-limiter tokens).
+    """
+    source_name = source.get("name", "unknown")
+    source_type = source.get("type", "api").lower()
+    endpoint    = source.get("endpoint", "")
+    params      = source.get("params") or {}
+
+    if source_type == "api":
+        if not _API_FETCHER_AVAILABLE:
+            logger.error("api_fetcher module not available; skipping API source '%s'", source_name)
+            return []
+
+        # Route to the right API handler based on endpoint URL / name
+        endpoint_lower = endpoint.lower()
+        name_lower     = source_name.lower()
+
+        if "remotive" in endpoint_lower or "remotive" in name_lower:
+            return await fetch_remotive(query, params=params, max_results=max_results)
+        elif "adzuna" in endpoint_lower or "adzuna" in name_lower:
+            return await fetch_adzuna(query, params=params, max_results=max_results)
+        else:
+            return await fetch_generic_api(source, query, max_results=max_results)
+
+    elif source_type == "html":
+        if not _HTML_SCRAPER_AVAILABLE:
+            logger.error("html_scraper module not available; skipping HTML source '%s'", source_name)
+            return []
+
+        # The thread can't be cancelled; the event tells it to stop at its
+        # next checkpoint once this coroutine is (deadline hit)
+        cancel = threading.Event()
+        try:
+            return await asyncio.to_thread(
+                scrape_html_source, source, query, max_results=max_results, cancel=cancel,
+            )
+        finally:
+            cancel.set()
+
+    logger.warning("Unknown source type '%s' for source '%s'; skipping.", source_type, source_name)
+    return []
+
+
+async def _run_source(
+    source: Dict,
+    query: str,
+    max_results: int,
+    timeout: float,
+    semaphore: asyncio.Semaphore,
+) -> List[Dict]:
+    """
+    Fetch one source under its own deadline.
+    Never raises: a failing or slow source yields [] (error isolation).
+    """
+    source_name = source.get("name", "unknown")
+    timeout     = source.get("timeout") or timeout
+
+    async with semaphore:
+        logger.info("Processing source '%s' (type=%s)", source_name, source.get("type", "api"))
+        try:
+            return await asyncio.wait_for(
+                _fetch_source(source, query, max_results),
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.error("Source '%s' exceeded its %.0fs deadline; skipping.", source_name, timeout)
+        except Exception as source_err:
+            # ONE source failing must NEVER halt the remaining sources
+            logger.error(
+                "Source '%s' failed unexpectedly: %s. Continuing with other sources.",
+                source_name,
+                source_err,
+                exc_info=True,
+            )
+    return []
+
+
+async def dispatch_sources(
+    sources: List[Dict],
+    query: str,
+    max_results: int = 30,
+    source_timeout: float = SOURCE_TIMEOUT,
+    total_timeout: float = DISPATCH_TIMEOUT,
+) -> List[Dict]:
     """
     Dispatch the scraping work across a dynamic list of sources.
 
     Each source dict must have at least: {name, endpoint, type}.
-    Optional keys: headers, params.
-
-    Sources with type='api' are dispatched to the appropriate API fetcher.
-    Sources with type='html' are dispatched to the HTML scraper.
+    Optional keys: headers, params, timeout (per-source deadline override).
 
+    Sources run concurrently (at most MAX_CONCURRENT_SOURCES at a time).
+    Each one has its own deadline, and the whole fan-out has a global
+    deadline; sources still running when it expires are dropped.
     If a source fails the remaining sources are still processed (error isolation).
 
     Args:
-        sources:     List of source config dicts from the Laravel backend.
-        query:       Search term / job title.
-        max_results: Max jobs per source.
+        sources:        List of source config dicts from the Laravel backend.
+        query:          Search term / job title.
+        max_results:    Max jobs per source.
+        source_timeout: Default per-source deadline in seconds.
+        total_timeout:  Deadline for the whole dispatch in seconds.
 
     Returns:
-        De-duplicated combined job list.
+        De-duplicated combined job list of raw postings (see enrich_jobs),
+        in source order regardless of which source finished first.
     """
     if not sources:
         logger.warning("dispatch_sources called with empty sources list.")
         return []
 
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SOURCES)
+    tasks = [
+        asyncio.create_task(_run_source(source, query, max_results, source_timeout, semaphore))
+        for source in sources
+    ]
+
+    done, pending = await asyncio.wait(tasks, timeout=total_timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        logger.error(
+            "dispatch_sources global deadline (%.0fs) hit: %d source(s) dropped.",
+            total_timeout, len(pending),
+        )
+
     all_jobs: List[Dict] = []
     seen_urls: set = set()
 
-    for source in sources:
-        source_name = source.get("name", "unknown")
-        source_type = source.get("type", "api").lower()
-        endpoint    = source.get("endpoint", "")
-        params      = source.get("params") or {}
+    # Merge in source order so dedup keeps the same "first occurrence" as before
+    for source, task in zip(sources, tasks):
+        if task not in done:
+            continue
 
-        logger.info("Processing source '%s' (type=%s)", source_name, source_type)
+        fetched = task.result()
 
-        try:
-            fetched: List[Dict] = []
+        # De-duplicate by URL (keep first occurrence)
+        unique_count = 0
+        for job in fetched:
+            url = job.get("url")
+            key = url if url else f"{job.get('title','')}|{job.get('company','')}"
+            if key not in seen_urls:
+                seen_urls.add(key)
+                all_jobs.append(job)
+                unique_count += 1
 
-            if source_type == "api":
-                if not _API_FETCHER_AVAILABLE:
-                    logger.error("api_fetcher module not available; skipping API source '%s'", source_name)
-                    continue
+        logger.info(
+            "Source '%s': %d fetched, %d unique after dedup. Running total: %d",
+            source.get("name", "unknown"), len(fetched), unique_count, len(all_jobs),
+        )
 
-                # Route to the right API handler based on endpoint URL / name
-                endpoint_lower = endpoint.lower()
-                name_lower     = source_name.lower()
+    logger.info("dispatch_sources done: %d total unique jobs from %d sources.", len(all_jobs), len(sources))
+    return all_jobs
 
-                if "remotive" in endpoint_lower or "remotive" in name_lower:
-                    fetched = fetch_remotive(query, params=params, max_results=max_results)
-                elif "adzuna" in endpoint_lower or "adzuna" in name_lower:
-                    fetched = fetch_adzuna(query, params=params, max_results=max_results)
-                else:
-                    fetched = fetch_generic_api(source, query, max_results=max_results)
 
-            elif source_type == "html":
-                if not _HTML_SCRAPER_AVAILABLE:
-                    logger.error("html_scraper module not available; skipping HTML source '%s'", source_name)
-                    continue
+def _job_text(job: Dict) -> str:
+    return f"{job.get('title', '')} {job.get('description', '')}"
 
-                fetched = scrape_html_source(source, query, max_results=max_results)
-
-            else:
-                logger.warning("Unknown source type '%s' for source '%s'; skipping.", source_type, source_name)
-                continue
-
-            # De-duplicate by URL (keep first occurrence)
-            unique_count = 0
-            for job in fetched:
-                url = job.get("url")
-                key = url if url else f"{job.get('title','')}|{job.get('company','')}"
-                if key not in seen_urls:
-                    seen_urls.add(key)
-                    all_jobs.append(job)
-                    unique_count += 1
-
-            logger.info(
-                "Source '%s': %d fetched, %d unique after dedup. Running total: %d",
-                source_name, len(fetched), unique_count, len(all_jobs),
-            )
 
-        except Exception as source_err:
-            # ONE source failing must NEVER halt the remaining sources
-            logger.error(
-                "Source '%s' failed unexpectedly: %s. Continuing to next source.",
-                source_name,
-                source_err,
-                exc_info=True,
-            )
-            continue  # explicit continue for clarity
-        finally:
-            # Trigger GC after each source to free session memory promptly
-            gc.collect()
+def enrich_jobs(jobs: List[Dict]) -> List[Dict]:
+    """
+    Extract skills for raw postings (those whose 'skills' is still None).
 
-    logger.info("dispatch_sources done: %d total unique jobs from %d sources.", len(all_jobs), len(sources))
-    return all_jobs
+    Pending jobs go through extraction in a single NLP batch, except
+    postings carrying a "_skill_threshold" (generic HTML cards), which keep
+    their fuzzy-only matching at that threshold. Call this only on the
+    final job list – after de-duplication and the max_results cut.
+
+    Args:
+        jobs: Job dicts as returned by dispatch_sources / the fetchers
+
+    Returns:
+        The same list, with every job's 'skills' populated
+    """
+    pending = [job for job in jobs if job.get("skills") is None]
+    if not pending:
+        return jobs
+
+    # Postings that ask for fuzzy-only matching (generic HTML cards) keep it;
+    # the rest go through one NLP batch
+    batched = []
+    for job in pending:
+        threshold = job.pop("_skill_threshold", None)
+        if threshold is None:
+            batched.append(job)
+        else:
+            job["skills"] = extract_skills_from_text(_job_text(job), threshold=threshold)
+
+    texts = [_job_text(job) for job in batched]
+    for job, skills in zip(batched, extract_skills_batch(texts)):
+        job["skills"] = skills
+
+    logger.info("Enriched %d of %d jobs with extracted skills", len(pending), len(jobs))
+    return jobs
 
 
 def calculate_skill_frequencies(jobs: List[Dict]) -> Dict:
     """
     Calculate skill frequency analysis from a list of jobs.
     
+    Jobs are encoded once into a sparse job x skill matrix and the counts,
+    percentages and importance levels are computed over it with NumPy
+    (see skill_stats). A skill listed twice in one job counts once.
+    
     Args:
         jobs: List of job dictionaries with 'skills' key
         
     Returns:
-        Dictionary with skill statistics including frequency and importance
+        Dictionary with skill statistics including frequency and importance,
+        sorted by percentage descending
     """
     if not jobs:
         return {}
     
-    total_jobs = len(jobs)
-    skill_counts = {}
-    
-    # Count occurrences of each skill
-    for job in jobs:
-        if 'skills' in job and isinstance(job['skills'], list):
-            for skill in job['skills']:
-                skill_name = skill['name'] if isinstance(skill, dict) else skill
-                skill_type = skill['type'] if isinstance(skill, dict) and 'type' in skill else 'technical'
-                
-                if skill_name not in skill_counts:
-                    skill_counts[skill_name] = {
-                        'count': 0,
-                        'type': skill_type
-                    }
-                skill_counts[skill_name]['count'] += 1
-    
-    # Calculate percentages and importance
-    skill_stats = {}
-    for skill_name, data in skill_counts.items():
-        count = data['count']
-        percentage = (count / total_jobs) * 100
-        importance = categorize_skill_by_demand(percentage)
-        
-        skill_stats[skill_name] = {
-            'count': count,
-            'percentage': round(percentage, 2),
-            'importance': importance,
-            'type': data['type']
-        }
-    
-    # Sort by percentage descending
-    sorted_stats = dict(sorted(skill_stats.items(), key=lambda x: x[1]['percentage'], reverse=True))
+    sorted_stats = skill_statistics(encode_jobs(jobs)).to_dict()
     
-    logger.info(f"Calculated skill frequencies for {total_jobs} jobs, found {len(sorted_stats)} unique skills")
+    logger.info(f"Calculated skill frequencies for {len(jobs)} jobs, found {len(sorted_stats)} unique skills")
     
     return sorted_stats
 
@@ -418,9 +501,9 @@ def categorize_skill_by_demand(percentage: float) -> str:
     Returns:
         Category: 'essential', 'important', or 'nice_to_have'
     """
-    if percentage > 70:
+    if percentage > ESSENTIAL_THRESHOLD:
         return 'essential'
-    elif percentage >= 40:
+    elif percentage >= IMPORTANT_THRESHOLD:
         return 'important'
     else:
         return 'nice_to_have'
@@ -0,0 +1,226 @@
+"""
+Skill Co-occurrence Module
+"Skills usually required alongside X", per role, from the skill pairs
+folded into skill_demand with every scrape.
+
+For each role the index merges the stored counts - N jobs, n_a jobs per
+skill, n_ab jobs listing both skills - and scores every co-occurring pair
+at once with NumPy:
+
+  - confidence(a -> b) = n_ab / n_a           share of X's jobs that also list b
+  - lift(a, b)         = n_ab * N / (n_a n_b) > 1 means more often together than chance
+  - pmi(a, b)          = log2(lift)
+
+Pairs seen in fewer than COOCCURRENCE_MIN_JOBS jobs are dropped (lift is
+noise at tiny counts). The top COOCCURRENCE_TOP_K partners of every
+skill, ranked by lift, are kept in plain dicts, so a lookup is one dict
+access.
+
+A background thread rebuilds a role's table whenever new jobs were
+folded into it (SkillDemandStore.revisions) and swaps it in whole;
+lookups never wait for a rebuild.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from skill_demand import SkillDemandStore, get_demand_store, normalize_role
+
+logger = logging.getLogger(__name__)
+
+# Index configuration (override via environment)
+COOCCURRENCE_TOP_K            = int(os.environ.get("COOCCURRENCE_TOP_K", 20))
+COOCCURRENCE_MIN_JOBS         = int(os.environ.get("COOCCURRENCE_MIN_JOBS", 3))
+COOCCURRENCE_REFRESH_INTERVAL = float(os.environ.get("COOCCURRENCE_REFRESH_INTERVAL", 30))
+
+
+class RelatedSkill(NamedTuple):
+    name: str
+    jobs: int            # jobs listing both skills
+    confidence: float
+    lift: float
+    pmi: float
+
+
+class RoleCooccurrence(NamedTuple):
+    """Precomputed related skills of one role (immutable once built)."""
+    role: str
+    total_jobs: int
+    related: Dict[str, List[RelatedSkill]]   # skill -> partners, best first
+    names: Dict[str, str]                    # lowercase -> skill name
+    built_at: float
+
+
+def build_role_cooccurrence(
+    store: SkillDemandStore,
+    role: str,
+    top_k: int = COOCCURRENCE_TOP_K,
+    min_jobs: int = COOCCURRENCE_MIN_JOBS,
+) -> RoleCooccurrence:
+    """Score every stored skill pair of a role and keep each skill's top-k partners."""
+    role = normalize_role(role)
+    demand = store.demand(role)
+    pairs = store.pair_counts(role)
+
+    names = list(demand.counts)
+    column = {name: index for index, name in enumerate(names)}
+    marginals = np.array([demand.counts[name] for name in names], dtype=np.float64)
+
+    # Pairs are stored once; score both directions
+    kept = [(column[a], column[b], jobs) for a, b, jobs in pairs
+            if jobs >= min_jobs and a in column and b in column]
+    if kept:
+        half = np.array(kept, dtype=np.int64)
+        source = np.concatenate((half[:, 0], half[:, 1]))
+        target = np.concatenate((half[:, 1], half[:, 0]))
+        both = np.concatenate((half[:, 2], half[:, 2])).astype(np.float64)
+    else:
+        source = target = np.empty(0, dtype=np.int64)
+        both = np.empty(0, dtype=np.float64)
+
+    total = float(demand.total_jobs)
+    confidence = both / marginals[source]
+    lift = both * total / (marginals[source] * marginals[target])
+    pmi = np.log2(lift)
+
+    # Group by source skill, best lift first (ties: more shared jobs, then name order)
+    order = np.lexsort((target, -both, -lift, source))
+    source, target = source[order], target[order]
+    both, confidence, lift, pmi = both[order], confidence[order], lift[order], pmi[order]
+    starts = np.flatnonzero(np.r_[True, source[1:] != source[:-1]]) if len(source) else np.empty(0, dtype=np.int64)
+    ends = np.r_[starts[1:], len(source)]
+
+    related: Dict[str, List[RelatedSkill]] = {}
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        stop = min(end, start + top_k)
+        related[names[source[start]]] = [
+            RelatedSkill(names[other], int(jobs), round(conf, 4), round(lft, 4), round(info, 4))
+            for other, jobs, conf, lft, info in zip(
+                target[start:stop].tolist(), both[start:stop].tolist(),
+                confidence[start:stop].tolist(), lift[start:stop].tolist(), pmi[start:stop].tolist(),
+            )
+        ]
+
+    return RoleCooccurrence(
+        role=role,
+        total_jobs=demand.total_jobs,
+        related=related,
+        names={name.lower(): name for name in names},
+        built_at=time.time(),
+    )
+
+
+class RelatedSkillsIndex:
+    """In-memory related-skills tables for every role, refreshed in the background."""
+
+    def __init__(
+        self,
+        store: Optional[SkillDemandStore] = None,
+        top_k: int = COOCCURRENCE_TOP_K,
+        min_jobs: int = COOCCURRENCE_MIN_JOBS,
+        refresh_interval: float = COOCCURRENCE_REFRESH_INTERVAL,
+    ):
+        self._store = store
+        self.top_k = top_k
+        self.min_jobs = min_jobs
+        self.refresh_interval = refresh_interval
+        self._roles: Dict[str, RoleCooccurrence] = {}
+        self._built_revisions: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def store(self) -> SkillDemandStore:
+        return self._store or get_demand_store()
+
+    def related(self, role: str, skill: str, k: Optional[int] = None) -> Optional[List[RelatedSkill]]:
+        """
+        Skills most often required alongside `skill` for `role`, best first.
+        Returns None if the role has no table yet; [] if the skill has no
+        partner above the support threshold.
+        """
+        table = self._roles.get(normalize_role(role))
+        if table is None:
+            return None
+        name = table.names.get(skill.lower())
+        partners = table.related.get(name, []) if name else []
+        return partners if k is None else partners[:k]
+
+    def table(self, role: str) -> Optional[RoleCooccurrence]:
+        return self._roles.get(normalize_role(role))
+
+    def refresh(self, role: str) -> RoleCooccurrence:
+        """Rebuild one role's table now and swap it in."""
+        role = normalize_role(role)
+        revision = self.store.revisions().get(role, 0)
+        start = time.perf_counter()
+        table = build_role_cooccurrence(self.store, role, self.top_k, self.min_jobs)
+        self._roles = {**self._roles, role: table}
+        self._built_revisions[role] = revision
+        logger.info(
+            "Related skills for '%s': %d skills from %d jobs in %.3fs",
+            role, len(table.related), table.total_jobs, time.perf_counter() - start,
+        )
+        return table
+
+    def refresh_stale(self) -> int:
+        """Rebuild every role folded into since its last build; returns how many were rebuilt."""
+        stale = [
+            role for role, revision in self.store.revisions().items()
+            if self._built_revisions.get(role) != revision
+        ]
+        for role in stale:
+            self.refresh(role)
+        return len(stale)
+
+    def _run(self) -> None:
+        # Roles already in the store from earlier runs
+        try:
+            for entry in self.store.roles():
+                self.refresh(entry["role"])
+        except Exception as exc:
+            logger.error("Related skills: initial build failed: %s", exc)
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh_stale()
+            except Exception as exc:
+                logger.error("Related skills: refresh failed: %s", exc)
+
+    def start(self) -> None:
+        """Build tables for every stored role and keep them fresh in a background thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="related-skills", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "roles": {
+                role: {"skills": len(table.related), "total_jobs": table.total_jobs, "built_at": table.built_at}
+                for role, table in self._roles.items()
+            },
+            "top_k": self.top_k,
+            "min_jobs": self.min_jobs,
+            "refresh_interval": self.refresh_interval,
+        }
+
+
+_index = RelatedSkillsIndex()
+
+
+def get_related_skills_index() -> RelatedSkillsIndex:
+    """Return the process-wide related-skills index."""
+    return _index
@@ -0,0 +1,383 @@
+"""
+Skill Demand Module
+Mergeable skill-demand aggregates, so market statistics update
+incrementally as scrape results arrive instead of being recomputed from
+every historical posting after each run.
+
+A SkillDemand is (total jobs, jobs per skill, skill types). Merging adds
+the counts, so it is exact, associative and commutative: the aggregate
+of two job sets is the merge of their aggregates, and percentages /
+importance levels are always derived from merged counts, never averaged.
+
+SkillDemandStore keeps one aggregate per (role, source, time bucket) in
+SQLite (cache/skill_demand.sqlite3):
+
+  - record_jobs() folds a scrape result in. Postings already recorded for
+    the role (same URL, or same title / company / source) are skipped, so
+    the cost is proportional to the new jobs and re-scraping the same
+    board doesn't inflate counts.
+  - demand() merges any slice of cells - a role across all sources, one
+    source, a bucket range - with one GROUP BY.
+  - Each cell also keeps how many jobs listed each pair of skills
+    together (the sparse upper triangle of X^T X), folded from the same
+    new jobs; pair_counts() merges them for skill_cooccurrence.
+
+Buckets are calendar days, ISO weeks or months (SKILL_DEMAND_BUCKET) of
+the time a posting was recorded; bucket keys sort chronologically.
+"""
+
+import datetime
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from skill_stats import (
+    DEFAULT_SKILL_TYPE, SCIPY_AVAILABLE, SkillIncidence, SkillStatistics,
+    cooccurrence_counts, encode_jobs, statistics_from_counts,
+)
+
+logger = logging.getLogger(__name__)
+
+# Store configuration (override via environment)
+SKILL_DEMAND_PATH = os.environ.get(
+    "SKILL_DEMAND_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "skill_demand.sqlite3"),
+)
+SKILL_DEMAND_BUCKET   = os.environ.get("SKILL_DEMAND_BUCKET", "week")   # day | week | month
+SKILL_DEMAND_SEEN_TTL = float(os.environ.get("SKILL_DEMAND_SEEN_TTL", 90 * 24 * 3600))
+
+UNKNOWN_SOURCE = "unknown"
+
+_BUCKET_FORMATS = {
+    "day": lambda d: d.strftime("%Y-%m-%d"),
+    "week": lambda d: "%04d-W%02d" % d.isocalendar()[:2],
+    "month": lambda d: d.strftime("%Y-%m"),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS demand_jobs (
+    role        TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    bucket      TEXT NOT NULL,
+    total_jobs  INTEGER NOT NULL,
+    PRIMARY KEY (role, source, bucket)
+);
+CREATE TABLE IF NOT EXISTS demand_skills (
+    role        TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    bucket      TEXT NOT NULL,
+    skill       TEXT NOT NULL,
+    type        TEXT NOT NULL,
+    jobs        INTEGER NOT NULL,
+    PRIMARY KEY (role, source, bucket, skill)
+);
+CREATE TABLE IF NOT EXISTS demand_pairs (
+    role        TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    bucket      TEXT NOT NULL,
+    skill_a     TEXT NOT NULL,
+    skill_b     TEXT NOT NULL,
+    jobs        INTEGER NOT NULL,
+    PRIMARY KEY (role, source, bucket, skill_a, skill_b)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS demand_seen (
+    role        TEXT NOT NULL,
+    job_key     TEXT NOT NULL,
+    seen_at     REAL NOT NULL,
+    PRIMARY KEY (role, job_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_demand_seen_at ON demand_seen (seen_at);
+"""
+
+
+def normalize_role(role: str) -> str:
+    """Aggregate key for a role / search query: lowercase, single-spaced."""
+    return " ".join(role.lower().split())
+
+
+def time_bucket(when: Optional[float] = None, granularity: str = SKILL_DEMAND_BUCKET) -> str:
+    """Bucket key ("2026-10-17", "2026-W42" or "2026-10") for a Unix time (default: now)."""
+    if granularity not in _BUCKET_FORMATS:
+        raise ValueError(f"Unknown skill demand bucket: {granularity}")
+    moment = datetime.datetime.fromtimestamp(time.time() if when is None else when, tz=datetime.timezone.utc)
+    return _BUCKET_FORMATS[granularity](moment)
+
+
+def job_key(job: Dict) -> str:
+    """Identity of a posting across scrapes: its URL, else title / company / source."""
+    identity = job.get("url") or "\0".join(
+        str(job.get(field) or "").strip().lower() for field in ("title", "company", "source")
+    )
+    return hashlib.sha1(identity.encode("utf-8")).hexdigest()
+
+
+class SkillDemand:
+    """Mergeable aggregate: how many jobs were seen and how many listed each skill."""
+
+    __slots__ = ("total_jobs", "counts", "types")
+
+    def __init__(
+        self,
+        total_jobs: int = 0,
+        counts: Optional[Dict[str, int]] = None,
+        types: Optional[Dict[str, str]] = None,
+    ):
+        self.total_jobs = total_jobs
+        self.counts: Dict[str, int] = counts or {}
+        self.types: Dict[str, str] = types or {}
+
+    @classmethod
+    def from_jobs(cls, jobs: Sequence[Dict]) -> "SkillDemand":
+        """Aggregate a batch of jobs (one vectorised pass, see skill_stats)."""
+        return cls.from_incidence(encode_jobs(jobs))
+
+    @classmethod
+    def from_incidence(cls, incidence: SkillIncidence) -> "SkillDemand":
+        vocabulary = incidence.vocabulary
+        counts = dict(zip(vocabulary.names, incidence.skill_counts().tolist()))
+        return cls(incidence.n_jobs, counts, dict(zip(vocabulary.names, vocabulary.types)))
+
+    def merge(self, other: "SkillDemand") -> "SkillDemand":
+        """Exact union of two aggregates (neither is modified)."""
+        counts = dict(self.counts)
+        for skill, jobs in other.counts.items():
+            counts[skill] = counts.get(skill, 0) + jobs
+        types = dict(other.types)
+        types.update(self.types)
+        return SkillDemand(self.total_jobs + other.total_jobs, counts, types)
+
+    __add__ = merge
+
+    def statistics(self) -> SkillStatistics:
+        """Percentages, importance levels and demand order of the merged counts."""
+        names = list(self.counts)
+        return statistics_from_counts(
+            names,
+            [self.types.get(name, DEFAULT_SKILL_TYPE) for name in names],
+            [self.counts[name] for name in names],
+            self.total_jobs,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, SkillDemand)
+            and self.total_jobs == other.total_jobs
+            and self.counts == other.counts
+        )
+
+    def __repr__(self) -> str:
+        return f"SkillDemand(total_jobs={self.total_jobs}, skills={len(self.counts)})"
+
+
+class SkillDemandStore:
+    """Thread-safe SQLite store of SkillDemand aggregates per (role, source, bucket)."""
+
+    def __init__(
+        self,
+        path: str = SKILL_DEMAND_PATH,
+        granularity: str = SKILL_DEMAND_BUCKET,
+        seen_ttl: float = SKILL_DEMAND_SEEN_TTL,
+    ):
+        if granularity not in _BUCKET_FORMATS:
+            raise ValueError(f"Unknown skill demand bucket: {granularity}")
+        self.path = path
+        self.granularity = granularity
+        self.seen_ttl = seen_ttl
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        # Bumped per role on every fold, so derived indexes know what to rebuild
+        self._revisions: Dict[str, int] = {}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def record_jobs(self, role: str, jobs: Iterable[Dict], when: Optional[float] = None) -> int:
+        """
+        Fold newly scraped jobs into the role's aggregates.
+
+        Jobs without a skills list, and postings already recorded for the
+        role within SKILL_DEMAND_SEEN_TTL, are skipped.
+
+        Returns:
+            Number of jobs folded in
+        """
+        role = normalize_role(role)
+        now = time.time() if when is None else when
+        bucket = time_bucket(now, self.granularity)
+        candidates = [job for job in jobs if isinstance(job.get("skills"), list)]
+        if not role or not candidates:
+            return 0
+
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM demand_seen WHERE seen_at < ?", (now - self.seen_ttl,))
+
+                by_source: Dict[str, List[Dict]] = {}
+                for job in candidates:
+                    inserted = conn.execute(
+                        "INSERT OR IGNORE INTO demand_seen (role, job_key, seen_at) VALUES (?, ?, ?)",
+                        (role, job_key(job), now),
+                    ).rowcount
+                    if inserted:
+                        by_source.setdefault(job.get("source") or UNKNOWN_SOURCE, []).append(job)
+
+                for source, source_jobs in by_source.items():
+                    self._fold(conn, role, source, bucket, encode_jobs(source_jobs))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            if by_source:
+                self._revisions[role] = self._revisions.get(role, 0) + 1
+
+        folded = sum(len(source_jobs) for source_jobs in by_source.values())
+        logger.info(
+            "Skill demand: folded %d new of %d jobs into '%s' (%s)",
+            folded, len(candidates), role, bucket,
+        )
+        return folded
+
+    @staticmethod
+    def _fold(conn: sqlite3.Connection, role: str, source: str, bucket: str, incidence: SkillIncidence) -> None:
+        demand = SkillDemand.from_incidence(incidence)
+        conn.execute(
+            "INSERT INTO demand_jobs (role, source, bucket, total_jobs) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (role, source, bucket) DO UPDATE SET total_jobs = total_jobs + excluded.total_jobs",
+            (role, source, bucket, demand.total_jobs),
+        )
+        conn.executemany(
+            "INSERT INTO demand_skills (role, source, bucket, skill, type, jobs) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (role, source, bucket, skill) DO UPDATE SET jobs = jobs + excluded.jobs",
+            [
+                (role, source, bucket, skill, demand.types.get(skill, DEFAULT_SKILL_TYPE), jobs)
+                for skill, jobs in demand.counts.items()
+            ],
+        )
+        if not SCIPY_AVAILABLE:
+            return
+        names = incidence.vocabulary.names
+        skill_a, skill_b, jobs = cooccurrence_counts(incidence)
+        # Store each pair once, in name order
+        conn.executemany(
+            "INSERT INTO demand_pairs (role, source, bucket, skill_a, skill_b, jobs) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (role, source, bucket, skill_a, skill_b) DO UPDATE SET jobs = jobs + excluded.jobs",
+            [
+                (role, source, bucket, *sorted((names[a], names[b])), count)
+                for a, b, count in zip(skill_a.tolist(), skill_b.tolist(), jobs.tolist())
+            ],
+        )
+
+    @staticmethod
+    def _where(
+        role: str,
+        sources: Optional[Sequence[str]],
+        since: Optional[str],
+        until: Optional[str],
+    ) -> Tuple[str, List[Any]]:
+        where = ["role = ?"]
+        params: List[Any] = [normalize_role(role)]
+        if sources:
+            where.append(f"source IN ({', '.join('?' for _ in sources)})")
+            params.extend(sources)
+        if since:
+            where.append("bucket >= ?")
+            params.append(since)
+        if until:
+            where.append("bucket <= ?")
+            params.append(until)
+        return " AND ".join(where), params
+
+    def demand(
+        self,
+        role: str,
+        sources: Optional[Sequence[str]] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> SkillDemand:
+        """
+        Merge the role's aggregates over the given sources (default: all)
+        and bucket range (inclusive bucket keys, default: all time).
+        """
+        condition, params = self._where(role, sources, since, until)
+        with self._lock:
+            conn = self._connection()
+            total_jobs = conn.execute(
+                f"SELECT COALESCE(SUM(total_jobs), 0) FROM demand_jobs WHERE {condition}", params
+            ).fetchone()[0]
+            # MAX(type): 'technical' wins if sources disagree
+            rows = conn.execute(
+                f"SELECT skill, MAX(type), SUM(jobs) FROM demand_skills WHERE {condition} "
+                f"GROUP BY skill ORDER BY skill",
+                params,
+            ).fetchall()
+
+        return SkillDemand(
+            total_jobs,
+            {skill: jobs for skill, _, jobs in rows},
+            {skill: skill_type for skill, skill_type, _ in rows},
+        )
+
+    def pair_counts(
+        self,
+        role: str,
+        sources: Optional[Sequence[str]] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[Tuple[str, str, int]]:
+        """Merged (skill_a, skill_b, jobs listing both) rows for the same slices as demand()."""
+        condition, params = self._where(role, sources, since, until)
+        with self._lock:
+            return self._connection().execute(
+                f"SELECT skill_a, skill_b, SUM(jobs) FROM demand_pairs WHERE {condition} "
+                f"GROUP BY skill_a, skill_b",
+                params,
+            ).fetchall()
+
+    def revisions(self) -> Dict[str, int]:
+        """Per-role fold counters of this process (roles folded since startup)."""
+        with self._lock:
+            return dict(self._revisions)
+
+    def roles(self) -> List[Dict[str, Any]]:
+        """Every recorded role with its total jobs and bucket range."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT role, SUM(total_jobs), MIN(bucket), MAX(bucket) FROM demand_jobs "
+                "GROUP BY role ORDER BY role"
+            ).fetchall()
+        return [
+            {"role": role, "total_jobs": total, "first_bucket": first, "last_bucket": last}
+            for role, total, first, last in rows
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_store: Optional[SkillDemandStore] = None
+_store_lock = threading.Lock()
+
+
+def get_demand_store() -> SkillDemandStore:
+    """Return the process-wide skill demand store (opened on first use)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SkillDemandStore()
+        return _store
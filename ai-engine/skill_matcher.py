@@ -0,0 +1,152 @@
+"""
+Skill Matcher Module
+Compiles a skill list once into a multi-pattern matcher so that a CV or a
+job description can be scanned for every known skill in a single pass.
+
+  - Single-word skills ("Java", "R", "C++") match whole cleaned tokens only,
+    so "R" never matches inside "Expert" and "C" never matches inside "Back".
+  - Multi-word skills ("React Native") are located with an Aho-Corasick
+    automaton over the lower-cased, whitespace-normalised text.
+  - Single-word skills also get a FuzzyIndex for near-miss spellings.
+
+The cost of a scan is linear in the text length, independent of how many
+skills the taxonomy holds.
+"""
+
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Set, Tuple
+import logging
+
+from fuzzy_index import FuzzyIndex
+
+logger = logging.getLogger(__name__)
+
+# Punctuation stripped from both ends of a word before token comparison
+TOKEN_STRIP_CHARS = '.,!?;:()[]{}"\'/\\'
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase the text and collapse every whitespace run to one space."""
+    return ' '.join(text.lower().split())
+
+
+def clean_token(word: str) -> str:
+    """Strip surrounding punctuation from a raw word and lowercase it."""
+    return word.strip(TOKEN_STRIP_CHARS).lower()
+
+
+class SkillMatcher:
+    """
+    Exact skill matcher compiled from a skill list.
+
+    Build once, then call `find()` for every text. Instances are immutable
+    after construction and safe to share between threads.
+    """
+
+    def __init__(self, skills: Iterable[str]):
+        self.skills: List[str] = list(skills)
+
+        # lowercase key -> original spellings (a list keeps duplicates intact)
+        self.single_word: Dict[str, List[str]] = {}
+        phrases: Dict[str, List[str]] = {}
+
+        for skill in self.skills:
+            key = skill.lower().strip()
+            if not key:
+                continue
+            target = phrases if ' ' in key else self.single_word
+            target.setdefault(key, []).append(skill)
+
+        self.phrases: Dict[str, List[str]] = phrases
+        self._build_automaton(list(phrases))
+
+        # Candidate index for fuzzy matching of single-word skills
+        self.fuzzy = FuzzyIndex(self.single_word)
+
+        logger.debug(
+            "Compiled skill matcher: %d single-word, %d multi-word skills",
+            len(self.single_word), len(self.phrases),
+        )
+
+    # ------------------------------------------------------------------
+    # Aho-Corasick construction
+    # ------------------------------------------------------------------
+
+    def _build_automaton(self, patterns: List[str]) -> None:
+        """Build goto / fail / output tables for the multi-word phrases."""
+        goto: List[Dict[str, int]] = [{}]
+        output: List[List[str]] = [[]]
+
+        for pattern in patterns:
+            state = 0
+            for char in pattern:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][char] = nxt
+                    goto.append({})
+                    output.append([])
+                state = nxt
+            output[state].append(pattern)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in goto[state].items():
+                queue.append(nxt)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[nxt] = goto[fallback].get(char, 0)
+                # Inherit matches that end at the fallback state
+                output[nxt] = output[nxt] + output[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+
+    # ------------------------------------------------------------------
+    # Matching
+    # ------------------------------------------------------------------
+
+    def find_tokens(self, tokens: Iterable[str]) -> Set[str]:
+        """Return single-word skills present in an iterable of cleaned tokens."""
+        found: Set[str] = set()
+        single_word = self.single_word
+        for token in tokens:
+            hits = single_word.get(token)
+            if hits:
+                found.update(hits)
+        return found
+
+    def find_phrases(self, text_normalized: str) -> Set[str]:
+        """Return multi-word skills occurring in already-normalised text."""
+        found: Set[str] = set()
+        if not self.phrases:
+            return found
+
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for char in text_normalized:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                for pattern in output[state]:
+                    found.update(self.phrases[pattern])
+        return found
+
+    def find(self, text: str) -> Set[str]:
+        """Return every skill with an exact hit in the raw text."""
+        if not text:
+            return set()
+        tokens = {clean_token(word) for word in text.split()}
+        return self.find_tokens(tokens) | self.find_phrases(normalize_text(text))
+
+
+@lru_cache(maxsize=16)
+def get_skill_matcher(skills: Tuple[str, ...]) -> SkillMatcher:
+    """Return a compiled matcher for the skill tuple (compiled once, then cached)."""
+    return SkillMatcher(skills)
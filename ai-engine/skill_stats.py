@@ -0,0 +1,250 @@
+"""
+Skill Statistics Module
+Vectorised skill-demand statistics over a sparse job x skill incidence
+matrix.
+
+Jobs are encoded once (encode_jobs) into CSR form: the distinct skill ids
+of every job (int32 columns from a SkillVocabulary) plus row pointers.
+Encoding is the only step that touches the job dicts; after it, for any
+number of jobs:
+
+  - counts:      column sums of the incidence matrix (np.bincount)
+  - percentages: counts / jobs * 100
+  - importance:  the categorize_skill_by_demand thresholds applied to the
+                 whole percentage vector at once (np.select)
+  - ordering:    one stable argsort, top-k is a slice of it
+
+The incidence is binary: a skill listed twice in one job counts once.
+With SciPy installed, SkillIncidence.matrix() returns the same data as a
+scipy.sparse.csr_matrix for matrix algebra, e.g. cooccurrence_counts().
+
+scraper.calculate_skill_frequencies keeps its output format and delegates
+here.
+"""
+
+import logging
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    from scipy import sparse
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Demand buckets (percentage of jobs requiring the skill)
+ESSENTIAL_THRESHOLD = 70   # above this: essential
+IMPORTANT_THRESHOLD = 40   # at or above this: important, below: nice_to_have
+
+DEFAULT_SKILL_TYPE = "technical"
+
+
+class SkillVocabulary:
+    """Skill name <-> column id mapping, with the type each skill was first seen with."""
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.types: List[str] = []
+        self._columns: Dict[str, int] = {}
+
+    def encode(self, skills: List[Union[str, Dict[str, Any]]]) -> np.ndarray:
+        """
+        Column ids for a flat list of skills (names or {"name", "type"}
+        dicts); unseen names get the next ids in first-seen order.
+        """
+        try:
+            # Fast path: every skill is a {"name", "type"} dict
+            names = list(map(itemgetter("name"), skills))
+        except TypeError:
+            names = [skill["name"] if isinstance(skill, dict) else skill for skill in skills]
+        columns = self._columns
+
+        # Distinct names in first-seen order; only unseen ones need Python work
+        unseen = [name for name in dict.fromkeys(names) if name not in columns]
+        if unseen:
+            # Iterating backwards leaves each name's first occurrence in the dict
+            first = dict(zip(reversed(names), reversed(skills)))
+            for name in unseen:
+                skill = first[name]
+                columns[name] = len(self.names)
+                self.names.append(name)
+                self.types.append(
+                    skill.get("type", DEFAULT_SKILL_TYPE) if isinstance(skill, dict) else DEFAULT_SKILL_TYPE
+                )
+
+        return np.fromiter(map(columns.__getitem__, names), dtype=np.int64, count=len(names))
+
+    def get(self, name: str) -> Optional[int]:
+        return self._columns.get(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class SkillIncidence(NamedTuple):
+    """Binary job x skill matrix in CSR form (row = job, column = skill id)."""
+    indptr: np.ndarray      # int64, n_jobs + 1
+    indices: np.ndarray     # int32, sorted skill ids per job
+    vocabulary: SkillVocabulary
+
+    @property
+    def n_jobs(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def n_skills(self) -> int:
+        return len(self.vocabulary)
+
+    def skill_counts(self) -> np.ndarray:
+        """Number of jobs listing each skill (column sums)."""
+        return np.bincount(self.indices, minlength=self.n_skills)
+
+    def job_rows(self) -> np.ndarray:
+        """Row (job) index of every stored entry, parallel to `indices`."""
+        return np.repeat(np.arange(self.n_jobs, dtype=np.int64), np.diff(self.indptr))
+
+    def matrix(self) -> "sparse.csr_matrix":
+        """The incidence as a scipy.sparse CSR matrix of ones."""
+        if not SCIPY_AVAILABLE:
+            raise RuntimeError("scipy is not installed")
+        data = np.ones(len(self.indices), dtype=np.int32)
+        return sparse.csr_matrix((data, self.indices, self.indptr), shape=(self.n_jobs, self.n_skills))
+
+
+def cooccurrence_counts(incidence: SkillIncidence) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Jobs listing both skills of every co-occurring pair, from the sparse
+    product X^T X. Returns parallel arrays (skill_a, skill_b, jobs) with
+    skill_a < skill_b (each unordered pair once).
+    """
+    matrix = incidence.matrix()
+    pairs = sparse.triu(matrix.T @ matrix, k=1).tocoo()
+    return pairs.row.astype(np.int32), pairs.col.astype(np.int32), pairs.data.astype(np.int64)
+
+
+def encode_jobs(jobs: Iterable[Dict], vocabulary: Optional[SkillVocabulary] = None) -> SkillIncidence:
+    """
+    Encode jobs (dicts with a 'skills' list of names or {"name", "type"}
+    dicts) as a SkillIncidence. Jobs without a skills list are empty rows.
+    """
+    if vocabulary is None:
+        vocabulary = SkillVocabulary()
+
+    # The only per-job Python work: flattening the skill lists
+    flat: List[Union[str, Dict[str, Any]]] = []
+    lengths: List[int] = []
+    for job in jobs:
+        skills = job.get("skills")
+        if isinstance(skills, list):
+            flat.extend(skills)
+            lengths.append(len(skills))
+        else:
+            lengths.append(0)
+
+    columns = vocabulary.encode(flat)
+    n_jobs, n_skills = len(lengths), len(vocabulary)
+    rows = np.repeat(np.arange(n_jobs, dtype=np.int64), lengths)
+    cells = rows * max(n_skills, 1) + columns
+
+    # Sorted distinct (job, skill) cells: drops repeats within a job. The
+    # cells are nearly sorted already, which a sort handles far faster than
+    # np.unique's hashing
+    cells.sort()
+    if len(cells):
+        cells = cells[np.concatenate(([True], cells[1:] != cells[:-1]))]
+    rows = cells // max(n_skills, 1)
+    indices = (cells % max(n_skills, 1)).astype(np.int32)
+
+    indptr = np.zeros(n_jobs + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_jobs), out=indptr[1:])
+    return SkillIncidence(indptr=indptr, indices=indices, vocabulary=vocabulary)
+
+
+def categorize_demand(percentages: np.ndarray) -> np.ndarray:
+    """Vectorised categorize_skill_by_demand: one importance label per percentage."""
+    return np.select(
+        [percentages > ESSENTIAL_THRESHOLD, percentages >= IMPORTANT_THRESHOLD],
+        ["essential", "important"],
+        default="nice_to_have",
+    )
+
+
+class SkillStatistics(NamedTuple):
+    """Per-skill demand statistics, arrays indexed by column id."""
+    names: List[str]
+    types: List[str]
+    counts: np.ndarray
+    percentages: np.ndarray     # unrounded
+    importance: np.ndarray
+    order: np.ndarray           # column ids, highest demand first
+    total_jobs: int
+
+    def top(self, k: Optional[int] = None) -> np.ndarray:
+        """Column ids of the k most demanded skills (all when k is None)."""
+        return self.order if k is None else self.order[:k]
+
+    def to_dict(self, top_k: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        The /scrape-jobs statistics format, most demanded first:
+        {name: {"count", "percentage", "importance", "type"}}. Skills no
+        job lists (possible with a shared vocabulary) are left out.
+        """
+        counts = self.counts.tolist()
+        importance = self.importance.tolist()
+        rounded = self._rounded()
+        return {
+            self.names[col]: {
+                "count": counts[col],
+                "percentage": rounded[col],
+                "importance": importance[col],
+                "type": self.types[col],
+            }
+            for col in self.top(top_k).tolist()
+            if counts[col]
+        }
+
+    def _rounded(self) -> List[float]:
+        # Python's round() (correctly rounded), as the output always used
+        return [round(p, 2) for p in self.percentages.tolist()]
+
+
+def statistics_from_counts(
+    names: List[str],
+    types: List[str],
+    counts: np.ndarray,
+    total_jobs: int,
+) -> SkillStatistics:
+    """
+    Percentages, importance buckets and demand order from per-skill job
+    counts (e.g. the column sums of an incidence, or merged aggregates).
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    percentages = counts / total_jobs * 100 if total_jobs else np.zeros(len(counts))
+
+    stats = SkillStatistics(
+        names=names,
+        types=types,
+        counts=counts,
+        percentages=percentages,
+        importance=categorize_demand(percentages),
+        order=np.empty(0, dtype=np.intp),
+        total_jobs=total_jobs,
+    )
+    # Rank by the rounded percentage shown to clients; the stable sort keeps
+    # ties in input (first-seen) order
+    order = np.argsort(-np.asarray(stats._rounded()), kind="stable")
+    return stats._replace(order=order)
+
+
+def skill_statistics(incidence: SkillIncidence) -> SkillStatistics:
+    """Counts, percentages, importance buckets and demand order in one vectorised pass."""
+    return statistics_from_counts(
+        incidence.vocabulary.names,
+        incidence.vocabulary.types,
+        incidence.skill_counts(),
+        incidence.n_jobs,
+    )
@@ -0,0 +1,386 @@
+"""
+Skill Taxonomy Module
+Versioned registry of the skill taxonomy - skill names, their technical /
+soft category, aliases and database ids - together with every matcher
+compiled from it.
+
+Sources:
+  - SKILL_TAXONOMY_PATH (cache/skill_taxonomy.json) when it exists: an
+    export of the Laravel `skills` table, either a plain list of rows or
+    {"revision": ..., "skills": [...]}, one row per skill:
+        {"id": 12, "name": "JavaScript", "type": "technical", "aliases": ["JS"]}
+    ("id", "type" and "aliases" are optional);
+  - otherwise the built-in taxonomy the registry was created with
+    (extractor.TECHNICAL_SKILLS / SOFT_SKILLS).
+
+reload() parses the source and runs the compile callback (exact / fuzzy
+SkillMatcher, spaCy PhraseMatcher) on a background thread, then swaps the
+finished snapshot in with one reference assignment. Callers read
+`registry.current` once per call, so a request never mixes two taxonomies
+and nothing is compiled on the request path. The spaCy model stays
+loaded; only the matchers are rebuilt.
+
+Taxonomy.version is a fingerprint of the content, identical in every
+process (API, PDF workers, after a restart) for the same taxonomy, so it
+can key cached results. A watcher thread reloads when the file changes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+SKILL_TAXONOMY_PATH = os.environ.get(
+    "SKILL_TAXONOMY_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "skill_taxonomy.json"),
+)
+# Seconds between checks of the taxonomy file for changes (0 disables the watcher)
+TAXONOMY_WATCH_INTERVAL = float(os.environ.get("TAXONOMY_WATCH_INTERVAL", 30))
+
+SKILL_TYPES = ("technical", "soft")
+DEFAULT_SKILL_TYPE = "technical"   # default of the Laravel skills.type column
+
+
+class TaxonomyError(ValueError):
+    """The taxonomy source is malformed."""
+
+
+class Taxonomy:
+    """Immutable skill taxonomy: names, categories, aliases and ids."""
+
+    __slots__ = ("skills", "types", "aliases", "ids", "revision", "source", "version", "_canonical")
+
+    def __init__(self, rows: Iterable[Dict[str, Any]], revision: Optional[str] = None, source: str = "builtin"):
+        skills: List[str] = []
+        types: Dict[str, str] = {}
+        ids: Dict[str, int] = {}
+        alias_rows: List[tuple] = []
+
+        for row in rows:
+            if not isinstance(row, dict) or not isinstance(row.get("name"), str):
+                raise TaxonomyError(f"Invalid skill row: {row!r}")
+            name = row["name"].strip()
+            # skills.name is unique in Laravel; keep the first of any duplicate
+            if not name or name in types:
+                continue
+            skill_type = row.get("type") or DEFAULT_SKILL_TYPE
+            if skill_type not in SKILL_TYPES:
+                raise TaxonomyError(f"Unknown type {skill_type!r} for skill {name!r}")
+            skill_id = row.get("id")
+            if skill_id is not None:
+                try:
+                    skill_id = int(skill_id)
+                except (TypeError, ValueError):
+                    raise TaxonomyError(f"Invalid id {skill_id!r} for skill {name!r}") from None
+            aliases = row.get("aliases") or []
+            if not isinstance(aliases, (list, tuple)) or not all(isinstance(alias, str) for alias in aliases):
+                raise TaxonomyError(f"Aliases of skill {name!r} must be a list of strings")
+            skills.append(name)
+            types[name] = skill_type
+            if skill_id is not None:
+                ids[name] = skill_id
+            alias_rows.append((name, aliases))
+
+        # Aliases never shadow a skill name or an earlier alias
+        alias_map: Dict[str, str] = {}
+        for name, aliases in alias_rows:
+            for alias in aliases:
+                alias = alias.strip()
+                if alias and alias not in types and alias not in alias_map:
+                    alias_map[alias] = name
+
+        self.skills: tuple = tuple(skills)
+        self.types: Dict[str, str] = types
+        self.aliases: Dict[str, str] = alias_map
+        self.ids: Dict[str, int] = ids
+        self.revision = revision
+        self.source = source
+        self._canonical: Dict[str, str] = {name: name for name in skills}
+        self._canonical.update(alias_map)
+        self.version = self._fingerprint()
+
+    @classmethod
+    def from_lists(cls, technical: Sequence[str], soft: Sequence[str]) -> "Taxonomy":
+        """Build the built-in taxonomy from plain technical / soft name lists."""
+        rows = [{"name": name, "type": "technical"} for name in technical]
+        rows += [{"name": name, "type": "soft"} for name in soft]
+        return cls(rows)
+
+    def _fingerprint(self) -> str:
+        # Sorted, so reordering the export doesn't change the version
+        payload = json.dumps(
+            [[name, self.types[name], self.ids.get(name)] for name in sorted(self.skills)]
+            + sorted([alias, name] for alias, name in self.aliases.items()),
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+    @property
+    def terms(self) -> tuple:
+        """Every spelling the matchers look for: skill names, then aliases."""
+        return self.skills + tuple(self.aliases)
+
+    @property
+    def technical(self) -> List[str]:
+        return [name for name in self.skills if self.types[name] == "technical"]
+
+    @property
+    def soft(self) -> List[str]:
+        return [name for name in self.skills if self.types[name] == "soft"]
+
+    def canonical(self, term: str) -> Optional[str]:
+        """Skill name for a matched spelling (the name itself or an alias)."""
+        return self._canonical.get(term)
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        aliases_of: Dict[str, List[str]] = {}
+        for alias, name in self.aliases.items():
+            aliases_of.setdefault(name, []).append(alias)
+        rows = []
+        for name in self.skills:
+            row: Dict[str, Any] = {"name": name, "type": self.types[name]}
+            if name in self.ids:
+                row["id"] = self.ids[name]
+            if name in aliases_of:
+                row["aliases"] = aliases_of[name]
+            rows.append(row)
+        return rows
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def __repr__(self) -> str:
+        return f"Taxonomy(version={self.version}, skills={len(self.skills)}, aliases={len(self.aliases)})"
+
+
+class TaxonomySnapshot(NamedTuple):
+    """A taxonomy plus the matchers compiled from it; swapped in as one unit."""
+    taxonomy: Taxonomy
+    matchers: Dict[str, Any]
+    generation: int      # number of swaps in this process, starting at 1
+    loaded_at: float
+
+
+def load_taxonomy_file(path: str) -> Taxonomy:
+    """Parse a skills export (list of rows or {"revision", "skills"})."""
+    with open(path, "r", encoding="utf-8") as fh:
+        try:
+            data = json.load(fh)
+        except ValueError as exc:
+            raise TaxonomyError(f"Invalid JSON in {path}: {exc}")
+    revision = None
+    if isinstance(data, dict):
+        revision = data.get("revision")
+        data = data.get("skills")
+    if not isinstance(data, list):
+        raise TaxonomyError(f"{path} must hold a list of skills")
+    return Taxonomy(data, revision=None if revision is None else str(revision), source=path)
+
+
+class TaxonomyRegistry:
+    """
+    Holds the current TaxonomySnapshot and rebuilds it in the background.
+
+    `compile_matchers(taxonomy)` returns the matchers to publish with a
+    taxonomy. Reloads run it on the reload thread; the first compile runs
+    on the watcher thread once start_watching() is called (or on first
+    access in processes that never start it, such as PDF workers).
+    """
+
+    def __init__(
+        self,
+        builtin: Taxonomy,
+        compile_matchers: Callable[[Taxonomy], Dict[str, Any]],
+        path: str = SKILL_TAXONOMY_PATH,
+        watch_interval: float = TAXONOMY_WATCH_INTERVAL,
+    ):
+        self.builtin = builtin
+        self.path = path
+        self.watch_interval = watch_interval
+        self._compile_matchers = compile_matchers
+        self._snapshot: Optional[TaxonomySnapshot] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        # One reload at a time, in order
+        self._reloader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="taxonomy-reload")
+        self._file_mtime: Optional[float] = None
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    @property
+    def current(self) -> TaxonomySnapshot:
+        """The active snapshot (loaded and compiled on first access)."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    taxonomy = self._load_initial()
+                    self._install(taxonomy, self._compile(taxonomy))
+                snapshot = self._snapshot
+        return snapshot
+
+    @property
+    def version(self) -> str:
+        return self.current.taxonomy.version
+
+    def _file_mtime_now(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def _read_source(self) -> Taxonomy:
+        """The file's taxonomy if the file exists, else the built-in one."""
+        mtime = self._file_mtime_now()
+        taxonomy = self.builtin if mtime is None else load_taxonomy_file(self.path)
+        self._file_mtime = mtime
+        return taxonomy
+
+    def _load_initial(self) -> Taxonomy:
+        try:
+            return self._read_source()
+        except (OSError, TaxonomyError) as exc:
+            # Never fail startup over a bad export; keep serving the built-in lists
+            logger.error("Could not load skill taxonomy from %s, using built-in skills: %s", self.path, exc)
+            return self.builtin
+
+    # ------------------------------------------------------------------
+    # Compiling and swapping
+    # ------------------------------------------------------------------
+
+    def _compile(self, taxonomy: Taxonomy) -> Dict[str, Any]:
+        start = time.perf_counter()
+        matchers = self._compile_matchers(taxonomy)
+        logger.info(
+            "Compiled skill taxonomy %s (%d skills, %d aliases) in %.2fs",
+            taxonomy.version, len(taxonomy.skills), len(taxonomy.aliases), time.perf_counter() - start,
+        )
+        return matchers
+
+    def _install(self, taxonomy: Taxonomy, matchers: Dict[str, Any]) -> TaxonomySnapshot:
+        # Caller holds self._lock
+        self._generation += 1
+        self._snapshot = TaxonomySnapshot(
+            taxonomy=taxonomy,
+            matchers=matchers,
+            generation=self._generation,
+            loaded_at=time.time(),
+        )
+        return self._snapshot
+
+    def _persist(self, taxonomy: Taxonomy) -> None:
+        """Write the taxonomy to SKILL_TAXONOMY_PATH atomically, for PDF workers and restarts."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump({"revision": taxonomy.revision, "skills": taxonomy.to_rows()}, fh, indent=2)
+        os.replace(tmp_path, self.path)
+        self._file_mtime = self._file_mtime_now()
+
+    def _reload_now(self, rows: Optional[List[Dict[str, Any]]], revision: Optional[str]) -> TaxonomySnapshot:
+        if rows is not None:
+            taxonomy = Taxonomy(rows, revision=revision, source="upload")
+            self._persist(taxonomy)
+        else:
+            taxonomy = self._read_source()
+
+        current = self.current
+        if current.taxonomy.version == taxonomy.version:
+            logger.info("Skill taxonomy %s unchanged, keeping current matchers", taxonomy.version)
+            return current
+
+        matchers = self._compile(taxonomy)
+        with self._lock:
+            snapshot = self._install(taxonomy, matchers)
+        logger.info(
+            "Skill taxonomy swapped: %s -> %s (generation %d)",
+            current.taxonomy.version, taxonomy.version, snapshot.generation,
+        )
+        return snapshot
+
+    def reload(
+        self,
+        rows: Optional[List[Dict[str, Any]]] = None,
+        revision: Optional[str] = None,
+    ) -> "Future[TaxonomySnapshot]":
+        """
+        Rebuild the taxonomy in the background and swap it in when compiled.
+
+        Args:
+            rows: New skill rows (e.g. pushed by Laravel); persisted to
+                  SKILL_TAXONOMY_PATH. None re-reads the file.
+            revision: Optional label of the export (e.g. a database timestamp)
+
+        Returns:
+            Future resolving to the active snapshot; it raises TaxonomyError
+            for a malformed source, in which case the old one stays active.
+        """
+        return self._reloader.submit(self._reload_now, rows, revision)
+
+    def ensure_version(self, version: str) -> None:
+        """Reload from the file if this process is behind `version` (used by PDF workers)."""
+        if self.version == version:
+            return
+        self.reload().result()
+        if self.version != version:
+            logger.warning("Skill taxonomy %s requested but %s is loaded", version, self.version)
+
+    # ------------------------------------------------------------------
+    # File watcher
+    # ------------------------------------------------------------------
+
+    def _watch(self) -> None:
+        self.current  # initial load + compile, off the startup path
+        while not self._stop.wait(self.watch_interval):
+            if self._file_mtime_now() == self._file_mtime:
+                continue
+            try:
+                self.reload().result()
+            except (OSError, TaxonomyError) as exc:
+                logger.error("Skill taxonomy reload from %s failed, keeping %s: %s", self.path, self.version, exc)
+                # Don't retry the same broken file every interval
+                self._file_mtime = self._file_mtime_now()
+
+    def start_watching(self) -> None:
+        """Compile the initial taxonomy and start polling the file for changes."""
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+        if self.watch_interval <= 0:
+            self._reloader.submit(lambda: self.current)
+            return
+        self._watcher = threading.Thread(target=self._watch, name="taxonomy-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self.current
+        taxonomy = snapshot.taxonomy
+        return {
+            "version": taxonomy.version,
+            "revision": taxonomy.revision,
+            "source": taxonomy.source,
+            "skills": len(taxonomy.skills),
+            "aliases": len(taxonomy.aliases),
+            "matchers": sorted(snapshot.matchers),
+            "generation": snapshot.generation,
+            "loaded_at": snapshot.loaded_at,
+            "path": self.path,
+            "watch_interval": self.watch_interval,
+        }
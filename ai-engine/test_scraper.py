@@ -9,6 +9,7 @@ Also usable as a standalone CLI tool:
 """
 
 import argparse
+import asyncio
 import gc
 import json
 import logging
@@ -18,6 +19,9 @@ from typing import Dict, List, Optional
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from http_client import close_http_client
+from scraper import enrich_jobs
+
 # ── Reuse the existing scraper modules (lazy so server stays up even if absent)
 try:
     from html_scraper import scrape_html_source
@@ -62,7 +66,7 @@ router = APIRouter()
 
 
 @router.post("/test-source")
-def test_source(request: TestSourceRequest):
+async def test_source(request: TestSourceRequest):
     """
     Lightweight probe for a single scraping source.
     Returns: {success, source_name, total_fetched, jobs, message}
@@ -85,9 +89,9 @@ def test_source(request: TestSourceRequest):
             params         = src.params or {}
 
             if "remotive" in endpoint_lower or "remotive" in name_lower:
-                jobs = fetch_remotive(request.query, params=params, max_results=request.max_results)
+                jobs = await fetch_remotive(request.query, params=params, max_results=request.max_results)
             elif "adzuna" in endpoint_lower or "adzuna" in name_lower:
-                jobs = fetch_adzuna(request.query, params=params, max_results=request.max_results)
+                jobs = await fetch_adzuna(request.query, params=params, max_results=request.max_results)
             else:
                 source_dict = {
                     "name":     src.name,
@@ -95,7 +99,7 @@ def test_source(request: TestSourceRequest):
                     "headers":  src.headers or {},
                     "params":   params,
                 }
-                jobs = fetch_generic_api(source_dict, request.query, max_results=request.max_results)
+                jobs = await fetch_generic_api(source_dict, request.query, max_results=request.max_results)
 
         elif stype == "html":
             if not _HTML_OK:
@@ -107,12 +111,14 @@ def test_source(request: TestSourceRequest):
                 "headers":  src.headers or {},
                 "params":   src.params  or {},
             }
-            jobs = scrape_html_source(source_dict, request.query, max_results=request.max_results)
+            jobs = await asyncio.to_thread(
+                scrape_html_source, source_dict, request.query, max_results=request.max_results
+            )
 
         else:
             raise ValueError(f"Unknown source type: {stype!r}")
 
-        jobs = jobs[:request.max_results]
+        jobs = await asyncio.to_thread(enrich_jobs, jobs[:request.max_results])
 
         if not jobs:
             return {
@@ -143,6 +149,14 @@ def test_source(request: TestSourceRequest):
 # Standalone CLI
 # ─────────────────────────────────────────────────────────────────────────────
 
+async def _run_api_fetch(fetch) -> List[Dict]:
+    """Await one API fetcher coroutine, then close the shared HTTP pool."""
+    try:
+        return await fetch
+    finally:
+        await close_http_client()
+
+
 def _cli():
     parser = argparse.ArgumentParser(
         description="Quick connectivity probe for a single scraping source.",
@@ -177,17 +191,20 @@ def _cli():
             sys.exit(1)
         endpoint_lower = args.endpoint.lower()
         if "remotive" in endpoint_lower:
-            jobs = fetch_remotive(args.query, max_results=args.max)
+            jobs = asyncio.run(_run_api_fetch(fetch_remotive(args.query, max_results=args.max)))
         elif "adzuna" in endpoint_lower:
-            jobs = fetch_adzuna(args.query, params=source_dict["params"], max_results=args.max)
+            jobs = asyncio.run(_run_api_fetch(
+                fetch_adzuna(args.query, params=source_dict["params"], max_results=args.max)
+            ))
         else:
-            jobs = fetch_generic_api(source_dict, args.query, max_results=args.max)
+            jobs = asyncio.run(_run_api_fetch(fetch_generic_api(source_dict, args.query, max_results=args.max)))
     else:
         if not _HTML_OK:
             print("✘  FAIL – html_scraper not importable.")
             sys.exit(1)
         jobs = scrape_html_source(source_dict, args.query, max_results=args.max)
 
+    jobs = enrich_jobs(jobs[:args.max])
     gc.collect()
 
     if not jobs:
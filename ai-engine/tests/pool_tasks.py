@@ -0,0 +1,26 @@
+"""
+Module-level tasks for the process-pool tests: spawned workers import
+them by name, so they can't live in the test modules themselves.
+"""
+
+import os
+import time
+
+
+def sleep_for(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def die():
+    time.sleep(0.3)
+    os._exit(1)
+
+
+def allocate(megabytes):
+    return len(bytearray(megabytes * 1024 * 1024))
+
+
+def spin():
+    while True:
+        pass
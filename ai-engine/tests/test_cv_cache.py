@@ -0,0 +1,114 @@
+import itertools
+import types
+
+import pytest
+
+import cv_cache
+import extractor
+from cv_cache import CvResultCache, content_digest
+from taxonomy import Taxonomy, TaxonomyRegistry
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Each call advances one second, so access order is unambiguous
+    ticks = itertools.count(1_000_000)
+    monkeypatch.setattr(cv_cache, "time", types.SimpleNamespace(time=lambda: float(next(ticks))))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = CvResultCache(path=str(tmp_path / "cv_cache.sqlite3"), max_bytes=1024 * 1024, ttl=3600)
+    yield cache
+    cache.close()
+
+
+def _value(n):
+    # JSON-encodes to exactly n bytes
+    return "x" * (n - 2)
+
+
+def test_round_trip_and_stats(cache):
+    digest = content_digest(b"%PDF-1.4 cv")
+
+    assert cache.get(digest, "text:0") is None
+    cache.put(digest, "text:0", {"text": "Python developer", "pages": [1]})
+
+    assert cache.get(digest, "text:0") == {"text": "Python developer", "pages": [1]}
+    assert cache.get(digest, "profile") is None
+    assert (cache.stats["hits"], cache.stats["misses"]) == (1, 2)
+
+
+def test_extractor_version_change_invalidates(cache, monkeypatch):
+    digest = content_digest(b"cv")
+    cache.put(digest, "skills:fuzzy", ["Python"])
+
+    monkeypatch.setattr(extractor, "EXTRACTOR_VERSION", "test-bump")
+
+    assert cache.get(digest, "skills:fuzzy") is None
+
+
+def test_taxonomy_change_invalidates(cache, monkeypatch, tmp_path):
+    digest = content_digest(b"cv")
+    cache.put(digest, "skills:fuzzy", ["Python"])
+    registry = TaxonomyRegistry(
+        Taxonomy([{"name": "Python"}, {"name": "Rust"}]), lambda taxonomy: {},
+        path=str(tmp_path / "missing.json"), watch_interval=0,
+    )
+
+    monkeypatch.setattr(extractor, "SKILL_TAXONOMY", registry)
+
+    assert cache.get(digest, "skills:fuzzy") is None
+    cache.put(digest, "skills:fuzzy", ["Python", "Rust"])
+    assert cache.get(digest, "skills:fuzzy") == ["Python", "Rust"]
+
+
+def test_expired_entries_miss(tmp_path, clock):
+    cache = CvResultCache(path=str(tmp_path / "c.sqlite3"), max_bytes=1024, ttl=1.5)
+    cache.put("d", "text:0", "fresh")
+
+    assert cache.get("d", "text:0") == "fresh"   # 1s old
+    assert cache.get("d", "text:0") is None      # 2s old
+    assert cache.stats["bytes"] == 0
+    cache.close()
+
+
+def test_lru_eviction_keeps_recently_read_entries(tmp_path, clock):
+    cache = CvResultCache(path=str(tmp_path / "c.sqlite3"), max_bytes=350, ttl=3600)
+    for digest in "abc":
+        cache.put(digest, "profile", _value(100))
+    cache.get("a", "profile")
+
+    cache.put("d", "profile", _value(100))
+
+    assert [d for d in "abcd" if cache.get(d, "profile") is not None] == ["a", "c", "d"]
+    assert cache.stats["bytes"] == 300
+    cache.close()
+
+
+def test_oversized_and_disabled(tmp_path):
+    small = CvResultCache(path=str(tmp_path / "c.sqlite3"), max_bytes=10)
+    small.put("d", "text:0", _value(11))
+    assert small.get("d", "text:0") is None
+    small.close()
+
+    disabled = CvResultCache(path=str(tmp_path / "off.sqlite3"), max_bytes=0)
+    disabled.put("d", "text:0", "x")
+    assert not disabled.enabled
+    assert disabled.get("d", "text:0") is None
+    assert not (tmp_path / "off.sqlite3").exists()
+
+
+def test_clear_and_persistence(tmp_path):
+    path = str(tmp_path / "c.sqlite3")
+    cache = CvResultCache(path=path)
+    cache.put("d", "text:0", "kept")
+    cache.close()
+
+    reopened = CvResultCache(path=path)
+    assert reopened.get("d", "text:0") == "kept"
+    assert reopened.stats["bytes"] == len('"kept"')
+    reopened.clear()
+    assert reopened.get("d", "text:0") is None
+    assert reopened.stats["bytes"] == 0
+    reopened.close()
@@ -0,0 +1,137 @@
+import random
+
+import pytest
+
+from gap_analysis import GapAnalysisIndex, build_role_vectors, normalize_skill_name
+from skill_demand import SkillDemandStore
+
+
+def _jobs(role, total, counts):
+    """`total` postings where skill s is listed by the first counts[s] of them."""
+    return [
+        {
+            "url": f"https://jobs/{role}/{i}",
+            "skills": [
+                {"name": name, "type": "soft" if name == "Teamwork" else "technical"}
+                for name, count in counts.items() if i < count
+            ],
+        }
+        for i in range(total)
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SkillDemandStore(path=str(tmp_path / "demand.sqlite3"))
+    # 80% / 50% / 40% / 10% / 30% of 10 postings
+    store.record_jobs("Backend Developer", _jobs(
+        "backend", 10, {"Python": 8, "Docker": 5, "SQL": 4, "Vue.js": 1, "Teamwork": 3}))
+    # 100% / 50% / 25% of 4 postings
+    store.record_jobs("Frontend Developer", _jobs("frontend", 4, {"Vue.js": 4, "CSS": 2, "Teamwork": 1}))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def index(store):
+    index = GapAnalysisIndex(store=store, missing_limit=10)
+    index.refresh()
+    return index
+
+
+CV = ["python", "VueJS", "Teamwork", "Go"]
+
+
+def test_skill_names_are_compared_loosely():
+    assert normalize_skill_name(" Vue.js ") == normalize_skill_name("VueJS") == "vuejs"
+    assert normalize_skill_name("Node_JS") == normalize_skill_name("node-js") == "nodejs"
+
+
+def test_analyze_one_role(index):
+    result = index.analyze(CV, "backend developer")
+
+    # (80 + 10 + 30) of 210 demand points
+    assert result["match_percentage"] == round(120 / 210 * 100, 2)
+    assert (result["total_jobs"], result["total_required"], result["matched_count"], result["missing_count"]) == (
+        10, 5, 3, 2)
+    assert [s["name"] for s in result["matched_skills"]] == ["Python", "Teamwork", "Vue.js"]
+    assert result["matched_skills"][0] == {
+        "name": "Python", "type": "technical", "percentage": 80.0, "importance": "essential",
+    }
+    assert result["missing_essential_skills"] == []
+    assert [(s["name"], s["importance"]) for s in result["missing_important_skills"]] == [
+        ("Docker", "important"), ("SQL", "important")]
+    assert result["missing_nice_to_have_skills"] == []
+    assert (result["technical_required"], result["technical_matched"]) == (4, 2)
+    assert (result["soft_required"], result["soft_matched"]) == (1, 1)
+
+
+def test_nice_to_have_limit(index):
+    assert [s["name"] for s in index.analyze([], "backend developer")["missing_nice_to_have_skills"]] == [
+        "Teamwork", "Vue.js"]
+    assert [s["name"] for s in index.analyze([], "backend developer", limit=1)["missing_nice_to_have_skills"]] == [
+        "Teamwork"]
+    assert index.analyze([], "backend developer", limit=0)["missing_nice_to_have_skills"] == []
+
+
+def test_unknown_role(index):
+    assert index.analyze(CV, "data scientist") is None
+
+
+def test_analyze_all_roles(index):
+    result = index.analyze_all(CV)
+
+    assert [(r["role"], r["match_percentage"]) for r in result["roles"]] == [
+        ("frontend developer", round(125 / 175 * 100, 2)),
+        ("backend developer", round(120 / 210 * 100, 2)),
+    ]
+    assert result["best_match"] == {"role": "frontend developer", "match_percentage": round(125 / 175 * 100, 2)}
+    assert result["roles"][1]["missing_important_skills"] == ["Docker", "SQL"]
+    assert result["roles"][0]["missing_important_skills"] == ["CSS"]
+    # Each missed by one role; ties by demand, then first-seen column
+    assert [s["name"] for s in result["common_missing_skills"]] == ["Docker", "CSS", "SQL"]
+    assert [s["name"] for s in index.analyze_all(CV, limit=1)["common_missing_skills"]] == ["Docker"]
+    for role in result["roles"]:
+        assert role["match_percentage"] == index.analyze(CV, role["role"])["match_percentage"]
+
+
+def test_match_scores_against_a_brute_force(tmp_path):
+    rng = random.Random(7)
+    store = SkillDemandStore(path=str(tmp_path / "random.sqlite3"))
+    names = [f"Skill {i}" for i in range(40)]
+    for role in range(12):
+        store.record_jobs(f"role {role}", [
+            {"url": f"https://jobs/{role}/{i}", "skills": rng.sample(names, rng.randint(0, 8))}
+            for i in range(rng.randint(1, 30))
+        ])
+    vectors = build_role_vectors(store)
+    cv = rng.sample(names, 10)
+
+    scores = vectors.match_percentages(vectors.skill_vector(cv))
+
+    for row, role in enumerate(vectors.roles):
+        demand = store.demand(role)
+        total = sum(demand.counts.values())
+        covered = sum(count for name, count in demand.counts.items() if name in cv)
+        assert scores[row] == pytest.approx(covered / total * 100 if total else 100.0)
+    store.close()
+
+
+def test_vectors_are_built_on_start_and_refreshed_when_stale(store):
+    index = GapAnalysisIndex(store=store, refresh_interval=3600)
+    assert index.vectors.roles == []
+    assert index.analyze_all(CV) == {
+        "analyzed_roles": 0, "roles": [], "common_missing_skills": [],
+        "average_match_percentage": 0.0, "best_match": None,
+    }
+
+    index.start()
+    try:
+        assert index.vectors.roles == ["backend developer", "frontend developer"]
+        assert index.refresh_stale() is False
+
+        store.record_jobs("Data Engineer", _jobs("data", 2, {"SQL": 2}))
+        assert index.refresh_stale() is True
+        assert index.analyze(["sql"], "data engineer")["match_percentage"] == 100.0
+    finally:
+        index.stop()
@@ -0,0 +1,228 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from job_index import JobIndex
+from taxonomy import Taxonomy
+
+T0 = 1_800_000_000.0
+
+TAXONOMY = Taxonomy([
+    {"id": 1, "name": "Python"},
+    {"id": 2, "name": "JavaScript", "aliases": ["JS"]},
+    {"id": 3, "name": "Docker"},
+    {"id": 4, "name": "SQL"},
+    {"name": "Kubernetes", "aliases": ["K8s"]},
+])
+
+
+class TaxonomySource:
+    """Stands in for the taxonomy registry; tests swap `taxonomy` to simulate a reload."""
+
+    def __init__(self, taxonomy=TAXONOMY):
+        self.taxonomy = taxonomy
+
+    def __call__(self):
+        return self.taxonomy
+
+
+def _index(tmp_path=None, **kwargs):
+    kwargs.setdefault("ttl", 0)
+    kwargs.setdefault("max_postings", 0)
+    path = str(tmp_path / "job_index.npz") if tmp_path is not None else None
+    return JobIndex(path=path, taxonomy=kwargs.pop("taxonomy", TaxonomySource()), **kwargs)
+
+
+def _job(n, *skills, **fields):
+    return {"url": f"https://jobs/{n}", "title": f"Job {n}", "skills": list(skills), **fields}
+
+
+def _urls(results):
+    return [result["url"] for result in results]
+
+
+def test_add_and_search():
+    index = _index()
+    added = index.add_jobs([
+        _job(1, "Python", "Docker"),
+        _job(2, {"name": "Python", "type": "technical"}, "SQL", "Python"),
+        _job(3, "JavaScript"),
+        {"url": "https://jobs/4", "skills": None},   # not enriched yet
+    ], when=T0)
+
+    assert added == 3
+    assert len(index) == 3
+    results = index.search(["python", "docker"])
+    assert _urls(results) == ["https://jobs/1", "https://jobs/2"]
+    assert results[0]["matched_skills"] == ["Python", "Docker"]
+    assert results[1]["skills"] == ["Python", "SQL"]
+    assert (results[1]["missing_skills"], results[1]["coverage"]) == (["SQL"], 50.0)
+    assert index.search(["Rust"]) == []
+    assert index.search(["Python"], top_n=0) == []
+    with pytest.raises(ValueError):
+        index.search(["Python"], scoring="cosine")
+
+
+def test_seen_postings_are_not_added_twice():
+    index = _index(ttl=100)
+    index.add_jobs([_job(1, "Python"), _job(2, "Python")], when=T0)
+
+    assert index.add_jobs([_job(1, "Python"), _job(3, "SQL"), _job(3, "SQL")], when=T0 + 60) == 1
+    assert len(index) == 3
+    # Re-seeing job 1 refreshed it; job 2 expires
+    assert index.prune(when=T0 + 120) == 1
+    assert _urls(index.search(["Python"])) == ["https://jobs/1"]
+
+
+def test_role_membership():
+    index = _index()
+    index.add_jobs([_job(1, "Python"), _job(2, "Python", "SQL")], role="Backend Developer", when=T0)
+    index.add_jobs([_job(2, "Python", "SQL"), _job(3, "Python")], role="data engineer", when=T0)
+
+    assert _urls(index.search(["Python"], role="backend  developer")) == ["https://jobs/1", "https://jobs/2"]
+    assert sorted(_urls(index.search(["Python"], role="Data Engineer"))) == ["https://jobs/2", "https://jobs/3"]
+    assert index.search(["Python"], role="designer") == []
+    assert index.stats["roles"] == 2
+
+
+def test_prune_renumbers_postings():
+    index = _index(ttl=100)
+    index.add_jobs([_job(1, "Python"), _job(2, "SQL")], role="old", when=T0)
+    index.add_jobs([_job(3, "Python", "SQL"), _job(4, "Docker")], role="new", when=T0 + 50)
+    index.add_jobs([_job(1, "Python")], role="new", when=T0 + 50)
+
+    assert index.prune(when=T0 + 120) == 1   # job 2
+
+    assert len(index) == 3
+    assert sorted(_urls(index.search(["Python", "SQL", "Docker"], top_n=10))) == [
+        "https://jobs/1", "https://jobs/3", "https://jobs/4"]
+    assert _urls(index.search(["SQL"])) == ["https://jobs/3"]
+    assert _urls(index.search(["Python"], role="old")) == ["https://jobs/1"]
+    assert sorted(_urls(index.search(["Python", "Docker"], role="new"))) == [
+        "https://jobs/1", "https://jobs/3", "https://jobs/4"]
+    # An evicted posting comes back as new
+    assert index.add_jobs([_job(2, "SQL")], when=T0 + 130) == 1
+    assert sorted(_urls(index.search(["SQL"]))) == ["https://jobs/2", "https://jobs/3"]
+
+
+def test_capacity_makes_room_before_adding():
+    index = _index(max_postings=3)
+    index.add_jobs([_job(1, "Python"), _job(2, "Python"), _job(3, "Python")], when=T0)
+    index.add_jobs([_job(3, "Python")], when=T0 + 1)
+
+    assert index.add_jobs([_job(4, "Python"), _job(5, "Python")], when=T0 + 2) == 2
+    # The least recently seen postings made room; the scrape kept all of its own
+    assert sorted(_urls(index.search(["Python"], top_n=10))) == [
+        "https://jobs/3", "https://jobs/4", "https://jobs/5"]
+
+    assert index.add_jobs([_job(n, "SQL") for n in range(10, 15)], when=T0 + 3) == 3
+    assert sorted(_urls(index.search(["Python", "SQL"], top_n=10))) == [
+        "https://jobs/10", "https://jobs/11", "https://jobs/12"]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = _index(tmp_path)
+    index.add_jobs([_job(n, *random.Random(n).sample(["Python", "SQL", "Docker", "JS", "Go"], 3))
+                    for n in range(50)], role="backend", when=T0)
+    index.add_jobs([_job(50, "Go")], role="go", when=T0)
+    expected = index.search(["Python", "Go"], top_n=100)
+
+    assert index.save() is True
+    assert index.save() is False   # nothing changed since
+
+    loaded = _index(tmp_path)
+    assert loaded.load() == 51
+    assert loaded.search(["Python", "Go"], top_n=100) == expected
+    assert _urls(loaded.search(["Go"], role="go")) == ["https://jobs/50"]
+    assert loaded.stats["skills"] == index.stats["skills"]
+    assert loaded.stats["taxonomy"] == TAXONOMY.version
+    # The loaded arrays keep growing
+    assert loaded.add_jobs([_job(51, "Go")], role="go", when=T0) == 1
+    assert loaded.add_jobs([_job(0, "Go")], when=T0) == 0
+    assert _urls(loaded.search(["Go"], role="go")) == ["https://jobs/50", "https://jobs/51"]
+
+
+@pytest.mark.parametrize("corrupt", ["empty", "truncated", "out_of_range", "length_mismatch"])
+def test_bad_snapshot_is_ignored(tmp_path, corrupt):
+    path = tmp_path / "job_index.npz"
+    saved = _index(tmp_path)
+    saved.add_jobs([_job(1, "Python"), _job(2, "SQL")], role="r", when=T0)
+    saved.save()
+    if corrupt == "empty":
+        path.write_bytes(b"")
+    elif corrupt == "truncated":
+        path.write_bytes(path.read_bytes()[:100])
+    else:
+        with np.load(path) as snapshot:
+            arrays = dict(snapshot)
+        if corrupt == "out_of_range":
+            arrays["postings"] = arrays["postings"] + 5
+        else:
+            arrays["lengths"] = arrays["lengths"][:1]
+        with open(path, "wb") as fh:
+            np.savez(fh, **arrays)
+
+    index = _index(tmp_path)
+    index.add_jobs([_job(9, "Docker")], when=T0)
+
+    assert index.load() == 0
+    assert _urls(index.search(["Docker"])) == ["https://jobs/9"]
+
+
+def test_terms_are_keyed_by_taxonomy_id():
+    source = TaxonomySource()
+    index = _index(taxonomy=source)
+    index.add_jobs([_job(1, "JS"), _job(2, "Javascript"), _job(3, "K8s"), _job(4, "Vue.js")], when=T0)
+
+    assert _urls(index.search(["JavaScript"])) == ["https://jobs/1", "https://jobs/2"]
+    assert _urls(index.search(["kubernetes"])) == ["https://jobs/3"]
+    assert _urls(index.search(["VueJS"])) == ["https://jobs/4"]
+    assert index.search(["JavaScript"])[0]["matched_skills"] == ["JS"]
+
+    # A new taxonomy makes Vue.js an alias of a skill: the terms are re-keyed
+    source.taxonomy = Taxonomy(TAXONOMY.to_rows() + [{"id": 9, "name": "Vue", "aliases": ["Vue.js"]}])
+    assert _urls(index.search(["Vue"])) == ["https://jobs/4"]
+    assert index.stats["taxonomy"] == source.taxonomy.version
+
+
+def _brute_force(jobs, skills, k1, b, scoring):
+    # Straight from the formula, one posting at a time
+    keys = {skill.lower() for skill in skills}
+    docs = [{skill.lower() for skill in job["skills"]} for job in jobs]
+    n = len(docs)
+    average_length = sum(map(len, docs)) / n
+    scores = []
+    for doc in docs:
+        score = 0.0
+        for term in doc & keys:
+            df = sum(term in other for other in docs)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            if scoring == "bm25":
+                score += idf * (k1 + 1) / (1 + k1 * (1 - b + b * len(doc) / average_length))
+            else:
+                score += idf
+        scores.append(score)
+    return scores
+
+
+@pytest.mark.parametrize("scoring", ["bm25", "overlap"])
+def test_ranking_matches_a_brute_force(scoring):
+    rng = random.Random(42)
+    names = [f"Skill{i}" for i in range(30)]
+    jobs = [_job(n, *rng.sample(names, rng.randint(1, 10))) for n in range(400)]
+    index = _index(k1=1.2, b=0.75)
+    index.add_jobs(jobs, when=T0)
+
+    for _ in range(20):
+        query = rng.sample(names, rng.randint(1, 6))
+        expected = _brute_force(jobs, query, 1.2, 0.75, scoring)
+        best = sorted((score for score in expected if score > 0), reverse=True)[:15]
+
+        results = index.search(query, top_n=15, scoring=scoring)
+
+        # Same top scores, each on the right posting (tied postings may swap)
+        assert [result["score"] for result in results] == pytest.approx(best, abs=1e-4)
+        for result in results:
+            assert result["score"] == pytest.approx(expected[int(result["url"].rsplit("/", 1)[1])], abs=1e-4)
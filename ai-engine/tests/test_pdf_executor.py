@@ -0,0 +1,67 @@
+import asyncio
+import io
+
+import pytest
+
+import pool_tasks
+from cv_pipeline import extract_cv_text
+from pdf_executor import PdfParseTimeout, PdfParsingExecutor
+from pdf_sandbox import LIMIT_WALL_CLOCK
+
+
+@pytest.fixture
+def executor():
+    ex = PdfParsingExecutor(workers=2, timeout=10)
+    ex.start()
+    yield ex
+    ex.shutdown()
+
+
+def test_extract_text_in_pool_matches_in_process(executor, cv_pdf):
+    text = asyncio.run(executor.extract_text(cv_pdf))
+
+    assert "Senior Backend Developer" in text
+    assert text == extract_cv_text(cv_pdf)
+
+
+def test_in_process_mode_reads_streams(cv_pdf):
+    ex = PdfParsingExecutor(workers=0)
+
+    assert ex.in_process
+    assert asyncio.run(ex.extract_text(io.BytesIO(cv_pdf))) == extract_cv_text(cv_pdf)
+
+
+def test_timeout_resets_the_pool(executor):
+    pool = executor._get_pool()
+
+    with pytest.raises(PdfParseTimeout):
+        asyncio.run(executor._run_in_pool([(pool_tasks.sleep_for, 30)], timeout=0.5))
+
+    assert executor.limit_hits == {LIMIT_WALL_CLOCK: 1}
+    assert executor._pool is None
+    # The next task gets a fresh pool
+    assert asyncio.run(executor._run_in_pool([(pool_tasks.sleep_for, 0)], timeout=10)) == [0]
+    assert executor._pool is not pool
+
+
+def test_task_sharing_a_reset_pool_is_retried(executor):
+    async def run():
+        stuck = executor._run_in_pool([(pool_tasks.sleep_for, 30)], timeout=1)
+        bystander = executor._run_in_pool([(pool_tasks.sleep_for, 1.5)], timeout=8)
+        return await asyncio.gather(stuck, bystander, return_exceptions=True)
+
+    stuck, bystander = asyncio.run(run())
+
+    assert isinstance(stuck, PdfParseTimeout)
+    assert bystander == [1.5]
+    # Only the task that timed out counts a limit hit
+    assert executor.limit_hits == {LIMIT_WALL_CLOCK: 1}
+
+
+def test_in_process_timeout_counts_a_limit_hit():
+    ex = PdfParsingExecutor(workers=0)
+
+    with pytest.raises(PdfParseTimeout):
+        asyncio.run(ex._run(pool_tasks.sleep_for, pool_tasks.sleep_for, 2, timeout=0.2))
+
+    assert ex.limit_hits == {LIMIT_WALL_CLOCK: 1}
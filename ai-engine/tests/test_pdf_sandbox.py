@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+import pdf_sandbox
+import pool_tasks
+from pdf_executor import PdfParsingExecutor
+from pdf_sandbox import (
+    LIMIT_CPU, LIMIT_MEMORY, LIMIT_WORKER_CRASH, PdfResourceLimitExceeded, _CpuTimeExceeded, run_limited,
+)
+
+needs_rlimits = pytest.mark.skipif(not pdf_sandbox.RESOURCE_LIMITS_AVAILABLE, reason="no resource module")
+
+
+def _raise(exc):
+    raise exc
+
+
+@pytest.fixture
+def no_cpu_limit(monkeypatch):
+    # Don't arm RLIMIT_CPU on the test process itself
+    monkeypatch.setattr(pdf_sandbox, "PDF_CPU_LIMIT", 0)
+
+
+def test_run_limited_passes_results_through(no_cpu_limit):
+    assert run_limited(pool_tasks.sleep_for, 0) == 0
+    with pytest.raises(KeyError):
+        run_limited(_raise, KeyError("not a limit"))
+
+
+@pytest.mark.parametrize("exc, limit", [(MemoryError(), LIMIT_MEMORY), (_CpuTimeExceeded(), LIMIT_CPU)])
+def test_run_limited_translates_limit_hits(no_cpu_limit, exc, limit):
+    with pytest.raises(PdfResourceLimitExceeded) as info:
+        run_limited(_raise, exc)
+
+    assert info.value.limit == limit
+    assert str(info.value) == f"PDF parsing exceeded the {limit} limit"
+
+
+def _run_in_worker(monkeypatch, env, call):
+    # Spawned workers re-read the limits from the environment
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    executor = PdfParsingExecutor(workers=1, timeout=30)
+    try:
+        with pytest.raises(PdfResourceLimitExceeded) as info:
+            asyncio.run(executor._run_in_pool([call], timeout=30))
+        # The pool still serves the next task
+        assert asyncio.run(executor._run_in_pool([(pool_tasks.sleep_for, 0)], timeout=30)) == [0]
+    finally:
+        executor.shutdown()
+    return info.value.limit, executor.limit_hits
+
+
+@needs_rlimits
+def test_memory_limit_in_worker(monkeypatch):
+    limit, hits = _run_in_worker(monkeypatch, {"PDF_MEMORY_LIMIT_MB": "256"}, (pool_tasks.allocate, 512))
+
+    assert limit == LIMIT_MEMORY
+    assert hits == {LIMIT_MEMORY: 1}
+
+
+@needs_rlimits
+def test_cpu_limit_in_worker(monkeypatch):
+    limit, hits = _run_in_worker(monkeypatch, {"PDF_CPU_LIMIT": "1"}, (pool_tasks.spin,))
+
+    assert limit == LIMIT_CPU
+    assert hits == {LIMIT_CPU: 1}
+
+
+def test_dead_worker_is_one_worker_crash(monkeypatch):
+    limit, hits = _run_in_worker(monkeypatch, {}, (pool_tasks.die,))
+
+    assert limit == LIMIT_WORKER_CRASH
+    assert hits == {LIMIT_WORKER_CRASH: 1}
@@ -0,0 +1,83 @@
+import math
+
+import pytest
+
+from skill_cooccurrence import RelatedSkillsIndex, build_role_cooccurrence
+from skill_demand import SkillDemandStore
+from skill_stats import SCIPY_AVAILABLE
+
+pytestmark = pytest.mark.skipif(not SCIPY_AVAILABLE, reason="pair counts need scipy")
+
+
+def _jobs(*groups):
+    jobs = []
+    for copies, skills in groups:
+        jobs += [{"url": f"https://jobs/{len(jobs) + i}", "skills": list(skills)} for i in range(copies)]
+    return jobs
+
+
+# N = 8 jobs: n(Python) = 6, n(Django) = 4, n(SQL) = 4, n(Python, Django) = 4, n(Python, SQL) = 2
+JOBS = _jobs((4, ["Python", "Django"]), (2, ["Python", "SQL"]), (2, ["SQL"]))
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SkillDemandStore(path=str(tmp_path / "demand.sqlite3"))
+    store.record_jobs("Backend Developer", JOBS)
+    yield store
+    store.close()
+
+
+def _scores(partners):
+    return [(p.name, p.jobs, p.confidence, p.lift, p.pmi) for p in partners]
+
+
+def test_lift_and_pmi_by_hand(store):
+    table = build_role_cooccurrence(store, "backend developer", min_jobs=1)
+
+    assert table.total_jobs == 8
+    assert _scores(table.related["Django"]) == [
+        ("Python", 4, 1.0, round(4 * 8 / (4 * 6), 4), round(math.log2(4 / 3), 4)),
+    ]
+    # Best lift first: Django (4/3) is over-represented, SQL (2/3) under
+    assert _scores(table.related["Python"]) == [
+        ("Django", 4, round(4 / 6, 4), round(4 / 3, 4), round(math.log2(4 / 3), 4)),
+        ("SQL", 2, round(2 / 6, 4), round(2 * 8 / (6 * 4), 4), round(math.log2(2 / 3), 4)),
+    ]
+    assert _scores(table.related["SQL"]) == [
+        ("Python", 2, 0.5, round(2 / 3, 4), round(math.log2(2 / 3), 4)),
+    ]
+
+
+def test_support_threshold_and_top_k(store):
+    table = build_role_cooccurrence(store, "backend developer", top_k=1, min_jobs=3)
+
+    assert [p.name for p in table.related["Python"]] == ["Django"]
+    assert "SQL" not in table.related
+
+
+def test_ties_prefer_more_shared_jobs_then_name(tmp_path):
+    store = SkillDemandStore(path=str(tmp_path / "demand.sqlite3"))
+    # Every pair with A has lift 1; B shares 2 jobs with A, C and D one each
+    store.record_jobs("r", _jobs((2, ["A", "B"]), (1, ["A", "D"]), (1, ["A", "C"])))
+
+    table = build_role_cooccurrence(store, "r", min_jobs=1)
+
+    assert [(p.name, p.jobs, p.lift) for p in table.related["A"]] == [("B", 2, 1.0), ("C", 1, 1.0), ("D", 1, 1.0)]
+    store.close()
+
+
+def test_index_lookups_and_stale_refresh(store):
+    index = RelatedSkillsIndex(store=store, min_jobs=1)
+
+    assert index.related("backend developer", "python") is None
+    assert index.refresh_stale() == 1
+    assert index.refresh_stale() == 0
+
+    assert [p.name for p in index.related("Backend  Developer", "python")] == ["Django", "SQL"]
+    assert [p.name for p in index.related("backend developer", "PYTHON", k=1)] == ["Django"]
+    assert index.related("backend developer", "Rust") == []
+
+    store.record_jobs("backend developer", [{"url": "https://jobs/new", "skills": ["SQL", "Rust"]}])
+    assert index.refresh_stale() == 1
+    assert [p.name for p in index.related("backend developer", "Rust")] == ["SQL"]
@@ -0,0 +1,123 @@
+import datetime
+
+import pytest
+
+from scraper import calculate_skill_frequencies
+from skill_demand import SkillDemand, SkillDemandStore, job_key, normalize_role, time_bucket
+from skill_stats import SCIPY_AVAILABLE
+
+DAY = 24 * 3600
+# Thursday 2026-10-15 12:00 UTC
+T0 = datetime.datetime(2026, 10, 15, 12, tzinfo=datetime.timezone.utc).timestamp()
+
+BATCH_A = [
+    {"url": "https://jobs/1", "source": "remotive", "skills": ["Python", "SQL", "Python"]},
+    {"url": "https://jobs/2", "source": "remotive", "skills": [{"name": "Teamwork", "type": "soft"}, "Python"]},
+    {"url": "https://jobs/3", "source": "adzuna", "skills": ["Docker"]},
+]
+BATCH_B = [
+    {"url": "https://jobs/4", "source": "adzuna", "skills": ["Python", "Docker"]},
+    {"title": "Data Engineer", "company": "Acme", "source": "wuzzuf", "skills": ["SQL", "Spark"]},
+]
+
+
+def test_merge_is_exact():
+    a, b = SkillDemand.from_jobs(BATCH_A), SkillDemand.from_jobs(BATCH_B)
+    merged = a + b
+
+    assert merged == SkillDemand.from_jobs(BATCH_A + BATCH_B)
+    assert merged == b + a
+    assert merged.counts == {"Python": 3, "SQL": 2, "Teamwork": 1, "Docker": 2, "Spark": 1}
+    assert merged.types["Teamwork"] == "soft"
+    assert merged.statistics().to_dict() == calculate_skill_frequencies(BATCH_A + BATCH_B)
+    # Operands are left alone
+    assert a == SkillDemand.from_jobs(BATCH_A)
+
+
+def test_merge_is_associative_with_an_identity():
+    parts = [SkillDemand.from_jobs([job]) for job in BATCH_A + BATCH_B]
+
+    left = ((parts[0] + parts[1]) + parts[2]) + (parts[3] + parts[4])
+    right = parts[0] + (parts[1] + (parts[2] + (parts[3] + parts[4])))
+
+    assert left == right == SkillDemand.from_jobs(BATCH_A + BATCH_B)
+    assert SkillDemand() + left == left
+
+
+def test_time_buckets():
+    assert time_bucket(T0, "day") == "2026-10-15"
+    assert time_bucket(T0, "week") == "2026-W42"
+    assert time_bucket(T0, "month") == "2026-10"
+    with pytest.raises(ValueError):
+        time_bucket(T0, "year")
+
+
+def test_job_identity():
+    assert job_key({"url": "u", "title": "A"}) == job_key({"url": "u", "title": "B"})
+    assert job_key({"title": " Dev ", "company": "Acme"}) == job_key({"title": "dev", "company": "ACME"})
+    assert job_key({"title": "Dev", "company": "Acme", "source": "x"}) != job_key({"title": "Dev", "company": "Acme"})
+    assert normalize_role("  Python   Developer ") == "python developer"
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SkillDemandStore(path=str(tmp_path / "demand.sqlite3"), granularity="day", seen_ttl=30 * DAY)
+    yield store
+    store.close()
+
+
+def test_record_jobs_skips_seen_postings(store):
+    assert store.record_jobs("Python Developer", BATCH_A, when=T0) == 3
+    assert store.record_jobs("python developer", BATCH_A + BATCH_B + [{"title": "no skills"}], when=T0) == 2
+    assert store.record_jobs("python developer", BATCH_A + BATCH_B, when=T0 + DAY) == 0
+
+    assert store.demand("python developer") == SkillDemand.from_jobs(BATCH_A + BATCH_B)
+    assert store.revisions() == {"python developer": 2}
+    # Another role keeps its own seen set
+    assert store.record_jobs("data engineer", BATCH_B, when=T0) == 2
+
+
+def test_seen_postings_expire(store):
+    store.record_jobs("dev", BATCH_A, when=T0)
+
+    assert store.record_jobs("dev", BATCH_A, when=T0 + 29 * DAY) == 0
+    assert store.record_jobs("dev", BATCH_A, when=T0 + 31 * DAY) == 3
+    assert store.demand("dev").total_jobs == 6
+
+
+def test_demand_slices(store):
+    store.record_jobs("dev", BATCH_A, when=T0)
+    store.record_jobs("dev", BATCH_B, when=T0 + 2 * DAY)
+
+    assert store.demand("dev", sources=["remotive"]) == SkillDemand.from_jobs(BATCH_A[:2])
+    assert store.demand("dev", sources=["adzuna"]) == SkillDemand.from_jobs([BATCH_A[2], BATCH_B[0]])
+    assert store.demand("dev", until="2026-10-16") == SkillDemand.from_jobs(BATCH_A)
+    assert store.demand("dev", since="2026-10-16") == SkillDemand.from_jobs(BATCH_B)
+    assert store.demand("dev", since="2026-10-18") == SkillDemand()
+    assert store.demand("dev").types["Teamwork"] == "soft"
+    assert store.roles() == [
+        {"role": "dev", "total_jobs": 5, "first_bucket": "2026-10-15", "last_bucket": "2026-10-17"},
+    ]
+
+
+@pytest.mark.skipif(not SCIPY_AVAILABLE, reason="scipy not installed")
+def test_pair_counts_merge_across_cells(store):
+    store.record_jobs("dev", BATCH_A, when=T0)
+    store.record_jobs("dev", BATCH_B, when=T0 + DAY)
+
+    assert sorted(store.pair_counts("dev")) == [
+        ("Docker", "Python", 1), ("Python", "SQL", 1), ("Python", "Teamwork", 1), ("SQL", "Spark", 1),
+    ]
+    assert store.pair_counts("dev", sources=["wuzzuf"]) == [("SQL", "Spark", 1)]
+
+
+def test_store_persists(tmp_path):
+    path = str(tmp_path / "demand.sqlite3")
+    first = SkillDemandStore(path=path)
+    first.record_jobs("dev", BATCH_A, when=T0)
+    first.close()
+
+    second = SkillDemandStore(path=path)
+    assert second.record_jobs("dev", BATCH_A, when=T0) == 0
+    assert second.demand("dev") == SkillDemand.from_jobs(BATCH_A)
+    second.close()
@@ -0,0 +1,144 @@
+import random
+
+import numpy as np
+import pytest
+
+from scraper import calculate_skill_frequencies
+from skill_stats import (
+    SCIPY_AVAILABLE, SkillVocabulary, cooccurrence_counts, encode_jobs, skill_statistics, statistics_from_counts,
+)
+
+
+def _baseline_importance(percentage):
+    if percentage > 70:
+        return 'essential'
+    elif percentage >= 40:
+        return 'important'
+    else:
+        return 'nice_to_have'
+
+
+def _baseline_frequencies(jobs):
+    # calculate_skill_frequencies as it was before the vectorised engine
+    if not jobs:
+        return {}
+    total_jobs = len(jobs)
+    skill_counts = {}
+    for job in jobs:
+        if 'skills' in job and isinstance(job['skills'], list):
+            for skill in job['skills']:
+                skill_name = skill['name'] if isinstance(skill, dict) else skill
+                skill_type = skill['type'] if isinstance(skill, dict) and 'type' in skill else 'technical'
+                if skill_name not in skill_counts:
+                    skill_counts[skill_name] = {'count': 0, 'type': skill_type}
+                skill_counts[skill_name]['count'] += 1
+    skill_stats = {}
+    for skill_name, data in skill_counts.items():
+        percentage = (data['count'] / total_jobs) * 100
+        skill_stats[skill_name] = {
+            'count': data['count'],
+            'percentage': round(percentage, 2),
+            'importance': _baseline_importance(percentage),
+            'type': data['type'],
+        }
+    return dict(sorted(skill_stats.items(), key=lambda x: x[1]['percentage'], reverse=True))
+
+
+def _dedupe(job):
+    # The one documented difference: a skill listed twice in a job counts once
+    if not isinstance(job.get('skills'), list):
+        return job
+    seen = set()
+    skills = []
+    for skill in job['skills']:
+        name = skill['name'] if isinstance(skill, dict) else skill
+        if name not in seen:
+            seen.add(name)
+            skills.append(skill)
+    return dict(job, skills=skills)
+
+
+def _random_jobs(rng, n_jobs):
+    names = [f"Skill {i}" for i in range(60)]
+    jobs = []
+    for _ in range(n_jobs):
+        if rng.random() < 0.05:
+            jobs.append({"title": "no skills"})
+            continue
+        skills = []
+        for name in rng.choices(names, weights=range(60, 0, -1), k=rng.randint(0, 12)):
+            roll = rng.random()
+            if roll < 0.4:
+                skills.append(name)
+            elif roll < 0.5:
+                skills.append({"name": name})
+            else:
+                skills.append({"name": name, "type": rng.choice(["technical", "soft"])})
+        jobs.append({"title": "job", "skills": skills})
+    return jobs
+
+
+@pytest.mark.parametrize("seed, n_jobs", [(0, 1), (1, 7), (2, 250), (3, 3000)])
+def test_parity_with_baseline(seed, n_jobs):
+    jobs = _random_jobs(random.Random(seed), n_jobs)
+
+    result = calculate_skill_frequencies(jobs)
+    expected = _baseline_frequencies([_dedupe(job) for job in jobs])
+
+    assert result == expected
+    assert list(result) == list(expected)   # same order, ties in first-seen order
+
+
+def test_repeated_skill_counts_once_per_job():
+    jobs = [{"skills": ["Python", "Python", "SQL"]}, {"skills": ["Python"]}]
+
+    assert _baseline_frequencies(jobs)["Python"]["count"] == 3
+    assert calculate_skill_frequencies(jobs)["Python"] == {
+        "count": 2, "percentage": 100.0, "importance": "essential", "type": "technical",
+    }
+
+
+def test_empty_input():
+    assert calculate_skill_frequencies([]) == {}
+    assert skill_statistics(encode_jobs([{"title": "x"}])).to_dict() == {}
+
+
+def test_incidence_layout():
+    incidence = encode_jobs([
+        {"skills": ["B", "A", "B"]},
+        {},
+        {"skills": [{"name": "A", "type": "soft"}, "C"]},
+    ])
+
+    assert incidence.vocabulary.names == ["B", "A", "C"]
+    assert incidence.indptr.tolist() == [0, 2, 2, 4]
+    assert incidence.indices.tolist() == [0, 1, 1, 2]
+    assert incidence.skill_counts().tolist() == [1, 2, 1]
+    assert incidence.job_rows().tolist() == [0, 0, 2, 2]
+
+
+def test_shared_vocabulary_and_top_k():
+    vocabulary = SkillVocabulary()
+    encode_jobs([{"skills": ["Go", "Rust"]}], vocabulary)
+    stats = skill_statistics(encode_jobs([{"skills": ["Rust"]}, {"skills": ["Rust", "SQL"]}], vocabulary))
+
+    # Go is in the vocabulary but not in these jobs
+    assert list(stats.to_dict()) == ["Rust", "SQL"]
+    assert list(stats.to_dict(top_k=1)) == ["Rust"]
+    assert stats.counts.tolist() == [0, 2, 1]
+
+
+def test_statistics_from_counts_buckets():
+    stats = statistics_from_counts(["a", "b", "c", "d"], ["technical"] * 4, np.array([71, 70, 40, 39]), 100)
+
+    assert stats.importance.tolist() == ["essential", "important", "important", "nice_to_have"]
+    assert stats.top().tolist() == [0, 1, 2, 3]
+
+
+@pytest.mark.skipif(not SCIPY_AVAILABLE, reason="scipy not installed")
+def test_cooccurrence_counts():
+    incidence = encode_jobs([{"skills": ["A", "B", "C"]}, {"skills": ["A", "B"]}, {"skills": ["C"]}])
+
+    pairs = sorted(zip(*(array.tolist() for array in cooccurrence_counts(incidence))))
+
+    assert pairs == [(0, 1, 2), (0, 2, 1), (1, 2, 1)]
@@ -0,0 +1,140 @@
+import json
+
+import pytest
+
+from taxonomy import Taxonomy, TaxonomyError, TaxonomyRegistry, load_taxonomy_file
+
+ROWS = [
+    {"id": 1, "name": "JavaScript", "type": "technical", "aliases": ["JS", "ECMAScript"]},
+    {"id": 2, "name": "Python"},
+    {"id": 3, "name": "Teamwork", "type": "soft", "aliases": ["Python", "Team Player"]},
+]
+
+
+def test_rows_are_normalised():
+    taxonomy = Taxonomy(ROWS + [{"name": " Python ", "type": "soft"}])
+
+    assert taxonomy.skills == ("JavaScript", "Python", "Teamwork")
+    assert taxonomy.types["Python"] == "technical"       # default type, first duplicate wins
+    assert taxonomy.ids == {"JavaScript": 1, "Python": 2, "Teamwork": 3}
+    # An alias never shadows a skill name
+    assert taxonomy.aliases == {"JS": "JavaScript", "ECMAScript": "JavaScript", "Team Player": "Teamwork"}
+    assert taxonomy.canonical("JS") == "JavaScript"
+    assert taxonomy.canonical("Python") == "Python"
+    assert taxonomy.canonical("Go") is None
+    assert taxonomy.technical == ["JavaScript", "Python"]
+    assert taxonomy.soft == ["Teamwork"]
+
+
+@pytest.mark.parametrize("row", [
+    "Python",
+    {"id": 1},
+    {"name": 42},
+    {"name": "Python", "type": "hard"},
+    {"name": "Python", "id": "abc"},
+    {"name": "Python", "aliases": "py"},
+    {"name": "Python", "aliases": ["py", 3]},
+])
+def test_malformed_rows_raise(row):
+    with pytest.raises(TaxonomyError):
+        Taxonomy([row])
+
+
+def test_version_is_a_content_fingerprint():
+    version = Taxonomy(ROWS).version
+
+    assert Taxonomy(list(reversed(ROWS))).version == version
+    assert Taxonomy(Taxonomy(ROWS).to_rows()).version == version
+    assert Taxonomy(ROWS, revision="r2", source="upload").version == version
+    assert Taxonomy(ROWS[:2]).version != version
+    assert Taxonomy([dict(ROWS[0], id=9)] + ROWS[1:]).version != version
+
+
+def test_load_taxonomy_file(tmp_path):
+    path = tmp_path / "skills.json"
+    path.write_text(json.dumps({"revision": 7, "skills": ROWS}))
+    taxonomy = load_taxonomy_file(str(path))
+    assert (taxonomy.revision, taxonomy.source, len(taxonomy)) == ("7", str(path), 3)
+
+    path.write_text(json.dumps(ROWS))
+    assert load_taxonomy_file(str(path)).version == taxonomy.version
+
+    for broken in ("{not json", json.dumps({"skills": {"name": "Python"}})):
+        path.write_text(broken)
+        with pytest.raises(TaxonomyError):
+            load_taxonomy_file(str(path))
+
+
+class CountingCompiler:
+    def __init__(self):
+        self.compiled = []
+
+    def __call__(self, taxonomy):
+        self.compiled.append(taxonomy.version)
+        return {"exact": frozenset(taxonomy.terms)}
+
+
+@pytest.fixture
+def builtin():
+    return Taxonomy.from_lists(["Python", "Docker"], ["Teamwork"])
+
+
+def _registry(builtin, path, compiler=None):
+    return TaxonomyRegistry(builtin, compiler or CountingCompiler(), path=str(path), watch_interval=0)
+
+
+def test_builtin_used_without_a_file(builtin, tmp_path):
+    registry = _registry(builtin, tmp_path / "skills.json")
+
+    assert registry.current.taxonomy is builtin
+    assert registry.current.generation == 1
+    assert registry.current.matchers["exact"] == {"Python", "Docker", "Teamwork"}
+
+
+def test_broken_file_falls_back_to_builtin(builtin, tmp_path):
+    path = tmp_path / "skills.json"
+    path.write_text(json.dumps([{"name": "Python", "type": "hard"}]))
+
+    assert _registry(builtin, path).current.taxonomy is builtin
+
+
+def test_reload_swaps_the_whole_snapshot(builtin, tmp_path):
+    path = tmp_path / "skills.json"
+    compiler = CountingCompiler()
+    registry = _registry(builtin, path, compiler)
+    old = registry.current
+
+    new = registry.reload(ROWS, revision="r1").result()
+
+    assert registry.current is new
+    assert new.generation == old.generation + 1
+    assert new.matchers["exact"] == set(new.taxonomy.terms)
+    # The old snapshot is untouched, for requests still holding it
+    assert old.taxonomy is builtin and "JS" not in old.matchers["exact"]
+    # Persisted for workers and restarts
+    assert load_taxonomy_file(str(path)).version == new.taxonomy.version
+    # Reloading the same content doesn't recompile
+    assert registry.reload().result() is new
+    assert compiler.compiled == [builtin.version, new.taxonomy.version]
+
+
+def test_malformed_reload_keeps_the_current_taxonomy(builtin, tmp_path):
+    registry = _registry(builtin, tmp_path / "skills.json")
+    current = registry.current
+
+    with pytest.raises(TaxonomyError):
+        registry.reload([{"name": "Python", "aliases": "py"}]).result()
+
+    assert registry.current is current
+    assert not (tmp_path / "skills.json").exists()
+
+
+def test_ensure_version_reloads_from_the_file(builtin, tmp_path):
+    path = tmp_path / "skills.json"
+    worker = _registry(builtin, path)
+    assert worker.current.taxonomy is builtin
+
+    version = _registry(builtin, path).reload(ROWS).result().taxonomy.version
+    worker.ensure_version(version)
+
+    assert worker.version == version
@@ -0,0 +1,101 @@
+"""
+Upload Limit Module
+Rejects oversized multipart uploads (CV PDFs) while they stream in, before
+the whole body has been buffered by the form parser.
+
+  - A Content-Length above the cap is answered with 413 straight away.
+  - Chunked uploads (no Content-Length) are counted as they are received
+    and cut off with 413 as soon as they cross the cap.
+  - Individual paths (e.g. the batch endpoint) can be given their own cap.
+"""
+
+import logging
+import os
+from typing import Dict, Optional
+
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Largest accepted upload body in bytes (default 10 MB)
+MAX_UPLOAD_BYTES = int(os.environ.get("MAX_UPLOAD_BYTES", 10 * 1024 * 1024))
+
+# Largest accepted body for multi-file batch uploads (default 100 MB)
+MAX_BATCH_UPLOAD_BYTES = int(os.environ.get("MAX_BATCH_UPLOAD_BYTES", 100 * 1024 * 1024))
+
+
+def _too_large_detail(max_bytes: int) -> str:
+    return f"Upload exceeds the limit of {max_bytes} bytes"
+
+
+class UploadTooLarge(HTTPException):
+    """
+    Raised from the receive channel once the body exceeds the cap.
+    Being an HTTPException, it passes through FastAPI's form parsing and
+    is rendered as a 413 response.
+    """
+
+    def __init__(self, max_bytes: int):
+        super().__init__(status_code=413, detail=_too_large_detail(max_bytes))
+
+
+def _too_large_response(max_bytes: int) -> JSONResponse:
+    return JSONResponse(status_code=413, content={"detail": _too_large_detail(max_bytes)})
+
+
+class UploadSizeLimitMiddleware:
+    """ASGI middleware enforcing MAX_UPLOAD_BYTES on multipart requests."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_bytes: int = MAX_UPLOAD_BYTES,
+        path_limits: Optional[Dict[str, int]] = None,
+    ):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_limits = path_limits or {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        if not headers.get(b"content-type", b"").startswith(b"multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        max_bytes = self.path_limits.get(scope.get("path", ""), self.max_bytes)
+        content_length = headers.get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+            logger.warning("Rejected upload of %s bytes (limit %d)", content_length.decode(), max_bytes)
+            await _too_large_response(max_bytes)(scope, receive, send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+            return message
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except UploadTooLarge:
+            logger.warning("Rejected streamed upload above %d bytes", max_bytes)
+            if not response_started:
+                await _too_large_response(max_bytes)(scope, receive, send)
@@ -114,9 +114,6 @@ public function handle(): void
                     'stored' => $stored,
                     'duplicates' => $duplicates,
                 ]);
-
-                // Delay between categories to be respectful
-                sleep(3);
             } catch (\Exception $e) {
                 Log::error("Error scraping category {$category}", [
                     'error' => $e->getMessage(),